@@ -0,0 +1,36 @@
+"""add_address_content_hash
+
+Revision ID: 4f0c2a9e7b13
+Revises: b1bd54077869
+Create Date: 2026-10-18 10:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f0c2a9e7b13'
+down_revision: Union[str, Sequence[str], None] = 'b1bd54077869'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep a NULL hash; NULLs never conflict in a unique index,
+    # so they are simply not reused by deduplication.
+    op.add_column('addresses', sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    # Built concurrently so writes to addresses aren't blocked during the build.
+    with op.get_context().autocommit_block():
+        op.create_index('ux_addresses_tenant_content_hash', 'addresses', ['tenant_id', 'content_hash'], unique=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ux_addresses_tenant_content_hash', table_name='addresses', postgresql_concurrently=True)
+    op.drop_column('addresses', 'content_hash')
@@ -0,0 +1,67 @@
+"""add_tenant_pickup_daily_stats
+
+Revision ID: 4f2b8d6c1e93
+Revises: 9a4c2e7f1b38
+Create Date: 2026-10-18 21:03:27.615840
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2b8d6c1e93'
+down_revision: Union[str, Sequence[str], None] = '9a4c2e7f1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The type already exists; it was created with the pickups table.
+pickup_status = postgresql.ENUM(
+    'DRAFT', 'OPEN', 'ASSIGNED', 'IN_TRANSIT', 'COMPLETED', 'CANCELLED', 'RTO_INITIATED',
+    name='pickupstatus', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tenant_pickup_daily_stats',
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', pickup_status, nullable=False),
+    sa.Column('pickup_count', sa.Integer(), nullable=False),
+    sa.Column('cod_amount', sa.Float(), nullable=False),
+    sa.Column('total_weight_kg', sa.Float(), nullable=False),
+    sa.Column('total_volume_cm3', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('tenant_id', 'day', 'status')
+    )
+    # Backfill from existing pickups; from here on the application keeps
+    # the table up to date. Same totals as pickup_daily_stats_statement().
+    op.execute(
+        """
+        INSERT INTO tenant_pickup_daily_stats
+            (tenant_id, day, status, pickup_count, cod_amount, total_weight_kg, total_volume_cm3)
+        SELECT
+            p.tenant_id, CAST(p.created_at AS DATE), p.status, count(*),
+            sum(pay.cod_amount), sum(pkg.weight_kg), sum(pkg.volume_cm3)
+        FROM pickups AS p
+        JOIN LATERAL (
+            SELECT
+                coalesce(sum(weight * box_count), 0) AS weight_kg,
+                coalesce(sum(length * breadth * height * box_count), 0) AS volume_cm3
+            FROM package_details WHERE pickup_id = p.id
+        ) AS pkg ON true
+        JOIN LATERAL (
+            SELECT coalesce(sum(amount) FILTER (WHERE payment_mode = 'COD'), 0) AS cod_amount
+            FROM payment_details WHERE pickup_id = p.id
+        ) AS pay ON true
+        GROUP BY p.tenant_id, CAST(p.created_at AS DATE), p.status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tenant_pickup_daily_stats')
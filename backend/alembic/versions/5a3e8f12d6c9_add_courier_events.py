@@ -0,0 +1,47 @@
+"""add_courier_events
+
+Revision ID: 5a3e8f12d6c9
+Revises: e27b94c81d05
+Create Date: 2026-10-18 13:40:08.215774
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3e8f12d6c9'
+down_revision: Union[str, Sequence[str], None] = 'e27b94c81d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The type already exists; it was created with the pickups table.
+pickup_status = postgresql.ENUM(
+    'DRAFT', 'OPEN', 'ASSIGNED', 'IN_TRANSIT', 'COMPLETED', 'CANCELLED', 'RTO_INITIATED',
+    name='pickupstatus', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('courier_events',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('courier', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('tracking_id', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('status', pickup_status, nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('reason', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('received_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_courier_events_received_at'), 'courier_events', ['received_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_courier_events_received_at'), table_name='courier_events')
+    op.drop_table('courier_events')
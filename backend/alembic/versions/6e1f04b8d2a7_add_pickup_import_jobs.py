@@ -0,0 +1,51 @@
+"""add_pickup_import_jobs
+
+Revision ID: 6e1f04b8d2a7
+Revises: c3d9a7e1f052
+Create Date: 2026-10-18 17:48:31.602945
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f04b8d2a7'
+down_revision: Union[str, Sequence[str], None] = 'c3d9a7e1f052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pickup_import_jobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('created_by_user_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='importjobstatus'), nullable=False),
+    sa.Column('file_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('file_path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('created_count', sa.Integer(), nullable=False),
+    sa.Column('failed_count', sa.Integer(), nullable=False),
+    sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pickup_import_jobs_status'), 'pickup_import_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_pickup_import_jobs_tenant_id'), 'pickup_import_jobs', ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pickup_import_jobs_tenant_id'), table_name='pickup_import_jobs')
+    op.drop_index(op.f('ix_pickup_import_jobs_status'), table_name='pickup_import_jobs')
+    op.drop_table('pickup_import_jobs')
+    op.execute("DROP TYPE IF EXISTS importjobstatus;")
@@ -0,0 +1,45 @@
+"""add_pickup_assignments
+
+Revision ID: 8d3a5f1c7b42
+Revises: 4f2b8d6c1e93
+Create Date: 2026-10-18 23:12:40.218433
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3a5f1c7b42'
+down_revision: Union[str, Sequence[str], None] = '4f2b8d6c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pickup_assignments',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('pickup_id', sa.Uuid(), nullable=False),
+    sa.Column('pickup_date', sa.Date(), nullable=False),
+    sa.Column('rider_code', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('sequence', sa.Integer(), nullable=False),
+    sa.Column('window_start', sa.Time(), nullable=False),
+    sa.Column('window_end', sa.Time(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['pickup_id'], ['pickups.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pickup_assignments_pickup_id'), 'pickup_assignments', ['pickup_id'], unique=False)
+    op.create_index('ix_pickup_assignments_tenant_date_rider', 'pickup_assignments', ['tenant_id', 'pickup_date', 'rider_code', 'sequence'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pickup_assignments_tenant_date_rider', table_name='pickup_assignments')
+    op.drop_index(op.f('ix_pickup_assignments_pickup_id'), table_name='pickup_assignments')
+    op.drop_table('pickup_assignments')
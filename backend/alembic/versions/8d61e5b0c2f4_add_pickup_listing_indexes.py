@@ -0,0 +1,41 @@
+"""add_pickup_listing_indexes
+
+Revision ID: 8d61e5b0c2f4
+Revises: 4f0c2a9e7b13
+Create Date: 2026-10-18 11:02:17.533910
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d61e5b0c2f4'
+down_revision: Union[str, Sequence[str], None] = '4f0c2a9e7b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but it doesn't block
+    # writes to pickups while the indexes build.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_pickups_tenant_created_at', 'pickups', ['tenant_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_pickups_tenant_status_created_at', 'pickups', ['tenant_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_pickups_tenant_requested_date', 'pickups', ['tenant_id', 'requested_pickup_date'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_pickups_tenant_reverse_created_at', 'pickups', ['tenant_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text("shipment_type = 'REVERSE'"), postgresql_concurrently=True)
+        # Every new index leads with tenant_id, so this one is redundant.
+        op.drop_index('ix_pickups_tenant_id', table_name='pickups', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_pickups_tenant_id', 'pickups', ['tenant_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_pickups_tenant_reverse_created_at', table_name='pickups', postgresql_concurrently=True)
+        op.drop_index('ix_pickups_tenant_requested_date', table_name='pickups', postgresql_concurrently=True)
+        op.drop_index('ix_pickups_tenant_status_created_at', table_name='pickups', postgresql_concurrently=True)
+        op.drop_index('ix_pickups_tenant_created_at', table_name='pickups', postgresql_concurrently=True)
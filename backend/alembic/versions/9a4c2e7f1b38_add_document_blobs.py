@@ -0,0 +1,44 @@
+"""add_document_blobs
+
+Revision ID: 9a4c2e7f1b38
+Revises: 6e1f04b8d2a7
+Create Date: 2026-10-18 19:12:54.380126
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c2e7f1b38'
+down_revision: Union[str, Sequence[str], None] = '6e1f04b8d2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_blobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('storage_key', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tenant_id', 'content_hash', name='unique_tenant_document_content')
+    )
+    op.add_column('pickup_documents', sa.Column('blob_id', sa.Uuid(), nullable=True))
+    op.create_index(op.f('ix_pickup_documents_blob_id'), 'pickup_documents', ['blob_id'], unique=False)
+    op.create_foreign_key(op.f('pickup_documents_blob_id_fkey'), 'pickup_documents', 'document_blobs', ['blob_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('pickup_documents_blob_id_fkey'), 'pickup_documents', type_='foreignkey')
+    op.drop_index(op.f('ix_pickup_documents_blob_id'), table_name='pickup_documents')
+    op.drop_column('pickup_documents', 'blob_id')
+    op.drop_table('document_blobs')
@@ -0,0 +1,49 @@
+"""add_pickup_search_indexes
+
+Revision ID: b74c0e9a3f21
+Revises: 5a3e8f12d6c9
+Create Date: 2026-10-18 14:55:43.090127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b74c0e9a3f21'
+down_revision: Union[str, Sequence[str], None] = '5a3e8f12d6c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) for every trigram index.
+TRIGRAM_INDEXES = [
+    ('ix_pickups_order_reference_id_trgm', 'pickups', 'order_reference_id'),
+    ('ix_pickups_tracking_id_trgm', 'pickups', 'tracking_id'),
+    ('ix_addresses_name_trgm', 'addresses', 'name'),
+    ('ix_addresses_phone_trgm', 'addresses', 'phone'),
+    ('ix_addresses_city_trgm', 'addresses', 'city'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY can't run inside a transaction, but it doesn't block
+    # writes while the indexes build.
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], unique=False, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True)
+        # Lets search map matching addresses back to their pickups.
+        op.create_index(op.f('ix_pickups_pickup_address_id'), 'pickups', ['pickup_address_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_pickups_delivery_address_id'), 'pickups', ['delivery_address_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The pg_trgm extension is left installed; other objects may use it.
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_pickups_delivery_address_id'), table_name='pickups', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_pickups_pickup_address_id'), table_name='pickups', postgresql_concurrently=True)
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
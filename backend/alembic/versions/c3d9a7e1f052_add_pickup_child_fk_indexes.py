@@ -0,0 +1,36 @@
+"""add_pickup_child_fk_indexes
+
+Revision ID: c3d9a7e1f052
+Revises: b74c0e9a3f21
+Create Date: 2026-10-18 16:21:09.418263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9a7e1f052'
+down_revision: Union[str, Sequence[str], None] = 'b74c0e9a3f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The export reads packages and payment per pickup, and the aggregate
+    # loaders select them with pickup_id IN (...); without these, each is a
+    # sequential scan of the child table.
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_package_details_pickup_id'), 'package_details', ['pickup_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_payment_details_pickup_id'), 'payment_details', ['pickup_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_pickup_documents_pickup_id'), 'pickup_documents', ['pickup_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_pickup_documents_pickup_id'), table_name='pickup_documents', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_payment_details_pickup_id'), table_name='payment_details', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_package_details_pickup_id'), table_name='package_details', postgresql_concurrently=True)
@@ -0,0 +1,51 @@
+"""add_pickup_version_and_status_history
+
+Revision ID: e27b94c81d05
+Revises: 8d61e5b0c2f4
+Create Date: 2026-10-18 12:26:51.702118
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27b94c81d05'
+down_revision: Union[str, Sequence[str], None] = '8d61e5b0c2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The type already exists; it was created with the pickups table.
+pickup_status = postgresql.ENUM(
+    'DRAFT', 'OPEN', 'ASSIGNED', 'IN_TRANSIT', 'COMPLETED', 'CANCELLED', 'RTO_INITIATED',
+    name='pickupstatus', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default doesn't rewrite the table, so this is instant.
+    op.add_column('pickups', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.create_table('pickup_status_history',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('pickup_id', sa.Uuid(), nullable=False),
+    sa.Column('tenant_id', sa.Uuid(), nullable=False),
+    sa.Column('from_status', pickup_status, nullable=False),
+    sa.Column('to_status', pickup_status, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('reason', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['pickup_id'], ['pickups.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('pickup_id', 'version', name='unique_pickup_status_version')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('pickup_status_history')
+    op.drop_column('pickups', 'version')
@@ -0,0 +1,306 @@
+import uuid
+from datetime import date, datetime
+from typing import Literal, Optional
+
+from app.core.config import settings
+from app.core.dependencies import get_current_active_user
+from app.core.streaming import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, download_response
+from app.exceptions.definitions import InvalidDocumentException, InvalidImportFileException
+from app.models.pickups import DocumentType
+from app.models.tenants import User
+from app.schemas.v1.pagination import Page
+from app.schemas.v1.pickups import (
+    PickupAssignmentRequest,
+    PickupAssignmentResponse,
+    PickupBulkCreate,
+    PickupBulkCreateResponse,
+    PickupDocumentUploadResponse,
+    PickupFilters,
+    PickupImportJobRead,
+    PickupRead,
+    PickupStatsResponse,
+    PickupTransitionBatch,
+    PickupTransitionBatchResponse,
+)
+from app.services.pickup_assignments import (
+    PickupAssignmentService,
+    get_pickup_assignment_service,
+)
+from app.services.pickup_documents import (
+    PickupDocumentService,
+    get_pickup_document_service,
+)
+from app.services.pickup_imports import (
+    PickupImportService,
+    get_pickup_import_service,
+    pickup_import_runner,
+)
+from app.services.pickup_stats import PickupStatsService, get_pickup_stats_service
+from app.services.pickups import PickupService, get_pickup_service
+from fastapi import APIRouter, Depends, Header, Query, Request
+
+router = APIRouter()
+
+
+@router.post("/bulk", response_model=PickupBulkCreateResponse)
+async def bulk_create_pickups(
+    *,
+    payload: PickupBulkCreate,
+    current_user: User = Depends(get_current_active_user),
+    pickup_service: PickupService = Depends(get_pickup_service),
+):
+    """
+    Create many pickups (with addresses, packages and payment) in one call.
+    Each item is validated and written independently of invalid ones;
+    the response reports the new pickup id or the errors for every item.
+    """
+    return await pickup_service.bulk_create_pickups(
+        items=payload.items,
+        tenant_id=current_user.tenant_id,
+        user_id=current_user.id,
+    )
+
+
+@router.post("/transitions", response_model=PickupTransitionBatchResponse)
+async def transition_pickups(
+    *,
+    payload: PickupTransitionBatch,
+    current_user: User = Depends(get_current_active_user),
+    pickup_service: PickupService = Depends(get_pickup_service),
+):
+    """
+    Move many pickups to new statuses in one call.
+    Each item is checked against the allowed status transitions and,
+    if `expected_version` is given, the pickup's current version.
+    The response reports the outcome and new version for every item.
+    """
+    return await pickup_service.transition_pickups(
+        items=payload.items, tenant_id=current_user.tenant_id
+    )
+
+
+@router.post("/assignments", response_model=PickupAssignmentResponse)
+async def assign_pickups(
+    *,
+    payload: PickupAssignmentRequest,
+    current_user: User = Depends(get_current_active_user),
+    assignment_service: PickupAssignmentService = Depends(get_pickup_assignment_service),
+):
+    """
+    Assign OPEN pickups requested for `pickup_date` or earlier to riders.
+    Pickups are grouped by city and pincode, and each rider takes a route
+    within their weight, box and shift limits. Assigned pickups move to
+    ASSIGNED with a pickup window; the response lists every rider's route
+    and why the other pickups weren't assigned. Meant to run as a daily
+    batch; use `dry_run` to preview the plan.
+    """
+    return await assignment_service.assign_pickups(
+        tenant_id=current_user.tenant_id,
+        pickup_date=payload.pickup_date,
+        riders=payload.riders,
+        dry_run=payload.dry_run,
+    )
+
+
+@router.post(
+    "/imports",
+    response_model=PickupImportJobRead,
+    status_code=202,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def create_pickup_import(
+    *,
+    request: Request,
+    file_name: Optional[str] = Query(None, max_length=255),
+    current_user: User = Depends(get_current_active_user),
+    import_service: PickupImportService = Depends(get_pickup_import_service),
+):
+    """
+    Import pickups from a CSV manifest sent as the request body
+    (`Content-Type: text/csv`), one pickup per row.
+    The file is stored and imported in the background; poll
+    `GET /imports/{job_id}` for progress and per-row errors.
+    """
+    if request.headers.get("content-type", "").startswith("multipart/"):
+        raise InvalidImportFileException(
+            "Send the CSV file as the request body with Content-Type: text/csv."
+        )
+    job = await import_service.create_import(
+        chunks=request.stream(),
+        file_name=file_name,
+        tenant_id=current_user.tenant_id,
+        user_id=current_user.id,
+    )
+    pickup_import_runner.submit(job.id)
+    return job
+
+
+@router.get("/imports/{job_id}", response_model=PickupImportJobRead)
+async def get_pickup_import(
+    *,
+    job_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    import_service: PickupImportService = Depends(get_pickup_import_service),
+):
+    """
+    Get the progress of an import, with the errors of rejected rows.
+    """
+    return await import_service.get_import(job_id=job_id, tenant_id=current_user.tenant_id)
+
+
+@router.get("/", response_model=Page[PickupRead])
+async def list_pickups(
+    *,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    filters: PickupFilters = Depends(),
+    current_user: User = Depends(get_current_active_user),
+    pickup_service: PickupService = Depends(get_pickup_service),
+):
+    """
+    List the current tenant's pickups with their details, newest first,
+    one page at a time. Filter by status, service type, shipment type and
+    requested pickup date range.
+    """
+    pickups, next_cursor = await pickup_service.list_pickups(
+        tenant_id=current_user.tenant_id, limit=limit, cursor=cursor, filters=filters
+    )
+    return {"items": pickups, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=Page[PickupRead])
+async def search_pickups(
+    *,
+    q: str = Query(min_length=3, max_length=100),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    pickup_service: PickupService = Depends(get_pickup_service),
+):
+    """
+    Search the current tenant's pickups by part of the order reference,
+    tracking id, or consignee name, phone or city (pickup or delivery).
+    Results are ranked by similarity to `q`, best match first.
+    """
+    pickups, next_cursor = await pickup_service.search_pickups(
+        tenant_id=current_user.tenant_id, query=q, limit=limit, cursor=cursor
+    )
+    return {"items": pickups, "next_cursor": next_cursor}
+
+
+@router.get("/export")
+async def export_pickups(
+    *,
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    created_from: Optional[datetime] = Query(
+        None, description="Earliest creation time (inclusive)."
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Latest creation time (exclusive)."
+    ),
+    filters: PickupFilters = Depends(),
+    current_user: User = Depends(get_current_active_user),
+    pickup_service: PickupService = Depends(get_pickup_service),
+):
+    """
+    Download the current tenant's pickups, oldest first, one row per pickup
+    with both addresses, package totals and payment. Rows are streamed as
+    they are read, so exports of any size use constant memory.
+    Accepts the list filters plus a creation time range; set `gzip` to
+    receive a gzipped file.
+    """
+    chunks = pickup_service.export_pickups(
+        tenant_id=current_user.tenant_id,
+        format=format,
+        filters=filters,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    media_type = CSV_MEDIA_TYPE if format == "csv" else NDJSON_MEDIA_TYPE
+    return download_response(
+        chunks, media_type=media_type, filename=f"pickups.{format}", compress=gzip
+    )
+
+
+@router.get("/stats", response_model=PickupStatsResponse)
+async def get_pickup_stats(
+    *,
+    date_from: Optional[date] = Query(
+        None, description="First creation day (inclusive, UTC)."
+    ),
+    date_to: Optional[date] = Query(
+        None, description="Last creation day (inclusive, UTC); defaults to today."
+    ),
+    current_user: User = Depends(get_current_active_user),
+    stats_service: PickupStatsService = Depends(get_pickup_stats_service),
+):
+    """
+    Dashboard totals for the current tenant's pickups created in a range of
+    days (by default the last 30): pickup counts, COD amounts, and package
+    weight and volume, per day and per current status.
+    """
+    return await stats_service.get_stats(
+        tenant_id=current_user.tenant_id, date_from=date_from, date_to=date_to
+    )
+
+
+@router.post(
+    "/{pickup_id}/documents",
+    response_model=PickupDocumentUploadResponse,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}}
+            },
+        }
+    },
+)
+async def upload_pickup_document(
+    *,
+    pickup_id: uuid.UUID,
+    request: Request,
+    document_type: DocumentType,
+    file_name: str = Query(min_length=1, max_length=255),
+    content_length: Optional[int] = Header(None, include_in_schema=False),
+    current_user: User = Depends(get_current_active_user),
+    document_service: PickupDocumentService = Depends(get_pickup_document_service),
+):
+    """
+    Upload a document (invoice, e-way bill, photo, ...) for a pickup,
+    sent as the raw request body. The file is streamed to storage and
+    hashed on the way; uploading a file the tenant already has stores it
+    only once. Files over the size limit are rejected with 413.
+    """
+    if request.headers.get("content-type", "").startswith("multipart/"):
+        raise InvalidDocumentException("Send the file as the request body, not as a form.")
+    return await document_service.upload_document(
+        pickup_id=pickup_id,
+        tenant_id=current_user.tenant_id,
+        document_type=document_type,
+        file_name=file_name,
+        chunks=request.stream(),
+        content_length=content_length,
+    )
+
+
+@router.get("/{pickup_id}", response_model=PickupRead)
+async def get_pickup(
+    *,
+    pickup_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    pickup_service: PickupService = Depends(get_pickup_service),
+):
+    """
+    Get one pickup with its addresses, packages, documents and payment.
+    """
+    return await pickup_service.get_pickup(
+        pickup_id=pickup_id, tenant_id=current_user.tenant_id
+    )
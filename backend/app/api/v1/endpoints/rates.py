@@ -0,0 +1,22 @@
+from app.core.dependencies import get_current_active_user
+from app.models.tenants import User
+from app.schemas.v1.rates import RateQuoteRequest, RateQuoteResponse
+from app.services.rates import quote_items
+from fastapi import APIRouter, Depends
+
+router = APIRouter()
+
+
+@router.post("/quote", response_model=RateQuoteResponse)
+async def quote_rates(
+    *,
+    payload: RateQuoteRequest,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Price a batch of shipments. For each, the dead weight of its packages
+    is compared with their volumetric weight (by service type), the larger
+    is rounded up to the rate card's weight slab, and the slab rates of the
+    zone between the two pincodes apply. Quotes are returned in order.
+    """
+    return {"quotes": quote_items(payload.items)}
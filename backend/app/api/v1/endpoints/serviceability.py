@@ -0,0 +1,62 @@
+from app.core.dependencies import get_current_active_user
+from app.models.pickups import ServiceType
+from app.models.tenants import User
+from app.schemas.v1.rates import PINCODE_PATTERN
+from app.schemas.v1.serviceability import (
+    PincodeServiceability,
+    RouteServiceability,
+    RouteServiceabilityQuery,
+    RouteServiceabilityRequest,
+    RouteServiceabilityResponse,
+)
+from app.services.serviceability import serviceability
+from fastapi import APIRouter, Depends, Path, Query
+
+router = APIRouter()
+
+
+@router.get("/pincodes/{pincode}", response_model=PincodeServiceability)
+async def get_pincode_serviceability(
+    *,
+    pincode: str = Path(pattern=PINCODE_PATTERN),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Whether a pincode is served, by which hub, and whether it takes COD
+    and express shipments.
+    """
+    return serviceability.require_index().pincode(pincode)
+
+
+@router.get("/routes", response_model=RouteServiceability)
+async def get_route_serviceability(
+    *,
+    origin_pincode: str = Query(pattern=PINCODE_PATTERN),
+    destination_pincode: str = Query(pattern=PINCODE_PATTERN),
+    service_type: ServiceType = ServiceType.SURFACE,
+    cod: bool = False,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Whether a shipment between two pincodes can be served and, if so, its
+    zone and SLA in days; otherwise the reason it can't.
+    """
+    query = RouteServiceabilityQuery(
+        origin_pincode=origin_pincode,
+        destination_pincode=destination_pincode,
+        service_type=service_type,
+        cod=cod,
+    )
+    return serviceability.require_index().routes([query])[0]
+
+
+@router.post("/routes", response_model=RouteServiceabilityResponse)
+async def check_route_serviceability(
+    *,
+    payload: RouteServiceabilityRequest,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Check a batch of routes in one lookup. Results are returned in order.
+    """
+    return {"results": serviceability.require_index().routes(payload.items)}
@@ -1,43 +1,64 @@
 # backend/app/api/v1/endpoints/tenants.py
 import uuid
-from typing import List
+from typing import Literal, Optional
 
+from app.core.config import settings
 from app.core.dependencies import get_current_active_user
+from app.core.streaming import ndjson_response
 from app.models.tenants import User
+from app.schemas.v1.pagination import Page
 from app.schemas.v1.tenants import TenantRead, UserRead
 from app.services.tenants import TenantService, get_tenant_service
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[TenantRead])
+@router.get("/", response_model=Page[TenantRead])
 async def list_tenants(
     *,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
     tenant_service: TenantService = Depends(get_tenant_service),
     user: User = Depends(get_current_active_user)
 ):
     """
-    List all tenants in the system.
+    List all tenants in the system, one page at a time.
+    With `format=ndjson`, streams every tenant after `cursor` instead.
     """
     # if user.role != UserRole.owner:
     #     raise HTTPException(status_code=403, detail="Forbidden")
-    tenants = await tenant_service.list_tenants()
-    return tenants
+    if format == "ndjson":
+        return ndjson_response(tenant_service.stream_tenants(cursor=cursor), TenantRead)
 
+    tenants, next_cursor = await tenant_service.list_tenants(limit=limit, cursor=cursor)
+    return {"items": tenants, "next_cursor": next_cursor}
 
-@router.get("/{tenant_id}/users/", response_model=List[UserRead])
+
+@router.get("/{tenant_id}/users/", response_model=Page[UserRead])
 async def list_users_for_tenant(
     *,
     tenant_id: uuid.UUID,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
     tenant_service: TenantService = Depends(get_tenant_service),
     user: User = Depends(get_current_active_user)
 ):
     """
-    List all users for a specific tenant (administrative).
+    List all users for a specific tenant (administrative), one page at a time.
+    With `format=ndjson`, streams every user after `cursor` instead.
     """
     # if user.role != UserRole.owner:
     #     raise HTTPException(status_code=403, detail="Forbidden")
+    if format == "ndjson":
+        users_stream = await tenant_service.stream_users_for_tenant(
+            tenant_id=tenant_id, cursor=cursor
+        )
+        return ndjson_response(users_stream, UserRead)
 
-    users = await tenant_service.list_users_for_tenant(tenant_id=tenant_id)
-    return users
+    users, next_cursor = await tenant_service.list_users_for_tenant(
+        tenant_id=tenant_id, limit=limit, cursor=cursor
+    )
+    return {"items": users, "next_cursor": next_cursor}
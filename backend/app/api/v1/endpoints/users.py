@@ -1,15 +1,18 @@
-from typing import List
+from typing import Literal, Optional
 
 from app.core.dependencies import (
     get_current_active_user,
     get_supabase_user_from_token,
     get_tenant_from_header,
 )
+from app.core.config import settings
 from app.core.security import TokenPayload
+from app.core.streaming import ndjson_response
 from app.models.tenants import Tenant, User
+from app.schemas.v1.pagination import Page
 from app.schemas.v1.tenants import UserRead
 from app.services.tenants import TenantService, get_tenant_service
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 router = APIRouter()
 
@@ -31,15 +34,26 @@ async def onboard_new_user(
     return user
 
 
-@router.get("/", response_model=List[UserRead])
+@router.get("/", response_model=Page[UserRead])
 async def list_users_in_tenant(
     *,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
     current_user: User = Depends(get_current_active_user),
     tenant_service: TenantService = Depends(get_tenant_service),
 ):
     """
-    List all users for the current authenticated user's tenant.
-    (This will be refactored to use the service layer fully next).
+    List all users for the current authenticated user's tenant, one page at a time.
+    With `format=ndjson`, streams every user after `cursor` instead.
     """
-    users = await tenant_service.list_users_for_tenant(tenant_id=current_user.tenant_id)
-    return users
+    if format == "ndjson":
+        users_stream = await tenant_service.stream_users_for_tenant(
+            tenant_id=current_user.tenant_id, cursor=cursor
+        )
+        return ndjson_response(users_stream, UserRead)
+
+    users, next_cursor = await tenant_service.list_users_for_tenant(
+        tenant_id=current_user.tenant_id, limit=limit, cursor=cursor
+    )
+    return {"items": users, "next_cursor": next_cursor}
@@ -0,0 +1,26 @@
+from app.core.dependencies import verify_courier_token
+from app.schemas.v1.webhooks import CourierWebhookAccepted, CourierWebhookPayload
+from app.services.courier_events import courier_event_queue
+from fastapi import APIRouter, Depends, Path, status
+
+router = APIRouter()
+
+
+@router.post(
+    "/couriers/{courier}",
+    response_model=CourierWebhookAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_courier_token)],
+)
+async def receive_courier_events(
+    *,
+    courier: str = Path(max_length=50, pattern=r"^[a-z0-9_-]+$"),
+    payload: CourierWebhookPayload,
+):
+    """
+    Accept tracking events from a courier. Events are validated and queued;
+    a background worker applies them to pickups (matched by tracking_id)
+    in batches. Returns 429 with Retry-After when the queue is full.
+    """
+    await courier_event_queue.enqueue(courier, payload.events)
+    return {"accepted": len(payload.events)}
@@ -1,6 +1,19 @@
-from app.api.v1.endpoints import tenants, users
+from app.api.v1.endpoints import (
+    pickups,
+    rates,
+    serviceability,
+    tenants,
+    users,
+    webhooks,
+)
 from fastapi import APIRouter
 
 api_router = APIRouter()
 api_router.include_router(tenants.router, prefix="/tenants", tags=["Tenants"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
+api_router.include_router(pickups.router, prefix="/pickups", tags=["Pickups"])
+api_router.include_router(rates.router, prefix="/rates", tags=["Rates"])
+api_router.include_router(
+    serviceability.router, prefix="/serviceability", tags=["Serviceability"]
+)
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
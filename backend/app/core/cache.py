@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+from app.core.config import settings
+
+V = TypeVar("V")
+
+# Sentinel returned by TTLCache.get() when a key is not cached.
+# It lets callers cache `None` (e.g. "this slug does not exist").
+MISSING: Any = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    A small in-process cache with per-entry expiry and bounded LRU eviction.
+
+    It is designed for the asyncio event loop: all operations are synchronous
+    and never await, so no locking is needed. Hit/miss counters are kept so
+    the effectiveness of each cache can be observed.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float, name: str = "cache"):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> V:
+        """
+        Returns the cached value for `key`, or MISSING if it is absent or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return MISSING
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Stores `value` under `key`. `ttl` overrides the cache's default TTL.
+        """
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Removes a single key from the cache, if present.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache's counters, e.g. for logging or a metrics endpoint.
+        """
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# --- Application Caches ---
+
+# Maps a tenant slug to its Tenant row, or to None for slugs that do not exist
+# (the negative cache). Entries are invalidated by TenantRepository on writes;
+# the TTL bounds staleness across processes, which do not share this cache.
+tenant_cache: TTLCache = TTLCache(
+    name="tenant",
+    max_size=settings.TENANT_CACHE_MAX_SIZE,
+    ttl=settings.TENANT_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_tenant(slug: str) -> None:
+    """
+    Drops a tenant slug (positive or negative entry) from the tenant cache.
+    """
+    tenant_cache.invalidate(slug)
+
+
+# Maps the SHA-256 digest of a bearer token to its validated TokenPayload.
+# Each entry expires no later than the token's own `exp` claim.
+jwt_cache: TTLCache = TTLCache(
+    name="jwt",
+    max_size=settings.JWT_CACHE_MAX_SIZE,
+    ttl=settings.JWT_CACHE_MAX_TTL_SECONDS,
+)
+
+
+# Maps (tenant_id, address content hash) to the id of the stored address, so
+# repeated addresses in pickup uploads never hit the DB. Addresses are never
+# deleted, so only committed rows are cached and no invalidation is needed.
+address_cache: TTLCache = TTLCache(
+    name="address",
+    max_size=settings.ADDRESS_CACHE_MAX_SIZE,
+    ttl=settings.ADDRESS_CACHE_TTL_SECONDS,
+)
+
+
+# Maps (caller scope, Idempotency-Key) to its stored response. Stored
+# responses never change, so entries only expire with their key.
+idempotency_cache: TTLCache = TTLCache(
+    name="idempotency",
+    max_size=settings.IDEMPOTENCY_CACHE_MAX_SIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+)
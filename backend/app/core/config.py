@@ -17,6 +17,143 @@ class Settings(BaseSettings):
     # It's a boolean that defaults to False if not set in the .env file
     DB_ECHO_LOG: bool = False
 
+    # --- Connection Pool ---
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Recycle connections before the server/pooler closes idle ones.
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg's own statement cache and SQLAlchemy's prepared statement cache.
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Set to True behind PgBouncer in transaction mode (e.g. Supabase port 6543).
+    # This disables both statement caches above.
+    DB_PGBOUNCER_MODE: bool = False
+
+    # --- Read Replicas ---
+    # Comma-separated replica URLs. Read-only sessions are routed to these;
+    # when empty (or all replicas are ejected), reads go to DATABASE_URL.
+    DATABASE_REPLICA_URLS: str = ""
+    # "round_robin" or "least_connections"
+    DB_REPLICA_SELECTION: str = "round_robin"
+    # How long a replica is taken out of rotation after a connection failure.
+    DB_REPLICA_EJECT_SECONDS: float = 30.0
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
+    # --- Pagination ---
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    # Rows fetched per round trip by streaming (NDJSON/CSV) endpoints.
+    STREAM_BATCH_SIZE: int = 500
+
+    # --- Pickups ---
+    # Maximum pickups accepted by one POST /pickups/bulk request.
+    PICKUP_BULK_MAX_ITEMS: int = 5000
+    # Pickups written per transaction (one multi-row INSERT per table).
+    PICKUP_BULK_CHUNK_SIZE: int = 500
+    # Maximum status transitions accepted by one POST /pickups/transitions request.
+    PICKUP_TRANSITION_MAX_ITEMS: int = 5000
+    # Days covered by GET /pickups/stats when no range is given, and at most.
+    PICKUP_STATS_DEFAULT_DAYS: int = 30
+    PICKUP_STATS_MAX_DAYS: int = 366
+
+    # --- Pickup Imports ---
+    # Uploaded CSV manifests are kept here until their import finishes.
+    # Must be shared by all API processes, as any of them may resume a job.
+    PICKUP_IMPORT_DIR: str = "/tmp/naviera-imports"
+    # Largest CSV manifest accepted by POST /pickups/imports.
+    PICKUP_IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
+    # Manifest rows validated and written per transaction.
+    PICKUP_IMPORT_CHUNK_SIZE: int = 5000
+    # Row errors kept on a job; later failures are only counted.
+    PICKUP_IMPORT_MAX_ERRORS: int = 1000
+    # Imports run at the same time in each process.
+    PICKUP_IMPORT_CONCURRENCY: int = 2
+    # A running job whose progress hasn't moved for this long is taken over
+    # by another process; workers also look for such jobs this often.
+    PICKUP_IMPORT_STALE_SECONDS: int = 300
+
+    # --- Pickup Assignment ---
+    # Maximum riders accepted by one POST /pickups/assignments request.
+    PICKUP_ASSIGNMENT_MAX_RIDERS: int = 2000
+    # Route time model, in minutes: travelling to the next pincode, stopping
+    # at a new address, and handling each pickup there.
+    PICKUP_ASSIGNMENT_TRAVEL_MINUTES: float = 15.0
+    PICKUP_ASSIGNMENT_STOP_MINUTES: float = 5.0
+    PICKUP_ASSIGNMENT_HANDLING_MINUTES: float = 1.0
+    # Pickup windows promised to customers are slots of this length.
+    PICKUP_ASSIGNMENT_SLOT_MINUTES: int = 60
+    # Assigned pickups written per transaction.
+    PICKUP_ASSIGNMENT_CHUNK_SIZE: int = 5000
+
+    # --- Document Storage ---
+    # "local" (files under DOCUMENT_STORAGE_LOCAL_DIR) or "s3" (any S3-compatible store).
+    DOCUMENT_STORAGE_BACKEND: str = "local"
+    DOCUMENT_STORAGE_LOCAL_DIR: str = "/tmp/naviera-documents"
+    # e.g. https://s3.ap-south-1.amazonaws.com; objects are addressed path-style.
+    DOCUMENT_S3_ENDPOINT_URL: str = ""
+    DOCUMENT_S3_BUCKET: str = ""
+    DOCUMENT_S3_REGION: str = "us-east-1"
+    DOCUMENT_S3_ACCESS_KEY_ID: str = ""
+    DOCUMENT_S3_SECRET_ACCESS_KEY: str = ""
+    # Bytes buffered per multipart part (S3 requires at least 5 MiB).
+    DOCUMENT_S3_PART_SIZE: int = 8 * 1024 * 1024
+    # Largest document accepted by POST /pickups/{pickup_id}/documents.
+    DOCUMENT_MAX_BYTES: int = 25 * 1024 * 1024
+
+    # --- Rates ---
+    # Maximum shipments accepted by one POST /rates/quote request.
+    RATE_QUOTE_MAX_ITEMS: int = 10000
+
+    # --- Serviceability ---
+    # CSV of serviceable pincodes (see app/services/serviceability.py for the
+    # columns). When empty, serviceability lookups are unavailable and bulk
+    # pickups aren't checked.
+    SERVICEABILITY_FILE: str = ""
+    # How often the file is checked for changes.
+    SERVICEABILITY_RELOAD_INTERVAL_SECONDS: float = 30.0
+    # Maximum routes accepted by one POST /serviceability/routes request.
+    SERVICEABILITY_MAX_ITEMS: int = 10000
+
+    # --- Courier Webhooks ---
+    # Shared secret couriers send in X-Courier-Token; webhooks are rejected while unset.
+    COURIER_WEBHOOK_SECRET: str = ""
+    # Maximum events accepted by one webhook request.
+    COURIER_WEBHOOK_MAX_EVENTS: int = 1000
+    # Events held in memory before webhooks are answered with 429.
+    COURIER_QUEUE_MAX_SIZE: int = 10000
+    # Events applied per batch, and the longest the worker waits to fill a batch.
+    COURIER_QUEUE_BATCH_SIZE: int = 1000
+    COURIER_QUEUE_FLUSH_INTERVAL_SECONDS: float = 0.5
+    # Retry-After (seconds) sent with 429 responses when the queue is full.
+    COURIER_QUEUE_RETRY_AFTER_SECONDS: int = 5
+    # Also store queued events in Postgres so they survive a restart.
+    COURIER_QUEUE_DURABLE: bool = False
+
+    # --- Idempotency ---
+    # Write requests sent with an Idempotency-Key header run once per key and
+    # caller; retries get the stored response (see app/middleware/idempotency.py).
+    IDEMPOTENCY_ENABLED: bool = True
+    # How long a key's response is stored and replayed.
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    # A key whose request hasn't finished after this long may run again
+    # (the process running it is assumed to have died).
+    IDEMPOTENCY_LOCK_SECONDS: float = 60.0
+    # How long a duplicate waits for the first request to finish before a 409,
+    # and how often it checks Postgres while another process runs it.
+    IDEMPOTENCY_WAIT_TIMEOUT_SECONDS: float = 10.0
+    IDEMPOTENCY_POLL_INTERVAL_SECONDS: float = 0.1
+    # Requests with larger bodies (and the streaming upload routes) run
+    # without idempotency; larger responses aren't stored.
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 1024 * 1024
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = 1024 * 1024
+    # How often expired keys are deleted.
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 600.0
+
     # --- Authentication ---
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -30,6 +167,48 @@ class Settings(BaseSettings):
 
     # --- Logging ---
     LOGFIRE_TOKEN: str = ""
+    # Fraction of 2xx requests written to the request log (errors are always logged).
+    LOG_REQUESTS_2XX_SAMPLE_RATE: float = 1.0
+
+    # --- Metrics ---
+    METRICS_ENABLED: bool = True
+    # Bearer token scrapers must send to GET /metrics; it is rejected while unset.
+    METRICS_TOKEN: str = ""
+    # Distinct authenticated tenants tracked before new ones are bucketed as "__other__".
+    METRICS_MAX_TENANT_LABELS: int = 200
+
+    # --- Tracing (only used when LOGFIRE_TOKEN is set) ---
+    # Head-based sampling: the fraction of traces that are recorded at all.
+    LOGFIRE_TRACE_SAMPLE_RATE: float = 1.0
+    LOGFIRE_AUTO_TRACE_ENABLED: bool = True
+    # Functions are only traced once a call has taken at least this long.
+    LOGFIRE_AUTO_TRACE_MIN_DURATION_SECONDS: float = 0.005
+    # Comma-separated module prefixes to auto-trace, and prefixes to skip.
+    LOGFIRE_AUTO_TRACE_MODULES: str = "app"
+    LOGFIRE_AUTO_TRACE_EXCLUDE_MODULES: str = (
+        "app.core.cache,app.core.pagination,app.core.streaming,"
+        "app.middleware,app.schemas"
+    )
+    # Explicit spans for every SQL statement, independent of auto-tracing.
+    LOGFIRE_INSTRUMENT_SQLALCHEMY: bool = True
+
+    # --- Caching ---
+    # Tenant rows are cached in-process by slug to skip a DB round trip per request.
+    TENANT_CACHE_TTL_SECONDS: float = 300.0
+    TENANT_CACHE_MAX_SIZE: int = 1024
+    # Unknown slugs are cached for a shorter time so scanners can't hit the DB.
+    TENANT_CACHE_NEGATIVE_TTL_SECONDS: float = 30.0
+    # Verified JWT payloads are cached by token hash until the token expires.
+    JWT_CACHE_MAX_SIZE: int = 10000
+    JWT_CACHE_MAX_TTL_SECONDS: float = 300.0
+    # Recently seen (tenant, address content hash) -> address id.
+    ADDRESS_CACHE_MAX_SIZE: int = 50000
+    ADDRESS_CACHE_TTL_SECONDS: float = 3600.0
+    # Stored idempotent responses, so replays skip Postgres too (0 disables).
+    # Only bodies up to IDEMPOTENCY_CACHE_MAX_BODY_BYTES are cached (larger
+    # ones are replayed from Postgres), bounding the cache to about 40 MiB.
+    IDEMPOTENCY_CACHE_MAX_SIZE: int = 10000
+    IDEMPOTENCY_CACHE_MAX_BODY_BYTES: int = 4 * 1024
 
 
 settings = Settings()  # type: ignore
@@ -1,12 +1,197 @@
-from typing import AsyncGenerator
+import itertools
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional
 
+import asyncpg
 from app.core.config import settings
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+
+@dataclass
+class PoolStats:
+    """
+    Cumulative connection-checkout statistics for an engine's pool.
+    Used to size DB_POOL_SIZE / DB_MAX_OVERFLOW from real traffic.
+    """
+
+    checkouts: int = 0
+    checkout_wait_seconds_total: float = 0.0
+    checkout_wait_seconds_max: float = 0.0
+    checkout_errors: int = 0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    An AsyncAdaptedQueuePool that records how long each checkout waited
+    for a free connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            self.stats.checkout_errors += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.stats.checkouts += 1
+            self.stats.checkout_wait_seconds_total += waited
+            if waited > self.stats.checkout_wait_seconds_max:
+                self.stats.checkout_wait_seconds_max = waited
+
+    def recreate(self):
+        # Carry the counters over when the pool is recreated (e.g. on dispose()).
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+
+def _asyncpg_connect_args() -> dict:
+    """
+    Builds the asyncpg connection arguments from settings.
+    In PgBouncer mode (transaction pooling), server-side prepared statements
+    can't be reused across transactions, so both statement caches are
+    disabled and every prepared statement gets a unique name.
+    """
+    if settings.DB_PGBOUNCER_MODE:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+
+def create_engine_from_settings(database_url: str) -> AsyncEngine:
+    """
+    Creates an async engine using the pool settings from the environment.
+    """
+    connect_args = {}
+    if make_url(database_url).get_driver_name() == "asyncpg":
+        connect_args = _asyncpg_connect_args()
+
+    return create_async_engine(
+        database_url,
+        echo=settings.DB_ECHO_LOG,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def get_pool_status(engine: AsyncEngine) -> dict[str, float]:
+    """
+    Returns point-in-time gauges and cumulative counters for an engine's pool.
+    """
+    pool = engine.pool
+    status: dict[str, float] = {
+        "size": pool.size(),  # type: ignore[attr-defined]
+        "in_use": pool.checkedout(),  # type: ignore[attr-defined]
+        "idle": pool.checkedin(),  # type: ignore[attr-defined]
+        "overflow": pool.overflow(),  # type: ignore[attr-defined]
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            {
+                "checkouts": stats.checkouts,
+                "checkout_wait_seconds_total": stats.checkout_wait_seconds_total,
+                "checkout_wait_seconds_max": stats.checkout_wait_seconds_max,
+                "checkout_errors": stats.checkout_errors,
+            }
+        )
+    return status
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """
+    Picks a read replica engine for read-only sessions.
+    Replicas that fail to connect are ejected for DB_REPLICA_EJECT_SECONDS;
+    if no replica is healthy, callers fall back to the primary.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], strategy: str, eject_seconds: float):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica selection strategy: {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self.eject_seconds = eject_seconds
+        self._ejected_until: dict[int, float] = {}
+        self._counter = itertools.count()
+
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _is_healthy(self, engine: AsyncEngine, now: float) -> bool:
+        return self._ejected_until.get(id(engine), 0.0) <= now
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        Returns a healthy replica engine, or None if there is none.
+        """
+        now = time.monotonic()
+        healthy = [e for e in self.engines if self._is_healthy(e, now)]
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda e: e.pool.checkedout())  # type: ignore[attr-defined]
+        return healthy[next(self._counter) % len(healthy)]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        """
+        Takes a replica out of rotation for the configured cool-down.
+        """
+        self._ejected_until[id(engine)] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Ejected read replica %s for %.0fs",
+            engine.url.render_as_string(hide_password=True),
+            self.eject_seconds,
+        )
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        # Only connectivity failures eject a replica; SQL errors do not.
+        if not (
+            context.is_disconnect or isinstance(context.original_exception, OSError)
+        ):
+            return
+        for engine in self.engines:
+            if engine.sync_engine is context.engine:
+                self.eject(engine)
+
+
 # Create the async database engine
-async_engine = create_async_engine(settings.DATABASE_URL, echo=settings.DB_ECHO_LOG)
+async_engine = create_engine_from_settings(settings.DATABASE_URL)
+
+# Read replica engines (empty unless DATABASE_REPLICA_URLS is set)
+replica_router = ReplicaRouter(
+    [create_engine_from_settings(url) for url in settings.replica_urls],
+    strategy=settings.DB_REPLICA_SELECTION,
+    eject_seconds=settings.DB_REPLICA_EJECT_SECONDS,
+)
 
 # Create a sessionmaker to generate new AsyncSession objects
 AsyncSessionLocal = sessionmaker(
@@ -22,3 +207,44 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     async with AsyncSessionLocal() as session:  # type: ignore
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function that provides a read-only database session.
+    It is bound to a healthy read replica when one is configured, and to the
+    primary otherwise. Replicas may lag slightly behind the primary; use
+    get_session for reads that must see the caller's own recent writes.
+    """
+    replica = replica_router.choose()
+    if replica is None:
+        async with AsyncSessionLocal() as session:  # type: ignore
+            yield session
+        return
+
+    async with AsyncSessionLocal(bind=replica) as session:  # type: ignore
+        try:
+            yield session
+        except Exception as e:
+            # Raw connection failures (e.g. refused connects) bypass the
+            # engine's handle_error event, so eject the replica here too.
+            # Other errors from the request handler leave it in rotation.
+            if _is_connection_failure(e):
+                replica_router.eject(replica)
+            raise
+
+
+def _is_connection_failure(exc: Exception) -> bool:
+    """
+    Returns True if `exc` means the database connection failed.
+    """
+    if isinstance(exc, DBAPIError):
+        return exc.connection_invalidated
+    return isinstance(exc, (ConnectionError, asyncpg.PostgresConnectionError))
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """
+    Returns True if the session is bound to a read replica rather than the primary.
+    """
+    return session.bind is not async_engine
@@ -1,40 +1,83 @@
+import hmac
+from dataclasses import dataclass
 from typing import Optional
 
-from app.core.db import get_session
+import logfire
+from app.core.cache import MISSING, tenant_cache
+from app.core.config import settings
+from app.core.db import get_read_session, get_session, is_replica_session
 from app.core.security import TokenPayload, decode_access_token
 from app.models.tenants import Tenant, User
-from fastapi import Depends, Header, HTTPException, status
+from app.repositories.tenants import TenantRepository
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 oauth2_scheme = HTTPBearer(scheme_name="JWT")
 
 
-async def get_tenant_from_header(
-    *,
-    x_tenant_slug: Optional[str] = Header(None),
-    session: AsyncSession = Depends(get_session),
-) -> Tenant:
+@dataclass
+class AuthContext:
     """
-    A dependency to identify and return the current tenant based on the
-    X-Tenant-Slug header. Raises 404 if the tenant is not found.
+    The resolved identity of an authenticated request:
+    the tenant from the X-Tenant-Slug header and the user's profile in it.
+    """
+
+    tenant: Tenant
+    user: User
+
+
+def _cache_tenant(session: AsyncSession, slug: str, tenant: Tenant | None) -> None:
+    """
+    Stores a tenant lookup result (including "not found") in the tenant cache.
+    """
+    if tenant:
+        # Detach the row so it can be shared safely across requests.
+        session.expunge(tenant)
+        tenant_cache.set(slug, tenant)
+    else:
+        tenant_cache.set(slug, None, ttl=settings.TENANT_CACHE_NEGATIVE_TTL_SECONDS)
+
+
+def _tenant_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Tenant not found.",
+    )
+
+
+async def get_tenant_slug_from_header(
+    *, x_tenant_slug: Optional[str] = Header(None)
+) -> str:
+    """
+    A dependency that returns the X-Tenant-Slug header.
+    Raises 400 if the header is missing.
     """
     if not x_tenant_slug:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="X-Tenant-Slug header is required.",
         )
+    return x_tenant_slug
+
 
-    statement = select(Tenant).where(Tenant.slug == x_tenant_slug)
-    result = await session.exec(statement)
-    tenant = result.first()
+async def get_tenant_from_header(
+    *,
+    x_tenant_slug: str = Depends(get_tenant_slug_from_header),
+    session: AsyncSession = Depends(get_read_session),
+) -> Tenant:
+    """
+    A dependency to identify and return the current tenant based on the
+    X-Tenant-Slug header. Raises 404 if the tenant is not found.
+    Lookups are served from the in-process tenant cache when possible.
+    """
+    tenant = tenant_cache.get(x_tenant_slug)
+    if tenant is MISSING:
+        tenant = await TenantRepository(session).get_tenant_by_slug(x_tenant_slug)
+        _cache_tenant(session, x_tenant_slug, tenant)
 
     if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tenant not found.",
-        )
+        raise _tenant_not_found()
 
     return tenant
 
@@ -50,31 +93,105 @@ async def get_supabase_user_from_token(*, token=Depends(oauth2_scheme)) -> Token
     return token_data
 
 
-async def get_current_active_user(
+async def get_current_auth_context(
     *,
+    request: Request,
+    x_tenant_slug: str = Depends(get_tenant_slug_from_header),
     session: AsyncSession = Depends(get_session),
-    current_tenant: Tenant = Depends(get_tenant_from_header),
+    read_session: AsyncSession = Depends(get_read_session),
     token_data: TokenPayload = Depends(get_supabase_user_from_token),
+) -> AuthContext:
+    """
+    A dependency that resolves the current tenant and user together.
+    If the tenant is cached only the user is queried; otherwise tenant and
+    user are loaded with a single joined statement.
+    Lookups go to a read replica. A missing profile is re-checked on the
+    primary, so users who have just onboarded are not rejected by replica lag.
+    """
+    with logfire.span("resolve auth context", tenant_slug=x_tenant_slug):
+        supabase_user_id = token_data.sub
+        repo = TenantRepository(session, read_session)
+
+        tenant = tenant_cache.get(x_tenant_slug)
+        if tenant is MISSING:
+            row = await repo.get_tenant_and_user_by_slug(
+                slug=x_tenant_slug, supabase_user_id=supabase_user_id
+            )
+            tenant, user = row if row else (None, None)
+            _cache_tenant(read_session, x_tenant_slug, tenant)
+        elif tenant:
+            user = await repo.get_user_by_supabase_id_and_tenant_id(
+                supabase_user_id=supabase_user_id, tenant_id=tenant.id
+            )
+
+        if not tenant:
+            raise _tenant_not_found()
+        if not user and is_replica_session(read_session):
+            user = await repo.get_user_by_supabase_id_and_tenant_id(
+                supabase_user_id=supabase_user_id, tenant_id=tenant.id, use_primary=True
+            )
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User does not have access to this tenant.",
+            )
+        if not user.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+
+    # MetricsMiddleware labels requests by tenant only once it is resolved
+    # here, so arbitrary X-Tenant-Slug values never become label values.
+    request.state.tenant_slug = tenant.slug
+    return AuthContext(tenant=tenant, user=user)
+
+
+async def get_current_active_user(
+    *, auth: AuthContext = Depends(get_current_auth_context)
 ) -> User:
     """
     A dependency to get the current authenticated user, validate their token,
     and ensure they belong to the correct tenant.
     """
-    supabase_user_id = token_data.sub
+    return auth.user
 
-    statement = select(User).where(
-        User.supabase_user_id == supabase_user_id,
-        User.tenant_id == current_tenant.id,
-    )
-    result = await session.exec(statement)
-    user = result.first()
 
-    if not user:
+async def get_current_tenant(
+    *, auth: AuthContext = Depends(get_current_auth_context)
+) -> Tenant:
+    """
+    A dependency that returns the tenant of the current authenticated user.
+    """
+    return auth.tenant
+
+
+async def verify_courier_token(*, x_courier_token: Optional[str] = Header(None)) -> None:
+    """
+    A dependency that authenticates courier webhooks by the shared secret
+    in the X-Courier-Token header. Raises 401 if it is missing or wrong,
+    and for every request while COURIER_WEBHOOK_SECRET is unset.
+    """
+    secret = settings.COURIER_WEBHOOK_SECRET
+    if not secret or not x_courier_token or not hmac.compare_digest(
+        x_courier_token.encode(), secret.encode()
+    ):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User does not have access to this tenant.",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid courier token.",
         )
-    if not user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
 
-    return user
+
+async def verify_metrics_token(*, authorization: Optional[str] = Header(None)) -> None:
+    """
+    A dependency that authenticates metrics scrapers by the METRICS_TOKEN
+    bearer token. Raises 401 if it is missing or wrong, and for every
+    request while METRICS_TOKEN is unset.
+    """
+    secret = settings.METRICS_TOKEN
+    scheme, _, token = (authorization or "").partition(" ")
+    if not secret or scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.strip().encode(), secret.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
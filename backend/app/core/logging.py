@@ -4,6 +4,24 @@ import logfire
 from app.core.config import settings
 
 
+def _split_modules(value: str) -> list[str]:
+    return [m.strip() for m in value.split(",") if m.strip()]
+
+
+def should_auto_trace(module: logfire.AutoTraceModule) -> bool:
+    """
+    Decides whether a module is auto-traced, using the allow list
+    (LOGFIRE_AUTO_TRACE_MODULES) and the deny list
+    (LOGFIRE_AUTO_TRACE_EXCLUDE_MODULES) from settings.
+    """
+    allowed = _split_modules(settings.LOGFIRE_AUTO_TRACE_MODULES)
+    excluded = _split_modules(settings.LOGFIRE_AUTO_TRACE_EXCLUDE_MODULES)
+    # parts_start_with() matches everything when given an empty list.
+    if not allowed or not module.parts_start_with(allowed):
+        return False
+    return not (excluded and module.parts_start_with(excluded))
+
+
 def setup_logging():
     """
     Configures Pydantic Logfire for the application.
@@ -13,13 +31,28 @@ def setup_logging():
         logfire.configure(
             token=settings.LOGFIRE_TOKEN,
             service_name=settings.PROJECT_NAME,
+            sampling=logfire.SamplingOptions(head=settings.LOGFIRE_TRACE_SAMPLE_RATE),
         )
         print("✅ Logfire configured successfully.")
 
         # --- FIX 1: Suppress the warning ---
-        logfire.install_auto_tracing(
-            modules=["app"], min_duration=0, check_imported_modules="ignore"
-        )
+        # Only functions that have been slow at least once get spans, so
+        # trivial calls don't inflate CPU and export volume.
+        if settings.LOGFIRE_AUTO_TRACE_ENABLED:
+            logfire.install_auto_tracing(
+                modules=should_auto_trace,
+                min_duration=settings.LOGFIRE_AUTO_TRACE_MIN_DURATION_SECONDS,
+                check_imported_modules="ignore",
+            )
+
+        # Explicit spans for DB calls, kept regardless of the auto-tracing threshold.
+        # Imported here so app.core.db is loaded after auto-tracing is installed.
+        if settings.LOGFIRE_INSTRUMENT_SQLALCHEMY:
+            from app.core.db import async_engine, replica_router
+
+            logfire.instrument_sqlalchemy(
+                engines=[async_engine, *replica_router.engines]
+            )
 
         # --- FIX 2: Force-attach the handler ---
         # Uvicorn sets up logging before we do, so basicConfig() is ignored.
@@ -37,5 +70,3 @@ def setup_logging():
     else:
         print("⚠️ LOGFIRE_TOKEN not set. Logging will be local only.")
         logging.basicConfig(level=logging.INFO)
-
-
@@ -0,0 +1,313 @@
+"""
+A minimal metrics registry rendered in the Prometheus text exposition
+format, without a third-party client library.
+
+Metrics are updated from the asyncio event loop only, so plain integer
+updates are safe without locks. Label values are passed as tuples in the
+order the metric declares its label names, which avoids building a dict
+per observation.
+"""
+
+import math
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional, TypeVar
+
+from app.core.cache import address_cache, idempotency_cache, jwt_cache, tenant_cache
+from app.core.config import settings
+from app.core.db import async_engine, get_pool_status, replica_router
+
+# Latency buckets (seconds), from sub-millisecond cache hits to slow DB calls.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+OVERFLOW_LABEL = "__other__"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class for metrics: a name, help text and ordered label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing value per label set. If `collect` is given,
+    it is called at render time and returns (labels, value) pairs instead,
+    for totals that are kept elsewhere (e.g. by the DB pool or a cache).
+    """
+
+    type_name = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Optional[Callable[[], Iterable[tuple[tuple, float]]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        items = self._collect() if self._collect else self._values.items()
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Gauge(Metric):
+    """
+    A value that can go up and down per label set. If `collect` is given,
+    it is called at render time and returns (labels, value) pairs instead.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Optional[Callable[[], Iterable[tuple[tuple, float]]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, labels: tuple = (), value: float = 0) -> None:
+        self._values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        items = self._collect() if self._collect else self._values.items()
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram(Metric):
+    """
+    Cumulative bucket counts, sum and count per label set.
+    Each label set keeps one preallocated list of bucket counters.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class LabelLimiter:
+    """
+    Caps the number of distinct values a label can take. Once `max_values`
+    have been seen, new values are reported as OVERFLOW_LABEL so an
+    unbounded input (e.g. a request header) can't blow up cardinality.
+    """
+
+    def __init__(self, max_values: int):
+        self.max_values = max_values
+        self._seen: set[str] = set()
+
+    def __call__(self, value: str) -> str:
+        if value in self._seen:
+            return value
+        if len(self._seen) >= self.max_values:
+            return OVERFLOW_LABEL
+        self._seen.add(value)
+        return value
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them together."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# --- HTTP Metrics (updated by MetricsMiddleware) ---
+
+http_requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "Total HTTP requests by route template, method and status code.",
+        ("route", "method", "status"),
+    )
+)
+http_request_duration_seconds = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency in seconds by route template and method.",
+        ("route", "method"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being processed.")
+)
+tenant_requests_total = registry.register(
+    Counter(
+        "tenant_requests_total",
+        "Total HTTP requests by authenticated tenant "
+        f"(at most METRICS_MAX_TENANT_LABELS values, then '{OVERFLOW_LABEL}').",
+        ("tenant",),
+    )
+)
+tenant_label = LabelLimiter(settings.METRICS_MAX_TENANT_LABELS)
+
+
+# --- Runtime Metrics (collected at scrape time) ---
+
+
+def _engines():
+    yield "primary", async_engine
+    for index, engine in enumerate(replica_router.engines):
+        yield f"replica-{index}", engine
+
+
+def _collect_pool(field: str):
+    def collect():
+        return [((name,), get_pool_status(engine)[field]) for name, engine in _engines()]
+
+    return collect
+
+
+for _field, _doc in (
+    ("size", "Configured size of the DB connection pool."),
+    ("in_use", "DB connections currently checked out."),
+    ("idle", "DB connections idle in the pool."),
+    ("overflow", "DB connections opened beyond the pool size."),
+    ("checkout_wait_seconds_max", "Longest wait for a DB connection."),
+):
+    registry.register(
+        Gauge(f"db_pool_{_field}", _doc, ("engine",), collect=_collect_pool(_field))
+    )
+
+for _name, _field, _doc in (
+    ("checkouts_total", "checkouts", "Total DB connection checkouts."),
+    (
+        "checkout_wait_seconds_total",
+        "checkout_wait_seconds_total",
+        "Total time spent waiting for a DB connection.",
+    ),
+    ("checkout_errors_total", "checkout_errors", "DB connection checkouts that failed or timed out."),
+):
+    registry.register(
+        Counter(f"db_pool_{_name}", _doc, ("engine",), collect=_collect_pool(_field))
+    )
+
+
+def _collect_cache(field: str):
+    def collect():
+        caches = (tenant_cache, jwt_cache, address_cache, idempotency_cache)
+        return [((c.name,), c.stats()[field]) for c in caches]
+
+    return collect
+
+
+registry.register(
+    Gauge(
+        "cache_size",
+        "Entries currently held by an in-process cache.",
+        ("cache",),
+        collect=_collect_cache("size"),
+    )
+)
+for _field, _doc in (
+    ("hits", "In-process cache hits."),
+    ("misses", "In-process cache misses."),
+    ("evictions", "In-process cache LRU evictions."),
+):
+    registry.register(
+        Counter(f"cache_{_field}_total", _doc, ("cache",), collect=_collect_cache(_field))
+    )
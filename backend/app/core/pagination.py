@@ -0,0 +1,76 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from app.exceptions.definitions import InvalidCursorException
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encodes the sort-key values of the last row on a page into an opaque cursor.
+    """
+    raw = json.dumps([str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """
+    Decodes a cursor produced by encode_cursor() back into its `size` values.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise InvalidCursorException()
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise InvalidCursorException()
+    return values
+
+
+def decode_id_cursor(cursor: Optional[str]) -> Optional[uuid.UUID]:
+    """
+    Decodes an id-keyed pagination cursor (None if no cursor was given).
+    """
+    if cursor is None:
+        return None
+    (raw_id,) = decode_cursor(cursor, 1)
+    try:
+        return uuid.UUID(raw_id)
+    except ValueError:
+        raise InvalidCursorException()
+
+
+def decode_timestamp_id_cursor(
+    cursor: Optional[str],
+) -> Optional[tuple[datetime, uuid.UUID]]:
+    """
+    Decodes a (timestamp, id)-keyed pagination cursor (None if no cursor was given).
+    """
+    if cursor is None:
+        return None
+    raw_timestamp, raw_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(raw_timestamp), uuid.UUID(raw_id)
+    except ValueError:
+        raise InvalidCursorException()
+
+
+def paginate(
+    rows: Sequence[T], limit: int, key: Callable[[T], tuple]
+) -> tuple[list[T], Optional[str]]:
+    """
+    Splits a keyset query result fetched with `limit + 1` rows into the page
+    items and the cursor for the next page (None on the last page).
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    return items, encode_cursor(*key(items[-1]))
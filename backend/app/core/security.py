@@ -1,3 +1,7 @@
+import hashlib
+import time
+
+from app.core.cache import MISSING, jwt_cache
 from app.core.config import settings
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
@@ -19,7 +23,14 @@ class TokenPayload(SQLModel):
 def decode_access_token(token: str) -> TokenPayload:
     """
     Decodes a JWT access token and validates its payload.
+    Verified payloads are cached until the token expires, so repeated
+    tokens skip signature verification and model validation.
     """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    token_data = jwt_cache.get(cache_key)
+    if token_data is not MISSING:
+        return token_data
+
     try:
         # Decode the JWT using the secret key and algorithm from settings
         payload = jwt.decode(
@@ -38,4 +49,11 @@ def decode_access_token(token: str) -> TokenPayload:
             detail=f"Could not validate credentials: {e}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Only tokens with an expiry are cached, and never beyond that expiry.
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(exp - time.time(), settings.JWT_CACHE_MAX_TTL_SECONDS)
+        jwt_cache.set(cache_key, token_data, ttl=ttl)
+
     return token_data
@@ -0,0 +1,269 @@
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import os
+import xml.etree.ElementTree as ElementTree
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterable, Optional
+from urllib.parse import quote
+
+import httpx
+from app.core.config import settings
+
+
+class StorageBackend(ABC):
+    """
+    Where uploaded files are kept. Files are written from a stream of
+    chunks, so no backend needs the whole file in memory.
+    """
+
+    @abstractmethod
+    async def write(self, key: str, chunks: AsyncIterable[bytes]) -> None:
+        """
+        Stores the chunks under `key`. If the stream raises, nothing is
+        left behind and the exception propagates.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Removes the file stored under `key`, if any.
+        """
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """
+        Returns the URL recorded for the file stored under `key`.
+        """
+
+    async def close(self) -> None:
+        """
+        Releases the backend's resources on shutdown.
+        """
+
+
+class LocalStorage(StorageBackend):
+    """
+    Stores files under a local directory. Each file is written to a
+    temporary name and renamed once complete. Disk writes run in a thread
+    so they don't block the event loop.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return path
+
+    async def write(self, key: str, chunks: AsyncIterable[bytes]) -> None:
+        path = self._path(key)
+        partial = path.with_name(path.name + ".part")
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        file = await asyncio.to_thread(open, partial, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            file.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+            raise
+
+    async def delete(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            await asyncio.to_thread(os.remove, self._path(key))
+
+    def url(self, key: str) -> str:
+        return self._path(key).as_uri()
+
+
+def _hmac_sha256(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
+def _uri_encode(value: str, safe: str = "") -> str:
+    return quote(value, safe="-_.~" + safe)
+
+
+class S3Storage(StorageBackend):
+    """
+    Stores files in an S3-compatible bucket (AWS S3, MinIO, R2, ...),
+    signing requests with AWS Signature Version 4 over httpx.
+
+    Files up to `part_size` are sent with one PUT. Larger files use a
+    multipart upload, so at most one part is buffered per upload; a failed
+    upload is aborted so no parts are left behind.
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoint_url: str,
+        bucket: str,
+        region: str,
+        access_key_id: str,
+        secret_access_key: str,
+        part_size: int,
+    ):
+        if part_size < 5 * 1024 * 1024:
+            raise ValueError("S3 multipart parts must be at least 5 MiB")
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.part_size = part_size
+        self._client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, write=120.0))
+
+    def url(self, key: str) -> str:
+        return f"{self.endpoint_url}/{self.bucket}/{_uri_encode(key, safe='/')}"
+
+    def _sign(self, method: str, url: httpx.URL, payload_hash: str) -> dict[str, str]:
+        """
+        Returns the headers that authenticate a request (SigV4, service "s3").
+        """
+        amz_date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        headers = {
+            "host": url.netloc.decode(),
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+        }
+        signed_headers = ";".join(sorted(headers))
+        canonical_request = "\n".join(
+            [
+                method,
+                url.raw_path.split(b"?")[0].decode(),
+                "&".join(
+                    f"{_uri_encode(k)}={_uri_encode(v)}"
+                    for k, v in sorted(url.params.multi_items())
+                ),
+                "".join(f"{name}:{headers[name]}\n" for name in sorted(headers)),
+                signed_headers,
+                payload_hash,
+            ]
+        )
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        signing_key = f"AWS4{self.secret_access_key}".encode()
+        for part in (amz_date[:8], self.region, "s3", "aws4_request"):
+            signing_key = _hmac_sha256(signing_key, part)
+        signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+        del headers["host"]  # httpx sends the same value itself
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key_id}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        return headers
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        *,
+        params: Optional[dict[str, str]] = None,
+        content: bytes = b"",
+    ) -> httpx.Response:
+        url = httpx.URL(self.url(key), params=params)
+        headers = self._sign(method, url, hashlib.sha256(content).hexdigest())
+        response = await self._client.request(method, url, content=content, headers=headers)
+        response.raise_for_status()
+        return response
+
+    async def write(self, key: str, chunks: AsyncIterable[bytes]) -> None:
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        etags: list[str] = []
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        response = await self._request("POST", key, params={"uploads": ""})
+                        upload_id = _xml_text(response.content, "UploadId")
+                    etags.append(await self._upload_part(key, upload_id, len(etags) + 1, buffer))
+                    buffer = bytearray()
+
+            if upload_id is None:
+                await self._request("PUT", key, content=bytes(buffer))
+                return
+            if buffer:
+                etags.append(await self._upload_part(key, upload_id, len(etags) + 1, buffer))
+            parts = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+                for number, etag in enumerate(etags, start=1)
+            )
+            response = await self._request(
+                "POST",
+                key,
+                params={"uploadId": upload_id},
+                content=f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode(),
+            )
+            # S3 can report a failed completion in a 200 response.
+            if b"<Error>" in response.content:
+                raise httpx.HTTPError(f"S3 rejected the upload of {key}: {response.text}")
+        except BaseException:
+            if upload_id is not None:
+                with contextlib.suppress(Exception):
+                    await self._request("DELETE", key, params={"uploadId": upload_id})
+            raise
+
+    async def _upload_part(
+        self, key: str, upload_id: str, number: int, data: bytearray
+    ) -> str:
+        response = await self._request(
+            "PUT",
+            key,
+            params={"partNumber": str(number), "uploadId": upload_id},
+            content=bytes(data),
+        )
+        return response.headers["etag"]
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _xml_text(document: bytes, tag: str) -> str:
+    element = ElementTree.fromstring(document).find(f".//{{*}}{tag}")
+    if element is None or not element.text:
+        raise httpx.HTTPError(f"S3 response has no {tag}")
+    return element.text
+
+
+def create_storage_from_settings() -> StorageBackend:
+    """
+    Creates the document storage backend selected in the settings.
+    """
+    if settings.DOCUMENT_STORAGE_BACKEND == "local":
+        return LocalStorage(settings.DOCUMENT_STORAGE_LOCAL_DIR)
+    if settings.DOCUMENT_STORAGE_BACKEND == "s3":
+        return S3Storage(
+            endpoint_url=settings.DOCUMENT_S3_ENDPOINT_URL,
+            bucket=settings.DOCUMENT_S3_BUCKET,
+            region=settings.DOCUMENT_S3_REGION,
+            access_key_id=settings.DOCUMENT_S3_ACCESS_KEY_ID,
+            secret_access_key=settings.DOCUMENT_S3_SECRET_ACCESS_KEY,
+            part_size=settings.DOCUMENT_S3_PART_SIZE,
+        )
+    raise ValueError(f"Unknown document storage backend: {settings.DOCUMENT_STORAGE_BACKEND}")
+
+
+document_storage = create_storage_from_settings()
@@ -0,0 +1,58 @@
+import zlib
+from typing import AsyncIterable, AsyncIterator, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+# zlib's default level; higher levels cost far more CPU for little gain.
+GZIP_LEVEL = 6
+
+
+async def ndjson_lines(
+    rows: AsyncIterable, schema: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Serializes each row through `schema` as one JSON document per line.
+    """
+    async for row in rows:
+        yield schema.model_validate(row, from_attributes=True).model_dump_json().encode() + b"\n"
+
+
+def ndjson_response(rows: AsyncIterable, schema: Type[BaseModel]) -> StreamingResponse:
+    """
+    Builds a StreamingResponse that writes rows as NDJSON while they are read,
+    so memory stays flat regardless of the number of rows.
+    """
+    return StreamingResponse(ndjson_lines(rows, schema), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Compresses a byte stream into gzip format as it is read.
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def download_response(
+    chunks: AsyncIterable[bytes], *, media_type: str, filename: str, compress: bool = False
+) -> StreamingResponse:
+    """
+    Builds a StreamingResponse that sends a byte stream as a file download,
+    gzipped (with a .gz filename) if `compress` is set.
+    """
+    if compress:
+        chunks, media_type, filename = gzip_chunks(chunks), GZIP_MEDIA_TYPE, f"{filename}.gz"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
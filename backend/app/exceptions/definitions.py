@@ -28,3 +28,110 @@ class UserNotFoundException(NavieraException):
     """
 
     pass
+
+
+class PickupNotFoundException(NavieraException):
+    """
+    Raised when a pickup cannot be found for the current tenant.
+    """
+
+    pass
+
+
+class PickupImportNotFoundException(NavieraException):
+    """
+    Raised when a pickup import job cannot be found for the current tenant.
+    """
+
+    pass
+
+
+class InvalidImportFileException(NavieraException):
+    """
+    Raised when an uploaded import file can't be read as a pickup manifest.
+    """
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class ImportFileTooLargeException(NavieraException):
+    """
+    Raised when an uploaded import file exceeds PICKUP_IMPORT_MAX_BYTES.
+    """
+
+    pass
+
+
+class InvalidDocumentException(NavieraException):
+    """
+    Raised when an uploaded pickup document can't be stored, e.g. it is empty.
+    """
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class DocumentTooLargeException(NavieraException):
+    """
+    Raised when an uploaded pickup document exceeds DOCUMENT_MAX_BYTES.
+    """
+
+    pass
+
+
+class InvalidDateRangeException(NavieraException):
+    """
+    Raised when a requested date range is reversed or too long.
+    """
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class InvalidCursorException(NavieraException):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+    pass
+
+
+class ServiceabilityUnavailableException(NavieraException):
+    """
+    Raised when no serviceability data is loaded.
+    """
+
+    pass
+
+
+class CourierQueueFullException(NavieraException):
+    """
+    Raised when the courier webhook queue has no room for more events.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+class IdempotencyKeyReusedException(NavieraException):
+    """
+    Raised when an Idempotency-Key is sent again with a different request.
+    """
+
+    pass
+
+
+class IdempotencyKeyInProgressException(NavieraException):
+    """
+    Raised when the first request with an Idempotency-Key is still running
+    after a duplicate has waited for it.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.retry_after = retry_after
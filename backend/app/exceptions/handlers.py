@@ -1,6 +1,20 @@
 import logging
 
-from app.exceptions.definitions import TenantNotFoundException
+from app.exceptions.definitions import (
+    CourierQueueFullException,
+    DocumentTooLargeException,
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+    ImportFileTooLargeException,
+    InvalidCursorException,
+    InvalidDateRangeException,
+    InvalidDocumentException,
+    InvalidImportFileException,
+    PickupImportNotFoundException,
+    PickupNotFoundException,
+    ServiceabilityUnavailableException,
+    TenantNotFoundException,
+)
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
@@ -34,6 +48,157 @@ async def tenant_not_found_exception_handler(
     )
 
 
+async def pickup_not_found_exception_handler(
+    request: Request, exc: PickupNotFoundException
+):
+    """
+    Handles PickupNotFoundException by returning a 404 response.
+    """
+    return JSONResponse(
+        status_code=404,
+        content={"detail": "Pickup not found"},
+    )
+
+
+async def pickup_import_not_found_exception_handler(
+    request: Request, exc: PickupImportNotFoundException
+):
+    """
+    Handles PickupImportNotFoundException by returning a 404 response.
+    """
+    return JSONResponse(
+        status_code=404,
+        content={"detail": "Import job not found"},
+    )
+
+
+async def invalid_import_file_exception_handler(
+    request: Request, exc: InvalidImportFileException
+):
+    """
+    Handles InvalidImportFileException by returning a 400 response
+    that says what is wrong with the file.
+    """
+    return JSONResponse(
+        status_code=400,
+        content={"detail": exc.detail},
+    )
+
+
+async def import_file_too_large_exception_handler(
+    request: Request, exc: ImportFileTooLargeException
+):
+    """
+    Handles ImportFileTooLargeException by returning a 413 response.
+    """
+    return JSONResponse(
+        status_code=413,
+        content={"detail": "Import file is too large"},
+    )
+
+
+async def invalid_document_exception_handler(
+    request: Request, exc: InvalidDocumentException
+):
+    """
+    Handles InvalidDocumentException by returning a 400 response
+    that says what is wrong with the document.
+    """
+    return JSONResponse(
+        status_code=400,
+        content={"detail": exc.detail},
+    )
+
+
+async def document_too_large_exception_handler(
+    request: Request, exc: DocumentTooLargeException
+):
+    """
+    Handles DocumentTooLargeException by returning a 413 response.
+    """
+    return JSONResponse(
+        status_code=413,
+        content={"detail": "Document is too large"},
+    )
+
+
+async def invalid_date_range_exception_handler(
+    request: Request, exc: InvalidDateRangeException
+):
+    """
+    Handles InvalidDateRangeException by returning a 400 response
+    that says what is wrong with the range.
+    """
+    return JSONResponse(
+        status_code=400,
+        content={"detail": exc.detail},
+    )
+
+
+async def invalid_cursor_exception_handler(
+    request: Request, exc: InvalidCursorException
+):
+    """
+    Handles InvalidCursorException by returning a 400 response.
+    """
+    return JSONResponse(
+        status_code=400,
+        content={"detail": "Invalid pagination cursor"},
+    )
+
+
+async def serviceability_unavailable_exception_handler(
+    request: Request, exc: ServiceabilityUnavailableException
+):
+    """
+    Handles ServiceabilityUnavailableException by returning a 503 response.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Serviceability data is not loaded"},
+    )
+
+
+async def courier_queue_full_exception_handler(
+    request: Request, exc: CourierQueueFullException
+):
+    """
+    Handles CourierQueueFullException by returning a 429 response that
+    tells the courier when to retry.
+    """
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many courier events queued; retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def idempotency_key_reused_exception_handler(
+    request: Request, exc: IdempotencyKeyReusedException
+):
+    """
+    Handles IdempotencyKeyReusedException by returning a 422 response.
+    """
+    return JSONResponse(
+        status_code=422,
+        content={"detail": "Idempotency-Key was already used for a different request"},
+    )
+
+
+async def idempotency_key_in_progress_exception_handler(
+    request: Request, exc: IdempotencyKeyInProgressException
+):
+    """
+    Handles IdempotencyKeyInProgressException by returning a 409 response
+    that tells the client when to retry.
+    """
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "A request with this Idempotency-Key is still in progress"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 def register_exception_handlers(app: FastAPI):
     """
     Registers all custom exception handlers with the FastAPI app.
@@ -41,3 +206,42 @@ def register_exception_handlers(app: FastAPI):
     app.add_exception_handler(
         TenantNotFoundException, tenant_not_found_exception_handler  # type: ignore
     )
+    app.add_exception_handler(
+        PickupNotFoundException, pickup_not_found_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        PickupImportNotFoundException, pickup_import_not_found_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        InvalidImportFileException, invalid_import_file_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        ImportFileTooLargeException, import_file_too_large_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        InvalidDocumentException, invalid_document_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        DocumentTooLargeException, document_too_large_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        InvalidDateRangeException, invalid_date_range_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        InvalidCursorException, invalid_cursor_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        ServiceabilityUnavailableException,
+        serviceability_unavailable_exception_handler,  # type: ignore
+    )
+    app.add_exception_handler(
+        CourierQueueFullException, courier_queue_full_exception_handler  # type: ignore
+    )
+    app.add_exception_handler(
+        IdempotencyKeyReusedException,
+        idempotency_key_reused_exception_handler,  # type: ignore
+    )
+    app.add_exception_handler(
+        IdempotencyKeyInProgressException,
+        idempotency_key_in_progress_exception_handler,  # type: ignore
+    )
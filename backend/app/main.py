@@ -3,18 +3,46 @@ from app.core.logging import setup_logging
 #  Run setup BEFORE creating the app
 setup_logging()
 
+from contextlib import asynccontextmanager
+
 import logfire
 
 # Import our application's high-level components
 from app.api.v1.router import api_router as api_router_v1
 from app.core.config import settings
+from app.core.dependencies import verify_metrics_token
+from app.core.metrics import registry as metrics_registry
+from app.core.storage import document_storage
 from app.exceptions.handlers import register_exception_handlers
 from app.middleware import register_middleware
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from app.services.courier_events import courier_event_queue
+from app.services.idempotency import idempotency_store
+from app.services.pickup_imports import pickup_import_runner
+from app.services.serviceability import serviceability
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, RedirectResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts background workers on startup and drains them on shutdown.
+    """
+    serviceability.start()
+    courier_event_queue.start()
+    pickup_import_runner.start()
+    if settings.IDEMPOTENCY_ENABLED:
+        idempotency_store.start()
+    yield
+    await idempotency_store.stop()
+    await serviceability.stop()
+    await pickup_import_runner.stop()
+    await courier_event_queue.stop()
+    await document_storage.close()
+
 
 # Create the FastAPI app
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # Instrument the app with Logfire
 # (This sets up HTTP traffic monitoring)
@@ -44,4 +72,17 @@ async def health_check():
     """
     A simple health check endpoint to confirm the API is running.
     """
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get(
+    "/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_token)]
+)
+async def metrics():
+    """
+    Exposes request, DB pool and cache metrics in the Prometheus text format.
+    Scrapers authenticate with the METRICS_TOKEN bearer token.
+    """
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,9 +1,27 @@
-from app.middleware.logging import log_requests
+from app.core.config import settings
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.services.idempotency import idempotency_store
 from fastapi import FastAPI
 
 
 def register_middleware(app: FastAPI):
     """
     Registers all application middleware with the FastAPI app.
+    Middleware added first runs innermost, so replayed idempotent
+    responses are still logged and counted.
     """
-    app.middleware("http")(log_requests)
+    if settings.IDEMPOTENCY_ENABLED:
+        app.add_middleware(
+            IdempotencyMiddleware,
+            store=idempotency_store,
+            max_body_bytes=settings.IDEMPOTENCY_MAX_BODY_BYTES,
+            max_response_bytes=settings.IDEMPOTENCY_MAX_RESPONSE_BYTES,
+        )
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        sample_rate_2xx=settings.LOG_REQUESTS_2XX_SAMPLE_RATE,
+    )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,233 @@
+import hashlib
+import re
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.exceptions.definitions import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
+from app.exceptions.handlers import (
+    idempotency_key_in_progress_exception_handler,
+    idempotency_key_reused_exception_handler,
+)
+from app.services.idempotency import IdempotencyStore, IdempotentRequest, StoredResponse
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.requests import ClientDisconnect, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+
+# Responses that ask the client to retry are never stored, so the retry runs.
+RETRYABLE_STATUSES = frozenset({408, 409, 429})
+
+# Upload routes that stream their body to storage (POST /pickups/imports and
+# POST /pickups/{pickup_id}/documents). Buffering them would defeat the
+# streaming, so they always pass through.
+STREAMING_UPLOAD_PATH = re.compile(
+    rf"^{re.escape(settings.API_V1_STR)}/pickups/(imports|[^/]+/documents)/?$"
+)
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI middleware that runs write requests sent with an
+    Idempotency-Key header once per key and caller.
+
+    The first request with a key runs and its response (unless it's a 5xx
+    or asks for a retry) is stored; duplicates wait for it and get the same
+    status, headers and body, plus `Idempotent-Replayed: true`, without
+    reaching the route. The caller is the bearer token's subject and the
+    X-Tenant-Slug header.
+
+    Every write route is covered except the streaming uploads
+    (STREAMING_UPLOAD_PATH). These requests pass through untouched, as if
+    they had no key:
+    - requests without a valid token (the route rejects them as usual);
+    - streaming uploads;
+    - requests whose body is over `max_body_bytes`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        store: IdempotencyStore,
+        max_body_bytes: int,
+        max_response_bytes: int,
+    ):
+        self.app = app
+        self.store = store
+        self.max_body_bytes = max_body_bytes
+        self.max_response_bytes = max_response_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in WRITE_METHODS
+            or STREAMING_UPLOAD_PATH.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        key = headers.get(b"idempotency-key")
+        if key is None or _content_length(headers) > self.max_body_bytes:
+            await self.app(scope, receive, send)
+            return
+        caller = _caller(headers)
+        if caller is None:
+            await self.app(scope, receive, send)
+            return
+
+        key_text = key.decode("latin-1")
+        if not 0 < len(key_text) <= MAX_KEY_LENGTH:
+            await JSONResponse(
+                status_code=400,
+                content={"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"},
+            )(scope, receive, send)
+            return
+
+        try:
+            messages, complete = await _read_body(receive, self.max_body_bytes)
+        except ClientDisconnect:
+            return
+        if not complete:
+            # The body turned out to be too large (it had no Content-Length):
+            # hand over what was read and let the rest stream through.
+            await self.app(scope, _replay_receive(messages, receive), send)
+            return
+        body = b"".join(message.get("body", b"") for message in messages)
+
+        digest = hashlib.sha256()
+        for part in (scope["method"].encode(), scope["path"].encode(), scope["query_string"]):
+            digest.update(part + b"\0")
+        digest.update(body)
+        request = IdempotentRequest(
+            scope=caller,
+            key=key_text,
+            method=scope["method"],
+            path=scope["path"],
+            request_hash=digest.hexdigest(),
+        )
+
+        try:
+            outcome = await self.store.begin(request)
+        except IdempotencyKeyReusedException as exc:
+            response = await idempotency_key_reused_exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
+            return
+        except IdempotencyKeyInProgressException as exc:
+            response = await idempotency_key_in_progress_exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
+            return
+
+        if isinstance(outcome, StoredResponse):
+            await _send_stored(outcome, send)
+            return
+
+        status_code = None
+        response_headers: list[list[str]] = []
+        chunks: list[bytes] = []
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers.extend(
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", ())
+                )
+            elif message["type"] == "http.response.body" and size <= self.max_response_bytes:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                chunks.append(chunk)
+            await send(message)
+
+        finished = False
+        try:
+            await self.app(scope, _replay_receive(messages, receive), send_wrapper)
+            finished = True
+        finally:
+            if (
+                finished
+                and status_code is not None
+                and status_code < 500
+                and status_code not in RETRYABLE_STATUSES
+                and size <= self.max_response_bytes
+            ):
+                await self.store.complete(
+                    outcome, status=status_code, headers=response_headers, body=b"".join(chunks)
+                )
+            else:
+                await self.store.release(outcome)
+
+
+def _caller(headers: dict[bytes, bytes]) -> str | None:
+    """
+    Returns the SHA-256 of the verified token subject and the tenant slug,
+    or None if the request has no valid bearer token.
+    """
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = decode_access_token(token.strip()).sub
+    except HTTPException:
+        return None
+    tenant_slug = headers.get(b"x-tenant-slug", b"").decode("latin-1")
+    return hashlib.sha256(f"{subject}\0{tenant_slug}".encode()).hexdigest()
+
+
+def _content_length(headers: dict[bytes, bytes]) -> int:
+    """
+    Returns the declared body size, or 0 if it isn't declared (or invalid).
+    """
+    try:
+        return int(headers.get(b"content-length", b"0"))
+    except ValueError:
+        return 0
+
+
+async def _read_body(receive: Receive, limit: int) -> tuple[list[Message], bool]:
+    """
+    Reads request body messages until the body ends or exceeds `limit`
+    bytes. Returns the messages read and whether they hold the whole body
+    within the limit.
+    """
+    messages = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ClientDisconnect()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        if size > limit:
+            return messages, False
+        if not message.get("more_body", False):
+            return messages, True
+
+
+def _replay_receive(messages: list[Message], receive: Receive) -> Receive:
+    """
+    Returns a receive callable that yields `messages` first, then reads on.
+    """
+    pending = list(messages)
+
+    async def replay() -> Message:
+        if pending:
+            return pending.pop(0)
+        return await receive()
+
+    return replay
+
+
+async def _send_stored(stored: StoredResponse, send: Send) -> None:
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers]
+    headers.append((b"idempotent-replayed", b"true"))
+    await send({"type": "http.response.start", "status": stored.status, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body})
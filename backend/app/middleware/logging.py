@@ -1,23 +1,83 @@
 import logging
+import random
 import time
 
-from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def log_requests(request: Request, call_next):
+class RequestLoggingMiddleware:
     """
-    Middleware to log incoming requests and their processing time.
+    Pure ASGI middleware that emits one structured log record per request.
+
+    Unlike an `app.middleware("http")` function, it does not wrap the
+    response in an extra task and stream, so its per-request cost is a
+    few attribute reads and a single log call.
     """
-    start_time = time.time()
-    logger.info(f"Request: {request.method} {request.url.path}")
 
-    response = await call_next(request)
+    def __init__(self, app: ASGIApp, sample_rate_2xx: float = 1.0):
+        self.app = app
+        # Fraction of successful (2xx) requests to log; others are always logged.
+        self.sample_rate_2xx = sample_rate_2xx
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        status_code = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            sampled_out = (
+                200 <= status_code < 300
+                and self.sample_rate_2xx < 1.0
+                and random.random() >= self.sample_rate_2xx
+            )
+            if not sampled_out:
+                self._log(scope, status_code, duration_ns, response_bytes)
+
+    def _log(
+        self, scope: Scope, status_code: int, duration_ns: int, response_bytes: int
+    ) -> None:
+        # The router stores the matched route in the scope; use its template
+        # (e.g. /api/v1/tenants/{tenant_id}/users/) rather than the raw path.
+        route = scope.get("route")
+        route_path = getattr(route, "path", None) or scope["path"]
 
-    process_time = (time.time() - start_time) * 1000
-    logger.info(f"Response: {response.status_code} (took {process_time:.2f}ms)")
+        tenant_slug = None
+        for name, value in scope["headers"]:
+            if name == b"x-tenant-slug":
+                tenant_slug = value.decode("latin-1")
+                break
 
-    return response
+        logger.info(
+            "%s %s %d %.2fms",
+            scope["method"],
+            route_path,
+            status_code,
+            duration_ns / 1_000_000,
+            extra={
+                "http_method": scope["method"],
+                "http_route": route_path,
+                "http_status": status_code,
+                "duration_ns": duration_ns,
+                "tenant_slug": tenant_slug,
+                "response_bytes": response_bytes,
+            },
+        )
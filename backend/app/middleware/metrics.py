@@ -0,0 +1,57 @@
+import time
+
+from app.core.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+    tenant_label,
+    tenant_requests_total,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Label used for requests that matched no route (e.g. 404 scans),
+# so arbitrary paths never become label values.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that records request counts, latency and
+    in-flight requests per route template, and request counts per
+    authenticated tenant.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            http_requests_total.inc((route_path, method, status_code))
+            http_request_duration_seconds.observe(
+                (route_path, method), time.perf_counter() - start
+            )
+
+            # Set by get_current_auth_context for authenticated tenant members.
+            tenant_slug = scope.get("state", {}).get("tenant_slug")
+            if tenant_slug is not None:
+                tenant_requests_total.inc((tenant_label(tenant_slug),))
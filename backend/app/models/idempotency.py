@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+# A write request sent with an Idempotency-Key header, and its response once
+# the first execution has finished (see app/middleware/idempotency.py).
+# Rows are claimed before the request runs, so concurrent duplicates in any
+# process find the key taken and wait for the stored response.
+class IdempotencyKey(SQLModel, table=True):
+    __tablename__ = "idempotency_keys"  # type: ignore
+
+    # SHA-256 of the caller (token subject and tenant slug), so keys sent by
+    # different callers never collide.
+    scope: str = Field(primary_key=True, max_length=64)
+    key: str = Field(primary_key=True, max_length=255)
+    method: str = Field(max_length=10)
+    path: str = Field(max_length=500)
+    # SHA-256 of the method, path, query string and body.
+    request_hash: str = Field(max_length=64)
+
+    # Set once the first execution has finished; until then the key is in flight.
+    response_status: Optional[int] = None
+    # [[name, value], ...] as sent by the app.
+    response_headers: Optional[list] = Field(default=None, sa_column=Column(JSONB))
+    response_body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # An in-flight key not finished by then may be claimed again (its
+    # process is assumed to have died).
+    locked_until: datetime = Field(nullable=False)
+    # The stored response is replayed until then, and purged after.
+    expires_at: datetime = Field(nullable=False, index=True)
@@ -1,7 +1,9 @@
 import uuid
 from typing import Optional, List
-from datetime import date, datetime
+from datetime import date, datetime, time
 from enum import Enum
+from sqlalchemy import Column, Index, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import SQLModel, Field, Relationship
 
 # --- 1. Enums (The Rules) ---
@@ -14,6 +16,16 @@ class ServiceType(str, Enum):
     SURFACE = "SURFACE"
     EXPRESS = "EXPRESS"
 
+class Zone(str, Enum):
+    """
+    Rate zones between a pickup and a delivery pincode (see app.services.rates).
+    """
+    A = "A"  # Within a city (same sorting district)
+    B = "B"  # Within a postal circle, roughly a state
+    C = "C"  # Metro to metro
+    D = "D"  # Rest of India
+    E = "E"  # Special: North East, J&K, islands
+
 class PaymentMode(str, Enum):
     PREPAID = "PREPAID"
     COD = "COD"
@@ -39,6 +51,12 @@ class DocumentType(str, Enum):
     LABEL_IMAGE = "LABEL_IMAGE"        # If user provides their own label
     OTHER = "OTHER"
 
+class ImportJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
 
 # --- 2. Modular Tables ---
 
@@ -47,6 +65,23 @@ class Address(SQLModel, table=True):
     Physical locations (Sender/Receiver).
     """
     __tablename__ = "addresses" # type: ignore
+    __table_args__ = (
+        # Deduplicates addresses per tenant; see app.services.addresses.
+        Index("ux_addresses_tenant_content_hash", "tenant_id", "content_hash", unique=True),
+        # Trigram indexes for substring search (ILIKE '%...%').
+        Index(
+            "ix_addresses_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_addresses_phone_trgm", "phone",
+            postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_addresses_city_trgm", "city",
+            postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"},
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     tenant_id: uuid.UUID = Field(index=True, nullable=False)
@@ -64,6 +99,29 @@ class Address(SQLModel, table=True):
     pincode: str = Field(index=True, min_length=6, max_length=10, nullable=False)
     country: str = Field(default="IN", max_length=2)
 
+    # SHA-256 of the normalized address content (NULL for legacy rows)
+    content_hash: Optional[str] = Field(default=None, max_length=64)
+
+
+class DocumentBlob(SQLModel, table=True):
+    """
+    One stored file, shared by every document of a tenant with the same
+    content. Uploading a file the tenant already has reuses its blob.
+    """
+    __tablename__ = "document_blobs" # type: ignore
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "content_hash", name="unique_tenant_document_content"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    tenant_id: uuid.UUID = Field(nullable=False)
+    # SHA-256 of the file's bytes
+    content_hash: str = Field(max_length=64)
+    storage_key: str = Field(max_length=500)
+    size_bytes: int = Field(nullable=False)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
 
 class PickupDocument(SQLModel, table=True):
     """
@@ -73,16 +131,20 @@ class PickupDocument(SQLModel, table=True):
     __tablename__ = "pickup_documents" # type: ignore
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False)
+    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False, index=True)
     
     document_type: DocumentType = Field(nullable=False)
     file_url: str = Field(description="S3/Storage URL")
     file_name: str = Field(description="Original filename")
+    # Set for uploaded files (NULL for documents stored by URL only)
+    blob_id: Optional[uuid.UUID] = Field(default=None, foreign_key="document_blobs.id", index=True)
     
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Relationship
-    pickup: "PickupRequest" = Relationship(back_populates="documents")
+    pickup: "PickupRequest" = Relationship(
+        back_populates="documents", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class PaymentDetails(SQLModel, table=True):
@@ -92,7 +154,7 @@ class PaymentDetails(SQLModel, table=True):
     __tablename__ = "payment_details" # type: ignore
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False)
+    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False, index=True)
     
     amount: float = Field(default=0.0)
     currency: str = Field(default="INR", max_length=3)
@@ -108,7 +170,9 @@ class PaymentDetails(SQLModel, table=True):
     invoice_date: Optional[date] = None
     eway_bill_number: Optional[str] = None 
 
-    pickup: "PickupRequest" = Relationship(back_populates="payment_details")
+    pickup: "PickupRequest" = Relationship(
+        back_populates="payment_details", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class PackageDetails(SQLModel, table=True):
@@ -118,7 +182,7 @@ class PackageDetails(SQLModel, table=True):
     __tablename__ = "package_details" # type: ignore
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False)
+    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False, index=True)
     
     length: float = Field(description="CM")
     breadth: float = Field(description="CM")
@@ -129,17 +193,45 @@ class PackageDetails(SQLModel, table=True):
     description: Optional[str] = Field(default=None, description="Specifics for this box")
     is_fragile: bool = Field(default=False)
     
-    pickup: "PickupRequest" = Relationship(back_populates="packages")
+    pickup: "PickupRequest" = Relationship(
+        back_populates="packages", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 # --- 3. The Main Shipment Table ---
 
 class PickupRequest(SQLModel, table=True):
     __tablename__ = "pickups" # type: ignore
+    __table_args__ = (
+        # Listing indexes, matching the (created_at DESC, id DESC) keyset order
+        # of PickupRepository.list_pickups so pages need no sort.
+        Index("ix_pickups_tenant_created_at", "tenant_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_pickups_tenant_status_created_at",
+            "tenant_id", "status", text("created_at DESC"), text("id DESC"),
+        ),
+        Index("ix_pickups_tenant_requested_date", "tenant_id", "requested_pickup_date"),
+        # Returns are a small share of pickups, so they get their own partial index.
+        Index(
+            "ix_pickups_tenant_reverse_created_at",
+            "tenant_id", text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("shipment_type = 'REVERSE'"),
+        ),
+        # Trigram indexes for substring search (ILIKE '%...%').
+        Index(
+            "ix_pickups_order_reference_id_trgm", "order_reference_id",
+            postgresql_using="gin", postgresql_ops={"order_reference_id": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_pickups_tracking_id_trgm", "tracking_id",
+            postgresql_using="gin", postgresql_ops={"tracking_id": "gin_trgm_ops"},
+        ),
+    )
 
     # Identity
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    tenant_id: uuid.UUID = Field(index=True, nullable=False)
+    # Indexed through the composite indexes above, which all lead with tenant_id.
+    tenant_id: uuid.UUID = Field(nullable=False)
     created_by_user_id: uuid.UUID = Field(nullable=False)
 
     # Reference
@@ -162,26 +254,167 @@ class PickupRequest(SQLModel, table=True):
     requested_pickup_date: date = Field(nullable=False)
 
     # Foreign Keys
-    pickup_address_id: uuid.UUID = Field(foreign_key="addresses.id")
-    delivery_address_id: uuid.UUID = Field(foreign_key="addresses.id")
+    pickup_address_id: uuid.UUID = Field(foreign_key="addresses.id", index=True)
+    delivery_address_id: uuid.UUID = Field(foreign_key="addresses.id", index=True)
 
     # Relationships
-    packages: List[PackageDetails] = Relationship(back_populates="pickup")
-    documents: List[PickupDocument] = Relationship(back_populates="pickup")
+    # Lazy loading can't run under AsyncSession, so every relationship raises
+    # instead; queries choose a loader strategy (see PickupRepository).
+    packages: List[PackageDetails] = Relationship(
+        back_populates="pickup", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    documents: List[PickupDocument] = Relationship(
+        back_populates="pickup", sa_relationship_kwargs={"lazy": "raise"}
+    )
     
     payment_details: Optional[PaymentDetails] = Relationship(
-        sa_relationship_kwargs={"uselist": False},
+        sa_relationship_kwargs={"uselist": False, "lazy": "raise"},
         back_populates="pickup"
     )
     
     # Address Loading
     pickup_address: Address = Relationship(
-        sa_relationship_kwargs={"primaryjoin": "PickupRequest.pickup_address_id==Address.id"}
+        sa_relationship_kwargs={
+            "primaryjoin": "PickupRequest.pickup_address_id==Address.id",
+            "lazy": "raise",
+        }
     )
     delivery_address: Address = Relationship(
-        sa_relationship_kwargs={"primaryjoin": "PickupRequest.delivery_address_id==Address.id"}
+        sa_relationship_kwargs={
+            "primaryjoin": "PickupRequest.delivery_address_id==Address.id",
+            "lazy": "raise",
+        }
     )
 
+    # Optimistic concurrency: bumped by every status transition, which only
+    # applies if the row still has the version it was validated against.
+    version: int = Field(default=1, nullable=False, sa_column_kwargs={"server_default": text("1")})
+
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PickupStatusHistory(SQLModel, table=True):
+    """
+    Append-only log of pickup status transitions.
+    One row per version: it records how the pickup reached `version`.
+    """
+    __tablename__ = "pickup_status_history" # type: ignore
+    __table_args__ = (
+        UniqueConstraint("pickup_id", "version", name="unique_pickup_status_version"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", nullable=False)
+    tenant_id: uuid.UUID = Field(nullable=False)
+
+    from_status: PickupStatus = Field(nullable=False)
+    to_status: PickupStatus = Field(nullable=False)
+    version: int = Field(nullable=False)
+    reason: Optional[str] = Field(default=None, max_length=255)
+
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class CourierEvent(SQLModel, table=True):
+    """
+    Courier tracking events waiting to be applied, kept only when the
+    webhook queue is durable. Rows are deleted once their batch is applied.
+    """
+    __tablename__ = "courier_events" # type: ignore
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    courier: str = Field(max_length=50)
+    tracking_id: str = Field(max_length=100)
+    status: PickupStatus = Field(nullable=False)
+    occurred_at: datetime = Field(nullable=False)
+    reason: Optional[str] = Field(default=None, max_length=255)
+
+    received_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class PickupImportJob(SQLModel, table=True):
+    """
+    A CSV manifest being imported in the background.
+    `rows_processed` counts manifest rows already written or rejected; it is
+    committed together with each chunk, so a job resumes where it stopped.
+    """
+    __tablename__ = "pickup_import_jobs" # type: ignore
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    tenant_id: uuid.UUID = Field(index=True, nullable=False)
+    created_by_user_id: uuid.UUID = Field(nullable=False)
+
+    status: ImportJobStatus = Field(default=ImportJobStatus.PENDING, index=True)
+    file_name: Optional[str] = Field(default=None, max_length=255)
+    file_path: str = Field(max_length=500)
+
+    rows_processed: int = Field(default=0)
+    created_count: int = Field(default=0)
+    failed_count: int = Field(default=0)
+    # [{"row": n, "errors": [...]}], up to PICKUP_IMPORT_MAX_ERRORS entries.
+    # JSONB so each chunk can append its errors with ||.
+    errors: List[dict] = Field(
+        default_factory=list,
+        sa_column=Column(JSONB, nullable=False, server_default=text("'[]'::jsonb")),
+    )
+    # Why the whole job failed, e.g. an unreadable file.
+    error: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+
+class TenantPickupDailyStats(SQLModel, table=True):
+    """
+    Per-tenant rollup of pickups by creation day (UTC) and current status,
+    for dashboards. It is kept up to date in the same transaction as every
+    pickup insert and status transition (see PickupRepository), so reading
+    a date range costs one row per day and status.
+    Weights and volumes count every box: weight * box_count, and
+    length * breadth * height * box_count.
+    """
+    __tablename__ = "tenant_pickup_daily_stats" # type: ignore
+
+    tenant_id: uuid.UUID = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    status: PickupStatus = Field(primary_key=True)
+
+    pickup_count: int = Field(default=0)
+    # Sum of PaymentDetails.amount for COD pickups
+    cod_amount: float = Field(default=0.0)
+    total_weight_kg: float = Field(default=0.0)
+    total_volume_cm3: float = Field(default=0.0)
+
+
+class PickupAssignment(SQLModel, table=True):
+    """
+    A pickup's place in a rider's route for a day. Written by assignment
+    runs (see PickupAssignmentService) in the same transaction that moves
+    the pickup to ASSIGNED. A pickup handed back and assigned again gets
+    a new row.
+    """
+    __tablename__ = "pickup_assignments" # type: ignore
+    __table_args__ = (
+        # A rider's route for a day, in stop order.
+        Index(
+            "ix_pickup_assignments_tenant_date_rider",
+            "tenant_id", "pickup_date", "rider_code", "sequence",
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    tenant_id: uuid.UUID = Field(nullable=False)
+    pickup_id: uuid.UUID = Field(foreign_key="pickups.id", index=True)
+
+    pickup_date: date = Field(nullable=False)
+    rider_code: str = Field(max_length=50)
+    # 1-based position of the pickup in the rider's route.
+    sequence: int
+    # The pickup window promised to the customer.
+    window_start: time
+    window_end: time
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
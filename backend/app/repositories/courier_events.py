@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from app.models.pickups import CourierEvent
+from sqlalchemy import delete, insert, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class CourierEventRepository:
+    """
+    This class handles database operations for the durable courier event
+    queue. It depends on an AsyncSession from the dependency injection system.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def insert_events(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Stores queued events with one multi-row INSERT.
+        """
+        await self.session.exec(insert(CourierEvent).values(rows))  # type: ignore[call-overload]
+        await self.session.commit()
+
+    async def delete_events(self, event_ids: list[uuid.UUID]) -> None:
+        """
+        Removes events that have been applied.
+        """
+        statement = delete(CourierEvent).where(CourierEvent.id.in_(event_ids))  # type: ignore[attr-defined]
+        await self.session.exec(statement)  # type: ignore[call-overload]
+        await self.session.commit()
+
+    async def list_pending_events(
+        self,
+        *,
+        received_before: datetime,
+        limit: int,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[CourierEvent]:
+        """
+        Retrieves up to `limit` events received before `received_before`,
+        oldest first, starting after the `(received_at, id)` keyset `after`.
+        """
+        statement = (
+            select(CourierEvent)
+            .where(CourierEvent.received_at < received_before)
+            .order_by(CourierEvent.received_at, CourierEvent.id)  # type: ignore[arg-type]
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(
+                tuple_(CourierEvent.received_at, CourierEvent.id) > tuple_(*after)
+            )
+        result = await self.session.exec(statement)
+        return list(result.all())
@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Optional
+
+from app.models.idempotency import IdempotencyKey
+from sqlalchemy import and_, delete, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class IdempotencyRepository:
+    """
+    This class handles database operations for idempotency keys.
+    Every method commits, so a claim is visible to other processes at once.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def claim(
+        self,
+        *,
+        scope: str,
+        key: str,
+        method: str,
+        path: str,
+        request_hash: str,
+        now: datetime,
+        locked_until: datetime,
+        expires_at: datetime,
+    ) -> bool:
+        """
+        Marks a key as in flight for this request, with `now` as its
+        created_at. Succeeds if the key is new, expired, or held by a request
+        that outlived its lock. Returns False if someone else holds the key.
+        """
+        row = dict(
+            scope=scope,
+            key=key,
+            method=method,
+            path=path,
+            request_hash=request_hash,
+            response_status=None,
+            response_headers=None,
+            response_body=None,
+            created_at=now,
+            locked_until=locked_until,
+            expires_at=expires_at,
+        )
+        table = IdempotencyKey.__table__  # type: ignore[attr-defined]
+        statement = pg_insert(table).values(row)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.scope, table.c.key],
+            set_={name: statement.excluded[name] for name in row if name not in ("scope", "key")},
+            where=or_(
+                table.c.expires_at <= now,
+                and_(table.c.response_status.is_(None), table.c.locked_until <= now),
+            ),
+        ).returning(table.c.key)
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        claimed = result.first() is not None
+        await self.session.commit()
+        return claimed
+
+    async def get(self, *, scope: str, key: str) -> Optional[IdempotencyKey]:
+        statement = select(IdempotencyKey).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key
+        )
+        result = await self.session.exec(statement)
+        return result.first()
+
+    async def complete(
+        self,
+        *,
+        scope: str,
+        key: str,
+        claimed_at: datetime,
+        status: int,
+        headers: list[list[str]],
+        body: bytes,
+    ) -> None:
+        """
+        Stores the response of a key claimed at `claimed_at`. Does nothing if
+        the claim has since been taken over.
+        """
+        statement = (
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.scope == scope,  # type: ignore[arg-type]
+                IdempotencyKey.key == key,  # type: ignore[arg-type]
+                IdempotencyKey.created_at == claimed_at,  # type: ignore[arg-type]
+                IdempotencyKey.response_status.is_(None),  # type: ignore[union-attr]
+            )
+            .values(response_status=status, response_headers=headers, response_body=body)
+        )
+        await self.session.exec(statement)  # type: ignore[call-overload]
+        await self.session.commit()
+
+    async def release(self, *, scope: str, key: str, claimed_at: datetime) -> None:
+        """
+        Deletes a key claimed at `claimed_at` without storing a response, so
+        the next retry runs the request again.
+        """
+        statement = delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope,  # type: ignore[arg-type]
+            IdempotencyKey.key == key,  # type: ignore[arg-type]
+            IdempotencyKey.created_at == claimed_at,  # type: ignore[arg-type]
+            IdempotencyKey.response_status.is_(None),  # type: ignore[union-attr]
+        )
+        await self.session.exec(statement)  # type: ignore[call-overload]
+        await self.session.commit()
+
+    async def purge_expired(self, *, now: datetime, limit: int) -> int:
+        """
+        Deletes up to `limit` expired keys. Returns how many were deleted.
+        """
+        expired = (
+            select(IdempotencyKey.scope, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= now)
+            .limit(limit)
+        )
+        statement = delete(IdempotencyKey).where(
+            tuple_(IdempotencyKey.scope, IdempotencyKey.key).in_(expired)
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        await self.session.commit()
+        return result.rowcount
@@ -0,0 +1,87 @@
+import uuid
+from datetime import date
+from typing import Any
+
+from app.models.pickups import (
+    Address,
+    PackageDetails,
+    PickupAssignment,
+    PickupRequest,
+    PickupStatus,
+)
+from app.repositories.pickups import MAX_BIND_PARAMS
+from sqlalchemy import func, insert, true
+from sqlalchemy import select as sa_select
+from sqlalchemy.engine import Row
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class PickupAssignmentRepository:
+    """
+    This class handles database operations for assigning pickups to riders.
+    Status transitions go through PickupRepository, on the same session.
+    It depends on an AsyncSession from the dependency injection system.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def get_assignable_pickups(
+        self, *, tenant_id: uuid.UUID, pickup_date: date
+    ) -> list[Row]:
+        """
+        Retrieves the tenant's OPEN pickups requested for `pickup_date` or
+        earlier, with what an assignment run needs: (id, version,
+        requested_pickup_date, pickup_address_id, city, pincode, weight_kg,
+        boxes). Weights count every box. Reads from the primary, so the
+        versions are current.
+        """
+        packages = (
+            sa_select(
+                func.coalesce(
+                    func.sum(PackageDetails.weight * PackageDetails.box_count), 0
+                ).label("weight_kg"),
+                func.coalesce(func.sum(PackageDetails.box_count), 0).label("boxes"),
+            )
+            .where(PackageDetails.pickup_id == PickupRequest.id)
+            .lateral("package_totals")
+        )
+        statement = (
+            sa_select(
+                PickupRequest.id,
+                PickupRequest.version,
+                PickupRequest.requested_pickup_date,
+                PickupRequest.pickup_address_id,
+                Address.city,
+                Address.pincode,
+                packages.c.weight_kg,
+                packages.c.boxes,
+            )
+            .join(Address, Address.id == PickupRequest.pickup_address_id)  # type: ignore[arg-type]
+            .join(packages, true())
+            .where(
+                PickupRequest.tenant_id == tenant_id,
+                PickupRequest.status == PickupStatus.OPEN,
+                PickupRequest.requested_pickup_date <= pickup_date,
+            )
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        return list(result.all())
+
+    async def insert_assignments(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Inserts assignment rows with multi-row INSERTs, each under the bind
+        parameter limit. Doesn't commit.
+        """
+        if not rows:
+            return
+        step = MAX_BIND_PARAMS // len(rows[0])
+        for start in range(0, len(rows), step):
+            statement = insert(PickupAssignment).values(rows[start : start + step])
+            await self.session.exec(statement)  # type: ignore[call-overload]
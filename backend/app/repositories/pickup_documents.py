@@ -0,0 +1,73 @@
+import uuid
+
+from app.models.pickups import DocumentBlob, PickupDocument, PickupRequest
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class PickupDocumentRepository:
+    """
+    This class handles database operations for uploaded pickup documents
+    and the stored files (blobs) behind them.
+    It depends on an AsyncSession from the dependency injection system.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def pickup_exists(self, *, pickup_id: uuid.UUID, tenant_id: uuid.UUID) -> bool:
+        """
+        Checks that a pickup exists and belongs to the tenant.
+        """
+        statement = select(PickupRequest.id).where(
+            PickupRequest.id == pickup_id, PickupRequest.tenant_id == tenant_id
+        )
+        result = await self.session.exec(statement)
+        return result.first() is not None
+
+    async def get_or_create_blob(self, blob: DocumentBlob) -> tuple[DocumentBlob, bool]:
+        """
+        Stores a blob unless the tenant already has one with the same content
+        hash. Returns the tenant's blob for that content and whether it is
+        the new one. A concurrent upload of the same content waits on the
+        unique constraint, then gets the blob the other upload stored.
+        """
+        statement = (
+            pg_insert(DocumentBlob)
+            .values(
+                id=blob.id,
+                tenant_id=blob.tenant_id,
+                content_hash=blob.content_hash,
+                storage_key=blob.storage_key,
+                size_bytes=blob.size_bytes,
+                created_at=blob.created_at,
+            )
+            .on_conflict_do_nothing(index_elements=["tenant_id", "content_hash"])
+            .returning(DocumentBlob.id)  # type: ignore[arg-type]
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        if result.first() is not None:
+            return blob, True
+
+        existing = await self.session.exec(
+            select(DocumentBlob).where(
+                DocumentBlob.tenant_id == blob.tenant_id,
+                DocumentBlob.content_hash == blob.content_hash,
+            )
+        )
+        return existing.one(), False
+
+    async def add_document(self, document: PickupDocument) -> PickupDocument:
+        """
+        Adds a document to a pickup and commits, together with its blob.
+        """
+        self.session.add(document)
+        await self.session.commit()
+        return document
@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from app.models.pickups import ImportJobStatus, PickupImportJob
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def _claimable(stale_before: datetime):
+    """
+    Jobs no process is working on: pending ones, and running ones whose
+    progress hasn't moved since `stale_before` (their process died).
+    """
+    return or_(
+        PickupImportJob.status == ImportJobStatus.PENDING,
+        (PickupImportJob.status == ImportJobStatus.RUNNING)
+        & (PickupImportJob.updated_at < stale_before),
+    )
+
+
+class PickupImportRepository:
+    """
+    This class handles database operations for pickup import jobs.
+    It depends on an AsyncSession from the dependency injection system.
+    Progress updates are not committed here, so a job's progress can be
+    committed in the same transaction as the pickups it wrote.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def create_job(self, job: PickupImportJob) -> PickupImportJob:
+        """
+        Stores a new import job.
+        """
+        self.session.add(job)
+        await self.session.commit()
+        return job
+
+    async def get_job(
+        self, job_id: uuid.UUID, tenant_id: Optional[uuid.UUID] = None
+    ) -> PickupImportJob | None:
+        """
+        Retrieves one import job, optionally only if it belongs to the tenant.
+        """
+        statement = select(PickupImportJob).where(PickupImportJob.id == job_id)
+        if tenant_id is not None:
+            statement = statement.where(PickupImportJob.tenant_id == tenant_id)
+        result = await self.session.exec(statement)
+        return result.first()
+
+    async def list_claimable_job_ids(self, *, stale_before: datetime) -> list[uuid.UUID]:
+        """
+        Returns the ids of pending and abandoned jobs, oldest first.
+        """
+        statement = (
+            select(PickupImportJob.id)
+            .where(_claimable(stale_before))
+            .order_by(PickupImportJob.created_at)  # type: ignore[arg-type]
+        )
+        result = await self.session.exec(statement)
+        return list(result.all())
+
+    async def claim_job(
+        self, job_id: uuid.UUID, *, stale_before: datetime
+    ) -> PickupImportJob | None:
+        """
+        Marks a pending or abandoned job as running and returns it, or returns
+        None if it is finished or another process holds it. The conditional
+        UPDATE makes the claim atomic across processes. The job is detached
+        from the session, so later rollbacks don't expire it.
+        """
+        statement = (
+            update(PickupImportJob)
+            .where(PickupImportJob.id == job_id, _claimable(stale_before))  # type: ignore[arg-type]
+            .values(status=ImportJobStatus.RUNNING, updated_at=datetime.utcnow())
+            .returning(PickupImportJob.id)  # type: ignore[arg-type]
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        claimed = result.first() is not None
+        await self.session.commit()
+        if not claimed:
+            return None
+        job = await self.get_job(job_id)
+        if job is not None:
+            self.session.expunge(job)
+        return job
+
+    async def record_progress(
+        self,
+        job_id: uuid.UUID,
+        *,
+        expected_rows_processed: int,
+        rows: int,
+        created: int,
+        failed: int,
+        errors: list[dict[str, Any]],
+    ) -> bool:
+        """
+        Adds a chunk's counts and row errors to a running job, if it has
+        processed exactly `expected_rows_processed` rows. Returns False
+        otherwise, i.e. when another process took the job over, in which case
+        the caller must roll back the chunk.
+        """
+        values: dict[str, Any] = {
+            "rows_processed": PickupImportJob.rows_processed + rows,
+            "created_count": PickupImportJob.created_count + created,
+            "failed_count": PickupImportJob.failed_count + failed,
+            "updated_at": datetime.utcnow(),
+        }
+        if errors:
+            values["errors"] = PickupImportJob.errors.op("||")(  # type: ignore[attr-defined]
+                bindparam("new_errors", errors, type_=JSONB)
+            )
+        statement = (
+            update(PickupImportJob)
+            .where(
+                PickupImportJob.id == job_id,  # type: ignore[arg-type]
+                PickupImportJob.status == ImportJobStatus.RUNNING,  # type: ignore[arg-type]
+                PickupImportJob.rows_processed == expected_rows_processed,  # type: ignore[arg-type]
+            )
+            .values(values)
+            .returning(PickupImportJob.id)  # type: ignore[arg-type]
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        return result.first() is not None
+
+    async def finish_job(
+        self, job_id: uuid.UUID, *, status: ImportJobStatus, error: Optional[str] = None
+    ) -> None:
+        """
+        Marks a job as completed or failed and commits.
+        """
+        now = datetime.utcnow()
+        statement = (
+            update(PickupImportJob)
+            .where(PickupImportJob.id == job_id)  # type: ignore[arg-type]
+            .values(status=status, error=error, updated_at=now, finished_at=now)
+        )
+        await self.session.exec(statement)  # type: ignore[call-overload]
+        await self.session.commit()
@@ -0,0 +1,91 @@
+import uuid
+from datetime import date
+from typing import Any
+
+from app.models.pickups import PickupRequest, TenantPickupDailyStats
+from app.repositories.pickups import pickup_daily_stats_statement
+from sqlalchemy import delete, insert, union
+from sqlalchemy import select as sa_select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+STATS_COLUMNS = ("pickup_count", "cod_amount", "total_weight_kg", "total_volume_cm3")
+
+
+class PickupStatsRepository:
+    """
+    This class handles database operations for the per-tenant daily pickup
+    stats. The stats are written by PickupRepository together with the
+    pickups; this class reads them and rebuilds them from the pickups.
+    It depends on an AsyncSession from the dependency injection system.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_daily_stats(
+        self, *, tenant_id: uuid.UUID, day_from: date, day_to: date
+    ) -> list[TenantPickupDailyStats]:
+        """
+        Retrieves a tenant's stats rows for a range of days (both inclusive),
+        by day and status. Reads at most one row per day and status.
+        """
+        statement = (
+            select(TenantPickupDailyStats)
+            .where(
+                TenantPickupDailyStats.tenant_id == tenant_id,
+                TenantPickupDailyStats.day >= day_from,
+                TenantPickupDailyStats.day <= day_to,
+            )
+            .order_by(TenantPickupDailyStats.day, TenantPickupDailyStats.status)  # type: ignore[arg-type]
+        )
+        result = await self.session.exec(statement)
+        return list(result.all())
+
+    async def list_tenant_ids(self) -> list[uuid.UUID]:
+        """
+        Returns every tenant that has pickups or stats rows.
+        """
+        statement = union(
+            sa_select(PickupRequest.tenant_id).distinct(),
+            sa_select(TenantPickupDailyStats.tenant_id).distinct(),
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        return [tenant_id for (tenant_id,) in result.all()]
+
+    async def get_stored_stats(self, tenant_id: uuid.UUID) -> list[dict[str, Any]]:
+        """
+        Returns all of a tenant's stats rows as they are stored.
+        """
+        statement = sa_select(TenantPickupDailyStats.__table__).where(  # type: ignore[attr-defined]
+            TenantPickupDailyStats.tenant_id == tenant_id
+        )
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        return [dict(row) for row in result.mappings().all()]
+
+    async def recompute_stats(self, tenant_id: uuid.UUID) -> list[dict[str, Any]]:
+        """
+        Computes a tenant's stats rows from scratch, from all its pickups.
+        """
+        statement = pickup_daily_stats_statement(PickupRequest.tenant_id == tenant_id)
+        result = await self.session.exec(statement)  # type: ignore[call-overload]
+        return [dict(row) for row in result.mappings().all()]
+
+    async def rebuild_stats(self, tenant_id: uuid.UUID) -> None:
+        """
+        Replaces a tenant's stats rows with a full recompute and commits.
+        Pickup writes that commit meanwhile wait on the new rows, then add
+        onto them, so no change is lost.
+        """
+        await self.session.exec(  # type: ignore[call-overload]
+            delete(TenantPickupDailyStats).where(
+                TenantPickupDailyStats.tenant_id == tenant_id  # type: ignore[arg-type]
+            )
+        )
+        await self.session.exec(  # type: ignore[call-overload]
+            insert(TenantPickupDailyStats).from_select(
+                ["tenant_id", "day", "status", *STATS_COLUMNS],
+                pickup_daily_stats_statement(PickupRequest.tenant_id == tenant_id),
+            )
+        )
+        await self.session.commit()
@@ -0,0 +1,928 @@
+import asyncio
+import uuid
+from datetime import date, datetime
+from typing import Any, AsyncIterator
+
+from app.core.config import settings
+from app.models.pickups import (
+    Address,
+    PackageDetails,
+    PaymentDetails,
+    PaymentMode,
+    PickupRequest,
+    PickupStatus,
+    PickupStatusHistory,
+    ServiceType,
+    ShipmentType,
+    TenantPickupDailyStats,
+)
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Float,
+    FromClause,
+    Insert,
+    Integer,
+    Lateral,
+    Select,
+    String,
+    Text,
+    Uuid,
+    any_,
+    bindparam,
+    cast,
+    column,
+    func,
+    insert,
+    literal,
+    or_,
+    table,
+    true,
+    tuple_,
+    union,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy import select as sa_select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Dialect, RowMapping
+from sqlalchemy.orm import aliased, contains_eager, joinedload, selectinload
+from sqlalchemy.sql.expression import TableClause
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+# Chunks of COPY output buffered between Postgres and the client.
+COPY_QUEUE_CHUNKS = 16
+
+# PostgreSQL's wire protocol allows at most 32767 bind parameters per statement.
+MAX_BIND_PARAMS = 32767
+
+
+def _rows_per_statement(rows: list[dict[str, Any]], reserved: int = 0) -> int:
+    """
+    Rows that fit in one statement, leaving `reserved` parameters for the
+    rest of the statement.
+    """
+    return max(1, (MAX_BIND_PARAMS - reserved) // len(rows[0]))
+
+
+# Loads the whole pickup aggregate in a fixed number of queries, however many
+# pickups are selected. To-one relationships are joined into the main SELECT;
+# collections each get one SELECT ... WHERE pickup_id IN (...), which avoids
+# multiplying pickup rows by packages x documents in a single join.
+PICKUP_AGGREGATE_OPTIONS = (
+    joinedload(PickupRequest.pickup_address, innerjoin=True),  # type: ignore[arg-type]
+    joinedload(PickupRequest.delivery_address, innerjoin=True),  # type: ignore[arg-type]
+    joinedload(PickupRequest.payment_details),  # type: ignore[arg-type]
+    selectinload(PickupRequest.packages),  # type: ignore[arg-type]
+    selectinload(PickupRequest.documents),  # type: ignore[arg-type]
+)
+
+
+def pickup_filter_clauses(
+    *,
+    tenant_id: uuid.UUID,
+    status: PickupStatus | None = None,
+    service_type: ServiceType | None = None,
+    shipment_type: ShipmentType | None = None,
+    requested_from: date | None = None,
+    requested_to: date | None = None,
+) -> list:
+    """
+    WHERE clauses selecting one tenant's pickups by the listing filters.
+    """
+    clauses = [PickupRequest.tenant_id == tenant_id]
+    if status is not None:
+        clauses.append(PickupRequest.status == status)
+    if service_type is not None:
+        clauses.append(PickupRequest.service_type == service_type)
+    if shipment_type is not None:
+        # Rendered inline rather than as a bind parameter: a generic prepared
+        # plan can't prove `shipment_type = $1` matches the partial index.
+        shipment_type_literal = literal(
+            shipment_type,
+            type_=PickupRequest.__table__.c.shipment_type.type,  # type: ignore[attr-defined]
+            literal_execute=True,
+        )
+        clauses.append(PickupRequest.shipment_type == shipment_type_literal)
+    if requested_from is not None:
+        clauses.append(PickupRequest.requested_pickup_date >= requested_from)
+    if requested_to is not None:
+        clauses.append(PickupRequest.requested_pickup_date <= requested_to)
+    return clauses
+
+
+def pickup_list_statement(
+    *,
+    tenant_id: uuid.UUID,
+    limit: int,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    **filters: Any,
+) -> SelectOfScalar[PickupRequest]:
+    """
+    Builds the pickup listing query: one tenant's pickups ordered by
+    (created_at DESC, id DESC), optionally filtered, starting after the
+    `after` keyset. The order matches the ix_pickups_tenant_*_created_at
+    indexes, so Postgres reads pages straight off an index without sorting.
+    """
+    statement = (
+        select(PickupRequest)
+        .where(*pickup_filter_clauses(tenant_id=tenant_id, **filters))
+        .order_by(
+            PickupRequest.created_at.desc(),  # type: ignore[attr-defined]
+            PickupRequest.id.desc(),  # type: ignore[attr-defined]
+        )
+        .limit(limit)
+    )
+    if after is not None:
+        # A row comparison, so Postgres can use it as an index condition.
+        statement = statement.where(
+            tuple_(PickupRequest.created_at, PickupRequest.id) < tuple_(*after)
+        )
+    return statement
+
+
+# Address columns included in the export, once for each side.
+EXPORT_ADDRESS_COLUMNS = (
+    "name", "phone", "address_line1", "address_line2", "city", "state", "pincode",
+)
+
+
+def pickup_export_statement(
+    *,
+    tenant_id: uuid.UUID,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    **filters: Any,
+) -> Select:
+    """
+    Builds the export query: one flat row per pickup with both addresses,
+    package totals and payment details, oldest first. Accepts the listing
+    filters plus a created_at range (from inclusive, to exclusive).
+    Enums are cast to text so every column is plain data.
+    """
+    pickup_address = aliased(Address)
+    delivery_address = aliased(Address)
+    # Package totals per pickup, read through ix_package_details_pickup_id.
+    packages = (
+        sa_select(
+            func.count().label("package_count"),
+            func.coalesce(func.sum(PackageDetails.box_count), 0).label("box_count"),
+            func.coalesce(
+                func.sum(PackageDetails.weight * PackageDetails.box_count), 0
+            ).label("total_weight_kg"),
+        )
+        .where(PackageDetails.pickup_id == PickupRequest.id)
+        .lateral("packages")
+    )
+
+    columns = [
+        PickupRequest.id.label("pickup_id"),  # type: ignore[attr-defined]
+        PickupRequest.order_reference_id,
+        PickupRequest.tracking_id,
+        cast(PickupRequest.status, String).label("status"),
+        cast(PickupRequest.shipment_type, String).label("shipment_type"),
+        cast(PickupRequest.service_type, String).label("service_type"),
+        PickupRequest.requested_pickup_date,
+        PickupRequest.version,
+        PickupRequest.created_at,
+        PickupRequest.updated_at,
+    ]
+    for prefix, address in (("pickup", pickup_address), ("delivery", delivery_address)):
+        columns += [
+            getattr(address, name).label(f"{prefix}_{name}") for name in EXPORT_ADDRESS_COLUMNS
+        ]
+    columns += [
+        packages.c.package_count,
+        packages.c.box_count,
+        packages.c.total_weight_kg,
+        cast(PaymentDetails.payment_mode, String).label("payment_mode"),
+        PaymentDetails.amount,
+        PaymentDetails.currency,
+        PaymentDetails.declared_value,
+        PaymentDetails.invoice_number,
+        PaymentDetails.eway_bill_number,
+    ]
+
+    statement = (
+        sa_select(*columns)
+        .select_from(PickupRequest)
+        .join(pickup_address, pickup_address.id == PickupRequest.pickup_address_id)
+        .join(delivery_address, delivery_address.id == PickupRequest.delivery_address_id)
+        .join(packages, true())
+        .outerjoin(PaymentDetails, PaymentDetails.pickup_id == PickupRequest.id)
+        .where(*pickup_filter_clauses(tenant_id=tenant_id, **filters))
+        .order_by(PickupRequest.created_at, PickupRequest.id)  # type: ignore[arg-type]
+    )
+    if created_from is not None:
+        statement = statement.where(PickupRequest.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(PickupRequest.created_at < created_to)
+    return statement
+
+
+def _pickup_totals(pickup_id: ColumnElement) -> tuple[Lateral, Lateral]:
+    """
+    LATERAL subqueries with the package and COD totals of one pickup,
+    read through the pickup_id indexes of the child tables.
+    """
+    packages = (
+        sa_select(
+            func.coalesce(
+                func.sum(PackageDetails.weight * PackageDetails.box_count), 0
+            ).label("weight_kg"),
+            func.coalesce(
+                func.sum(
+                    PackageDetails.length
+                    * PackageDetails.breadth
+                    * PackageDetails.height
+                    * PackageDetails.box_count
+                ),
+                0,
+            ).label("volume_cm3"),
+        )
+        .where(PackageDetails.pickup_id == pickup_id)
+        .lateral("package_totals")
+    )
+    payments = (
+        sa_select(
+            func.coalesce(
+                func.sum(PaymentDetails.amount).filter(
+                    PaymentDetails.payment_mode == PaymentMode.COD
+                ),
+                0,
+            ).label("cod_amount")
+        )
+        .where(PaymentDetails.pickup_id == pickup_id)
+        .lateral("payment_totals")
+    )
+    return packages, payments
+
+
+def _daily_stats_select(
+    source: FromClause,
+    *,
+    pickup_id: ColumnElement,
+    tenant_id: ColumnElement,
+    created_at: ColumnElement,
+    status: ColumnElement,
+    sign: ColumnElement | None = None,
+) -> Select:
+    """
+    Sums the pickups of `source` into TenantPickupDailyStats rows, one per
+    (tenant_id, day, status). With `sign`, each pickup is counted `sign`
+    times (+1 or -1), so removals and additions can be summed together.
+    Rows come out in primary key order, so concurrent upserts of several
+    rows lock them in the same order and can't deadlock.
+    """
+    packages, payments = _pickup_totals(pickup_id)
+    day = cast(created_at, Date)
+    measures = [payments.c.cod_amount, packages.c.weight_kg, packages.c.volume_cm3]
+    if sign is None:
+        pickup_count = func.count()
+    else:
+        pickup_count = func.sum(sign)
+        measures = [sign * measure for measure in measures]
+    cod_amount, weight_kg, volume_cm3 = measures
+    return (
+        sa_select(
+            tenant_id.label("tenant_id"),
+            day.label("day"),
+            status.label("status"),
+            pickup_count.label("pickup_count"),
+            func.sum(cod_amount).label("cod_amount"),
+            func.sum(weight_kg).label("total_weight_kg"),
+            func.sum(volume_cm3).label("total_volume_cm3"),
+        )
+        .select_from(source)
+        .join(packages, true())
+        .join(payments, true())
+        .group_by(tenant_id, day, status)
+        .order_by(tenant_id, day, status)
+    )
+
+
+def pickup_daily_stats_statement(*where: ColumnElement) -> Select:
+    """
+    Computes TenantPickupDailyStats rows from scratch for the pickups
+    matching `where`.
+    """
+    return _daily_stats_select(
+        PickupRequest.__table__,  # type: ignore[attr-defined]
+        pickup_id=PickupRequest.id,  # type: ignore[arg-type]
+        tenant_id=PickupRequest.tenant_id,  # type: ignore[arg-type]
+        created_at=PickupRequest.created_at,  # type: ignore[arg-type]
+        status=PickupRequest.status,  # type: ignore[arg-type]
+    ).where(*where)
+
+
+def _add_to_daily_stats(rows: Select) -> Insert:
+    """
+    Adds rows from _daily_stats_select() onto TenantPickupDailyStats,
+    creating the rows that don't exist yet.
+    """
+    stats = TenantPickupDailyStats.__table__  # type: ignore[attr-defined]
+    statement = pg_insert(stats).from_select(
+        [
+            "tenant_id",
+            "day",
+            "status",
+            "pickup_count",
+            "cod_amount",
+            "total_weight_kg",
+            "total_volume_cm3",
+        ],
+        rows,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[stats.c.tenant_id, stats.c.day, stats.c.status],
+        set_={
+            name: stats.c[name] + statement.excluded[name]
+            for name in ("pickup_count", "cod_amount", "total_weight_kg", "total_volume_cm3")
+        },
+    )
+
+
+def _positional_sql(statement: Select, dialect: Dialect) -> tuple[str, list[Any]]:
+    """
+    Compiles a statement to SQL with $n placeholders and its arguments,
+    for running it directly on the asyncpg connection.
+    """
+    compiled = statement.compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.construct_params()
+    args = []
+    for name in compiled.positiontup or ():
+        processor = compiled.binds[name].type.bind_processor(dialect)
+        args.append(processor(params[name]) if processor else params[name])
+    return str(compiled), args
+
+
+def _contains_pattern(query: str) -> str:
+    """
+    An ILIKE pattern matching `query` anywhere, with LIKE wildcards escaped.
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class PickupRepository:
+    """
+    This class handles all database operations for pickups and their
+    addresses, packages, payment details and documents.
+    It depends on an AsyncSession from the dependency injection system.
+    Batch writes don't commit; callers group them with commit()/rollback().
+    Reads use `read_session`, which may be bound to a read replica.
+    """
+
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
+        self.session = session
+        self.read_session = read_session or session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def get_pickup(
+        self, *, pickup_id: uuid.UUID, tenant_id: uuid.UUID
+    ) -> PickupRequest | None:
+        """
+        Retrieves one pickup of a tenant with its addresses, packages,
+        documents and payment details loaded.
+        """
+        statement = (
+            select(PickupRequest)
+            .where(PickupRequest.id == pickup_id, PickupRequest.tenant_id == tenant_id)
+            .options(*PICKUP_AGGREGATE_OPTIONS)
+        )
+        result = await self.read_session.exec(statement)
+        return result.first()
+
+    async def list_pickups(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        limit: int,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        **filters: Any,
+    ) -> list[PickupRequest]:
+        """
+        Retrieves up to `limit` pickups of a tenant, newest first, starting
+        after the `(created_at, id)` keyset `after`, with the full aggregate
+        loaded for each. See pickup_list_statement() for the filters.
+        """
+        statement = pickup_list_statement(
+            tenant_id=tenant_id, limit=limit, after=after, **filters
+        ).options(*PICKUP_AGGREGATE_OPTIONS)
+        result = await self.read_session.exec(statement)
+        return list(result.all())
+
+    async def search_pickups(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        query: str,
+        limit: int,
+        after: tuple[float, uuid.UUID] | None = None,
+    ) -> list[tuple[PickupRequest, float]]:
+        """
+        Finds a tenant's pickups whose order reference or tracking id, or
+        whose pickup or delivery address name, phone or city contains `query`
+        (case-insensitive). Returns up to `limit` (pickup, rank) pairs with
+        the full aggregate loaded, best match first, starting after the
+        `(rank, id)` keyset `after`. The rank is the best trigram similarity
+        between `query` and any searched field.
+
+        Each table is matched on its own so Postgres can combine the trigram
+        GIN indexes with a BitmapOr; an OR across joined tables can't use them.
+        """
+        pattern = _contains_pattern(query)
+        matched_addresses = (
+            select(Address.id)
+            .where(
+                Address.tenant_id == tenant_id,
+                or_(
+                    Address.name.ilike(pattern, escape="\\"),  # type: ignore[attr-defined]
+                    Address.phone.ilike(pattern, escape="\\"),  # type: ignore[attr-defined]
+                    Address.city.ilike(pattern, escape="\\"),  # type: ignore[attr-defined]
+                ),
+            )
+            .cte("matched_addresses")
+        )
+        candidates = union(
+            select(PickupRequest.id).where(
+                PickupRequest.tenant_id == tenant_id,
+                or_(
+                    PickupRequest.order_reference_id.ilike(pattern, escape="\\"),  # type: ignore[attr-defined]
+                    PickupRequest.tracking_id.ilike(pattern, escape="\\"),  # type: ignore[union-attr]
+                ),
+            ),
+            select(PickupRequest.id).where(
+                PickupRequest.tenant_id == tenant_id,
+                PickupRequest.pickup_address_id.in_(select(matched_addresses.c.id)),  # type: ignore[attr-defined]
+            ),
+            select(PickupRequest.id).where(
+                PickupRequest.tenant_id == tenant_id,
+                PickupRequest.delivery_address_id.in_(select(matched_addresses.c.id)),  # type: ignore[attr-defined]
+            ),
+        ).subquery("candidates")
+
+        pickup_address = aliased(Address)
+        delivery_address = aliased(Address)
+        # similarity() returns real; widen it so the cursor value round-trips exactly.
+        rank = cast(
+            func.greatest(
+                func.similarity(PickupRequest.order_reference_id, query),
+                func.similarity(func.coalesce(PickupRequest.tracking_id, ""), query),
+                *(
+                    func.similarity(address_column, query)
+                    for address in (pickup_address, delivery_address)
+                    for address_column in (address.name, address.phone, address.city)
+                ),
+            ),
+            Float,
+        )
+
+        statement = (
+            select(PickupRequest, rank)
+            .join(candidates, candidates.c.id == PickupRequest.id)
+            .join(pickup_address, PickupRequest.pickup_address)  # type: ignore[arg-type]
+            .join(delivery_address, PickupRequest.delivery_address)  # type: ignore[arg-type]
+            .order_by(rank.desc(), PickupRequest.id.desc())  # type: ignore[attr-defined]
+            .limit(limit)
+            .options(
+                # The addresses are already joined for ranking.
+                contains_eager(PickupRequest.pickup_address, alias=pickup_address),  # type: ignore[arg-type]
+                contains_eager(PickupRequest.delivery_address, alias=delivery_address),  # type: ignore[arg-type]
+                joinedload(PickupRequest.payment_details),  # type: ignore[arg-type]
+                selectinload(PickupRequest.packages),  # type: ignore[arg-type]
+                selectinload(PickupRequest.documents),  # type: ignore[arg-type]
+            )
+        )
+        if after is not None:
+            statement = statement.where(tuple_(rank, PickupRequest.id) < tuple_(*after))
+        result = await self.read_session.exec(statement)
+        return list(result.all())  # type: ignore[arg-type]
+
+    async def stream_export_rows(
+        self, *, tenant_id: uuid.UUID, **filters: Any
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Yields a tenant's export rows (see pickup_export_statement()) through
+        a server-side cursor, fetching STREAM_BATCH_SIZE rows at a time.
+        """
+        statement = pickup_export_statement(tenant_id=tenant_id, **filters)
+        result = await self.read_session.stream(
+            statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+        )
+        async for batch in result.mappings().partitions():
+            for row in batch:
+                yield row
+
+    async def copy_export_csv(
+        self, *, tenant_id: uuid.UUID, **filters: Any
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields a tenant's export rows (see pickup_export_statement()) as CSV
+        with a header line, formatted by Postgres with COPY (...) TO STDOUT.
+        Chunks pass through a small bounded queue, so a slow client pauses
+        the COPY instead of buffering the export in memory.
+        """
+        connection = await self.read_session.connection()
+        sql, args = _positional_sql(
+            pickup_export_statement(tenant_id=tenant_id, **filters), connection.dialect
+        )
+        raw_connection = await connection.get_raw_connection()
+        chunks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=COPY_QUEUE_CHUNKS)
+
+        async def copy() -> None:
+            try:
+                await raw_connection.driver_connection.copy_from_query(
+                    sql, *args, output=chunks.put, format="csv", header=True
+                )
+            except Exception:
+                await chunks.put(None)
+                raise
+            await chunks.put(None)
+
+        task = asyncio.create_task(copy())
+        try:
+            while (chunk := await chunks.get()) is not None:
+                yield chunk
+            # Re-raises the error if the COPY failed.
+            await task
+        finally:
+            # The client went away mid-export: stop the COPY.
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _insert_many(self, model: type[SQLModel], rows: list[dict[str, Any]]) -> None:
+        """
+        Inserts rows with multi-row INSERT ... VALUES statements, splitting
+        them so each statement stays under the bind parameter limit.
+        """
+        if not rows:
+            return
+        step = _rows_per_statement(rows)
+        for start in range(0, len(rows), step):
+            statement = insert(model).values(rows[start : start + step])
+            await self.session.exec(statement)  # type: ignore[call-overload]
+
+    async def get_or_create_addresses(
+        self, *, tenant_id: uuid.UUID, rows: list[dict[str, Any]]
+    ) -> dict[str, uuid.UUID]:
+        """
+        Inserts addresses that don't exist yet for the tenant, keyed on
+        (tenant_id, content_hash), and returns the id for every content hash.
+        Rows must have unique content hashes. Existing rows are not locked or
+        rewritten: conflicts are skipped and their ids are read back.
+        """
+        address_ids: dict[str, uuid.UUID] = {}
+        if not rows:
+            return address_ids
+
+        step = _rows_per_statement(rows)
+        for start in range(0, len(rows), step):
+            statement = (
+                pg_insert(Address)
+                .values(rows[start : start + step])
+                .on_conflict_do_nothing(index_elements=["tenant_id", "content_hash"])
+                .returning(Address.content_hash, Address.id)  # type: ignore[arg-type]
+            )
+            result = await self.session.exec(statement)  # type: ignore[call-overload]
+            address_ids.update({content_hash: id_ for content_hash, id_ in result.all()})
+
+        existing = [
+            row["content_hash"] for row in rows if row["content_hash"] not in address_ids
+        ]
+        if existing:
+            statement = select(Address.content_hash, Address.id).where(
+                Address.tenant_id == tenant_id,
+                Address.content_hash.in_(existing),  # type: ignore[union-attr]
+            )
+            result = await self.session.exec(statement)
+            address_ids.update({content_hash: id_ for content_hash, id_ in result.all()})
+
+        return address_ids
+
+    async def insert_pickups(
+        self,
+        *,
+        pickups: list[dict[str, Any]],
+        packages: list[dict[str, Any]],
+        payments: list[dict[str, Any]],
+    ) -> None:
+        """
+        Writes a batch of pickups and their related rows using one multi-row
+        INSERT per table instead of adding ORM objects one by one, and adds
+        them to the tenant's daily stats.
+        Rows must already carry their primary and foreign keys.
+        """
+        await self._insert_many(PickupRequest, pickups)
+        await self._insert_many(PackageDetails, packages)
+        await self._insert_many(PaymentDetails, payments)
+        if pickups:
+            pickup_ids = bindparam(
+                "pickup_ids", [row["id"] for row in pickups], type_=ARRAY(Uuid)
+            )
+            await self.session.exec(  # type: ignore[call-overload]
+                _add_to_daily_stats(
+                    pickup_daily_stats_statement(PickupRequest.id == any_(pickup_ids))
+                )
+            )
+
+    async def copy_pickup_batch(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        addresses: list[dict[str, Any]],
+        pickups: list[dict[str, Any]],
+        packages: list[dict[str, Any]],
+        payments: list[dict[str, Any]],
+    ) -> None:
+        """
+        Writes a batch like get_or_create_addresses() and insert_pickups()
+        together, for large imports. Each table's rows are streamed with COPY
+        into a temporary staging table, then merged with one INSERT ... SELECT
+        per table. COPY sends rows in binary with no bind-parameter limit.
+        Pickups refer to their addresses by content hash (as in PickupBatch);
+        the merge resolves the hashes to address ids with a join. The new
+        pickups are added to the tenant's daily stats.
+        Call at most once per transaction: the staging tables are dropped
+        on commit.
+        """
+        if not pickups:
+            return
+        staged_addresses = await self._copy_to_staging(Address, addresses)
+        staged_pickups = await self._copy_to_staging(
+            PickupRequest, pickups, text_columns=("pickup_address_id", "delivery_address_id")
+        )
+        staged_packages = await self._copy_to_staging(PackageDetails, packages)
+        staged_payments = await self._copy_to_staging(PaymentDetails, payments)
+
+        await self.session.exec(  # type: ignore[call-overload]
+            pg_insert(Address)
+            .from_select(list(staged_addresses.c.keys()), sa_select(staged_addresses))
+            .on_conflict_do_nothing(index_elements=["tenant_id", "content_hash"])
+        )
+
+        pickup_address = aliased(Address)
+        delivery_address = aliased(Address)
+        pickup_columns = [
+            c for c in staged_pickups.c
+            if c.name not in ("pickup_address_id", "delivery_address_id")
+        ]
+        resolved_pickups = (
+            sa_select(*pickup_columns, pickup_address.id, delivery_address.id)
+            .join(
+                pickup_address,
+                (pickup_address.tenant_id == tenant_id)
+                & (pickup_address.content_hash == staged_pickups.c.pickup_address_id),
+            )
+            .join(
+                delivery_address,
+                (delivery_address.tenant_id == tenant_id)
+                & (delivery_address.content_hash == staged_pickups.c.delivery_address_id),
+            )
+        )
+        await self.session.exec(  # type: ignore[call-overload]
+            insert(PickupRequest).from_select(
+                [c.name for c in pickup_columns] + ["pickup_address_id", "delivery_address_id"],
+                resolved_pickups,
+            )
+        )
+        for model, staged in ((PackageDetails, staged_packages), (PaymentDetails, staged_payments)):
+            if staged is not None:
+                await self.session.exec(  # type: ignore[call-overload]
+                    insert(model).from_select(list(staged.c.keys()), sa_select(staged))
+                )
+        await self.session.exec(  # type: ignore[call-overload]
+            _add_to_daily_stats(
+                pickup_daily_stats_statement(
+                    PickupRequest.id.in_(sa_select(staged_pickups.c.id))  # type: ignore[attr-defined]
+                )
+            )
+        )
+
+    async def _copy_to_staging(
+        self,
+        model: type[SQLModel],
+        rows: list[dict[str, Any]],
+        text_columns: tuple[str, ...] = (),
+    ) -> TableClause | None:
+        """
+        Creates a temporary table shaped like the rows' columns of `model`
+        (with `text_columns` as text instead) and fills it with COPY.
+        Returns the staging table, or None if there are no rows.
+        """
+        if not rows:
+            return None
+        source = model.__table__  # type: ignore[attr-defined]
+        names = list(rows[0])
+        columns = [
+            cast(source.c[name], Text).label(name) if name in text_columns else source.c[name]
+            for name in names
+        ]
+        staging_name = f"import_{source.name}"
+
+        connection = await self.session.connection()
+        dialect = connection.dialect
+        shape = sa_select(*columns).compile(dialect=dialect)
+        await connection.exec_driver_sql(
+            f"CREATE TEMP TABLE {staging_name} ON COMMIT DROP AS {shape} WITH NO DATA"
+        )
+
+        processors = [
+            None if name in text_columns else source.c[name].type.bind_processor(dialect)
+            for name in names
+        ]
+        records = [
+            tuple(
+                processor(row[name]) if processor else row[name]
+                for name, processor in zip(names, processors)
+            )
+            for row in rows
+        ]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_name, records=records, columns=names
+        )
+        return table(staging_name, *(column(name) for name in names))
+
+    async def get_statuses(
+        self, *, tenant_id: uuid.UUID, pickup_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, tuple[PickupStatus, int]]:
+        """
+        Returns the current (status, version) of each of the tenant's pickups
+        that exists. Reads from the primary without locking any rows.
+        """
+        statement = select(
+            PickupRequest.id, PickupRequest.status, PickupRequest.version
+        ).where(
+            PickupRequest.tenant_id == tenant_id,
+            PickupRequest.id.in_(pickup_ids),  # type: ignore[attr-defined]
+        )
+        result = await self.session.exec(statement)
+        return {id_: (status, version) for id_, status, version in result.all()}
+
+    async def get_ids_by_tracking_ids(
+        self, tracking_ids: list[str]
+    ) -> list[tuple[str, uuid.UUID, uuid.UUID]]:
+        """
+        Returns (tracking_id, tenant_id, pickup_id) for every pickup with one
+        of the given tracking ids, across all tenants. Tracking ids aren't
+        unique, so one id may match several rows. Reads from the primary.
+        """
+        statement = select(
+            PickupRequest.tracking_id, PickupRequest.tenant_id, PickupRequest.id
+        ).where(PickupRequest.tracking_id.in_(tracking_ids))  # type: ignore[union-attr]
+        result = await self.session.exec(statement)
+        return list(result.all())  # type: ignore[arg-type]
+
+    async def apply_status_transitions(
+        self, *, tenant_id: uuid.UUID, rows: list[dict[str, Any]]
+    ) -> dict[uuid.UUID, int]:
+        """
+        Applies status transitions and appends their history rows, one
+        statement per batch:
+
+            WITH updated AS (
+                UPDATE pickups SET status = v.to_status, version = version + 1, ...
+                FROM (VALUES ...) AS v
+                WHERE pickups.id = v.pickup_id AND pickups.version = v.version
+                RETURNING ...
+            )
+            INSERT INTO pickup_status_history SELECT ... FROM updated
+
+        The same statement moves the updated pickups between the status rows
+        of their tenant's daily stats.
+
+        Each row carries pickup_id, history_id, from_status, to_status, the
+        version it was validated against, and reason. A pickup is only updated
+        if it still has that version, so concurrent writers never overwrite
+        each other and no row locks are held between reading and writing.
+        Rows must have unique pickup ids. Returns the new version of every
+        pickup that was updated; the others changed concurrently.
+        """
+        pickups = PickupRequest.__table__  # type: ignore[attr-defined]
+        history = PickupStatusHistory.__table__  # type: ignore[attr-defined]
+        new_versions: dict[uuid.UUID, int] = {}
+
+        if not rows:
+            return new_versions
+
+        # tenant_id, the version increment and the time zone are bound too.
+        step = _rows_per_statement(rows, reserved=3)
+        for start in range(0, len(rows), step):
+            batch = values(
+                column("pickup_id", Uuid),
+                column("history_id", Uuid),
+                column("from_status", pickups.c.status.type),
+                column("to_status", pickups.c.status.type),
+                column("version", Integer),
+                column("reason", String),
+                name="v",
+            ).data(
+                [
+                    (
+                        row["pickup_id"],
+                        row["history_id"],
+                        row["from_status"],
+                        row["to_status"],
+                        row["version"],
+                        row["reason"],
+                    )
+                    for row in rows[start : start + step]
+                ]
+            )
+            updated = (
+                update(pickups)
+                .where(
+                    pickups.c.id == batch.c.pickup_id,
+                    pickups.c.tenant_id == tenant_id,
+                    pickups.c.version == batch.c.version,
+                )
+                .values(
+                    status=batch.c.to_status,
+                    version=pickups.c.version + 1,
+                    # Server-side, so every row in the batch gets the same clock.
+                    updated_at=func.timezone("UTC", func.now()),
+                )
+                .returning(
+                    batch.c.history_id,
+                    pickups.c.id,
+                    pickups.c.tenant_id,
+                    batch.c.from_status,
+                    pickups.c.status,
+                    pickups.c.version,
+                    batch.c.reason,
+                    pickups.c.updated_at,
+                    pickups.c.created_at,
+                )
+                .cte("updated")
+            )
+            # Each updated pickup leaves its old status's daily stats (-1)
+            # and joins its new status's (+1).
+            moves = union_all(
+                sa_select(
+                    updated.c.id,
+                    updated.c.tenant_id,
+                    updated.c.created_at,
+                    updated.c.from_status.label("status"),
+                    literal(-1, Integer).label("sign"),
+                ),
+                sa_select(
+                    updated.c.id,
+                    updated.c.tenant_id,
+                    updated.c.created_at,
+                    updated.c.status,
+                    literal(1, Integer).label("sign"),
+                ),
+            ).subquery("moves")
+            stats = _add_to_daily_stats(
+                _daily_stats_select(
+                    moves,
+                    pickup_id=moves.c.id,
+                    tenant_id=moves.c.tenant_id,
+                    created_at=moves.c.created_at,
+                    status=moves.c.status,
+                    sign=moves.c.sign,
+                )
+            ).cte("stats")
+            statement = (
+                insert(history)
+                .from_select(
+                    [
+                        "id",
+                        "pickup_id",
+                        "tenant_id",
+                        "from_status",
+                        "to_status",
+                        "version",
+                        "reason",
+                        "changed_at",
+                    ],
+                    sa_select(
+                        updated.c.history_id,
+                        updated.c.id,
+                        updated.c.tenant_id,
+                        updated.c.from_status,
+                        updated.c.status,
+                        updated.c.version,
+                        updated.c.reason,
+                        updated.c.updated_at,
+                    ),
+                )
+                .returning(history.c.pickup_id, history.c.version)
+                .add_cte(stats)
+            )
+            result = await self.session.exec(statement)  # type: ignore[call-overload]
+            new_versions.update({pickup_id: version for pickup_id, version in result.all()})
+
+        return new_versions
@@ -1,6 +1,11 @@
 import uuid
+from typing import AsyncIterator
 
+from app.core.cache import invalidate_tenant
+from app.core.config import settings
 from app.models.tenants import Tenant, User
+from sqlalchemy import and_, inspect
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -9,43 +14,122 @@ class TenantRepository:
     """
     This class handles all database operations for Tenant and related models.
     It depends on an AsyncSession from the dependency injection system.
+    Writes always use `session` (the primary). Reads use `read_session`,
+    which may be bound to a read replica, unless `use_primary=True` is passed.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
         self.session = session
+        self.read_session = read_session or session
 
-    async def list_tenants(self) -> list[Tenant]:
+    def _reader(self, use_primary: bool = False) -> AsyncSession:
+        return self.session if use_primary else self.read_session
+
+    async def list_tenants(
+        self, *, limit: int, after_id: uuid.UUID | None = None
+    ) -> list[Tenant]:
         """
-        Retrieves all tenants from the database.
+        Retrieves up to `limit` tenants ordered by id, starting after `after_id`.
         """
-        statement = select(Tenant)
-        result = await self.session.exec(statement)
+        statement = select(Tenant).order_by(Tenant.id).limit(limit)  # type: ignore[arg-type]
+        if after_id is not None:
+            statement = statement.where(Tenant.id > after_id)
+        result = await self._reader().exec(statement)
         return list(result.all())
 
+    async def stream_tenants(
+        self, *, after_id: uuid.UUID | None = None
+    ) -> AsyncIterator[Tenant]:
+        """
+        Yields all tenants ordered by id through a server-side cursor,
+        fetching STREAM_BATCH_SIZE rows at a time.
+        """
+        statement = select(Tenant).order_by(Tenant.id)  # type: ignore[arg-type]
+        if after_id is not None:
+            statement = statement.where(Tenant.id > after_id)
+        async for tenant in self._stream(statement):
+            yield tenant
+
     async def get_tenant_by_id(self, tenant_id: uuid.UUID) -> Tenant | None:
         """
         Retrieves a single tenant by its ID.
         """
-        return await self.session.get(Tenant, tenant_id)
+        return await self._reader().get(Tenant, tenant_id)
 
     async def get_tenant_by_slug(self, slug: str) -> Tenant | None:
         """
         Retrieves a single tenant by its unique slug.
         """
         statement = select(Tenant).where(Tenant.slug == slug)
-        result = await self.session.exec(statement)
+        result = await self._reader().exec(statement)
         return result.first()
 
-    async def list_users_for_tenant(self, tenant_id: uuid.UUID) -> list[User]:
+    async def save_tenant(self, tenant: Tenant) -> Tenant:
+        """
+        Creates or updates a Tenant and invalidates its cached lookups.
+        Every tenant write must go through here so the tenant cache stays fresh.
+        """
+        # If the slug was renamed, the old slug must be dropped from the cache too.
+        slug_history = inspect(tenant).attrs.slug.history
+        stale_slugs = {tenant.slug, *(slug_history.deleted or ())}
+
+        self.session.add(tenant)
+        await self.session.commit()
+        await self.session.refresh(tenant)
+
+        for slug in stale_slugs:
+            invalidate_tenant(slug)
+        return tenant
+
+    async def list_users_for_tenant(
+        self, *, tenant_id: uuid.UUID, limit: int, after_id: uuid.UUID | None = None
+    ) -> list[User]:
         """
-        Retrieves all users for a specific tenant.
+        Retrieves up to `limit` users of a tenant ordered by id,
+        starting after `after_id`.
         """
-        statement = select(User).where(User.tenant_id == tenant_id)
-        result = await self.session.exec(statement)
+        statement = (
+            select(User)
+            .where(User.tenant_id == tenant_id)
+            .order_by(User.id)  # type: ignore[arg-type]
+            .limit(limit)
+        )
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        result = await self._reader().exec(statement)
         return list(result.all())
 
+    async def stream_users_for_tenant(
+        self, *, tenant_id: uuid.UUID, after_id: uuid.UUID | None = None
+    ) -> AsyncIterator[User]:
+        """
+        Yields all users of a tenant ordered by id through a server-side cursor.
+        """
+        statement = (
+            select(User).where(User.tenant_id == tenant_id).order_by(User.id)  # type: ignore[arg-type]
+        )
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        async for user in self._stream(statement):
+            yield user
+
+    async def _stream(self, statement) -> AsyncIterator:
+        """
+        Runs a SELECT on a server-side cursor and yields ORM objects in batches,
+        expunging each batch so the session's identity map stays small.
+        """
+        session = self._reader()
+        result = await session.stream_scalars(
+            statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+        )
+        async for batch in result.partitions():
+            for row in batch:
+                yield row
+            for row in batch:
+                session.expunge(row)
+
     async def get_user_by_supabase_id_and_tenant_id(
-        self, *, supabase_user_id: str, tenant_id: uuid.UUID
+        self, *, supabase_user_id: str, tenant_id: uuid.UUID, use_primary: bool = False
     ) -> User | None:
         """
         Retrieves a single user profile based on the supabase_user_id
@@ -55,14 +139,57 @@ class TenantRepository:
             User.supabase_user_id == supabase_user_id,
             User.tenant_id == tenant_id,
         )
-        result = await self.session.exec(statement)
+        result = await self._reader(use_primary).exec(statement)
         return result.first()
 
-    async def create_user(self, user: User) -> User:
+    async def get_tenant_and_user_by_slug(
+        self, *, slug: str, supabase_user_id: str
+    ) -> tuple[Tenant, User | None] | None:
+        """
+        Resolves a tenant by slug and the user's profile within it in a single
+        statement. Returns None if the tenant does not exist, and
+        (tenant, None) if the user has no profile in that tenant.
+        """
+        statement = (
+            select(Tenant, User)
+            .outerjoin(
+                User,
+                and_(
+                    User.tenant_id == Tenant.id,
+                    User.supabase_user_id == supabase_user_id,
+                ),
+            )
+            .where(Tenant.slug == slug)
+        )
+        result = await self._reader().exec(statement)
+        row = result.first()
+        if row is None:
+            return None
+        tenant, user = row
+        return tenant, user
+
+    async def upsert_user(self, user: User) -> User:
         """
-        Adds a new User object to the database.
+        Inserts a User, or returns the existing profile for the same
+        (supabase_user_id, tenant_id), in a single statement.
+        Concurrent calls for the same user are safe: the database resolves
+        the race on the unique_user_tenant constraint instead of raising.
         """
-        self.session.add(user)
+        insert_statement = insert(User).values(
+            id=user.id,
+            supabase_user_id=user.supabase_user_id,
+            email=user.email,
+            is_active=user.is_active,
+            role=user.role,
+            tenant_id=user.tenant_id,
+        )
+        statement = insert_statement.on_conflict_do_update(
+            constraint="unique_user_tenant",
+            # A no-op update, so RETURNING yields the existing row on conflict
+            # without changing the stored profile.
+            set_={"supabase_user_id": insert_statement.excluded.supabase_user_id},
+        ).returning(User)
+        result = await self.session.scalars(statement)
+        saved_user = result.one()
         await self.session.commit()
-        await self.session.refresh(user)
-        return user
+        return saved_user
@@ -0,0 +1,16 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    A page of results from a keyset-paginated list endpoint.
+    Pass `next_cursor` back as `cursor` to fetch the next page;
+    it is null on the last page.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,409 @@
+import uuid
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.models.pickups import (
+    DocumentType,
+    ImportJobStatus,
+    PaymentMode,
+    PickupStatus,
+    ServiceType,
+    ShipmentType,
+)
+from pydantic import model_validator
+from sqlmodel import Field, SQLModel
+
+# These are Pydantic models, not table models.
+# They define the shape of pickup data accepted and returned by the API.
+
+
+class AddressCreate(SQLModel):
+    name: str = Field(max_length=100)
+    phone: str = Field(max_length=20)
+    email: Optional[str] = Field(default=None, max_length=100)
+    company_name: Optional[str] = Field(default=None, max_length=100)
+
+    address_line1: str
+    address_line2: Optional[str] = None
+    landmark: Optional[str] = None
+    city: str = Field(max_length=50)
+    state: str = Field(max_length=50)
+    pincode: str = Field(min_length=6, max_length=10)
+    country: str = Field(default="IN", max_length=2)
+
+
+class PackageCreate(SQLModel):
+    length: float = Field(gt=0, description="CM")
+    breadth: float = Field(gt=0, description="CM")
+    height: float = Field(gt=0, description="CM")
+    weight: float = Field(gt=0, description="KG")
+
+    box_count: int = Field(default=1, ge=1)
+    description: Optional[str] = None
+    is_fragile: bool = False
+
+
+class PaymentCreate(SQLModel):
+    amount: float = Field(default=0.0, ge=0)
+    currency: str = Field(default="INR", max_length=3)
+    payment_mode: PaymentMode = PaymentMode.PREPAID
+
+    declared_value: float = Field(default=0.0, ge=0)
+    tax_amount: float = Field(default=0.0, ge=0)
+    hsn_code: Optional[str] = None
+
+    invoice_number: Optional[str] = None
+    invoice_date: Optional[date] = None
+    eway_bill_number: Optional[str] = None
+
+
+class PickupCreate(SQLModel):
+    order_reference_id: str = Field(max_length=100)
+    tracking_id: Optional[str] = None
+
+    shipment_type: ShipmentType = ShipmentType.FORWARD
+    service_type: ServiceType = ServiceType.SURFACE
+
+    product_category: Optional[str] = None
+    shipment_description: Optional[str] = None
+    reason_for_return: Optional[str] = None
+
+    requested_pickup_date: date
+
+    pickup_address: AddressCreate
+    delivery_address: AddressCreate
+    packages: List[PackageCreate] = Field(min_length=1)
+    payment: Optional[PaymentCreate] = None
+
+    @model_validator(mode="after")
+    def check_reason_for_return(self) -> "PickupCreate":
+        if self.shipment_type == ShipmentType.REVERSE and not self.reason_for_return:
+            raise ValueError("reason_for_return is required for REVERSE shipments")
+        return self
+
+
+class PickupFilters(SQLModel):
+    """
+    Query parameters for filtering the pickup list.
+    """
+
+    status: Optional[PickupStatus] = None
+    service_type: Optional[ServiceType] = None
+    shipment_type: Optional[ShipmentType] = None
+    requested_from: Optional[date] = Field(
+        default=None, description="Earliest requested pickup date (inclusive)."
+    )
+    requested_to: Optional[date] = Field(
+        default=None, description="Latest requested pickup date (inclusive)."
+    )
+
+
+class PickupBulkCreate(SQLModel):
+    # Items are validated one by one by the service (each must match
+    # PickupCreate), so one bad item doesn't reject the whole upload.
+    items: List[Dict[str, Any]] = Field(
+        min_length=1,
+        max_length=settings.PICKUP_BULK_MAX_ITEMS,
+        description="Pickups to create; each item must match PickupCreate.",
+    )
+
+
+class PickupBulkItemResult(SQLModel):
+    index: int
+    pickup_id: Optional[uuid.UUID] = None
+    errors: Optional[List[str]] = None
+
+
+class PickupBulkCreateResponse(SQLModel):
+    created: int
+    failed: int
+    results: List[PickupBulkItemResult]
+
+
+# Read models carry no input constraints, so rows stored before a
+# constraint was added can still be returned.
+
+
+class AddressRead(SQLModel):
+    id: uuid.UUID
+    name: str
+    phone: str
+    email: Optional[str] = None
+    company_name: Optional[str] = None
+    address_line1: str
+    address_line2: Optional[str] = None
+    landmark: Optional[str] = None
+    city: str
+    state: str
+    pincode: str
+    country: str
+
+
+class PackageRead(SQLModel):
+    id: uuid.UUID
+    length: float
+    breadth: float
+    height: float
+    weight: float
+    box_count: int
+    description: Optional[str] = None
+    is_fragile: bool
+
+
+class PaymentRead(SQLModel):
+    id: uuid.UUID
+    amount: float
+    currency: str
+    payment_mode: PaymentMode
+    declared_value: float
+    tax_amount: float
+    hsn_code: Optional[str] = None
+    invoice_number: Optional[str] = None
+    invoice_date: Optional[date] = None
+    eway_bill_number: Optional[str] = None
+
+
+class PickupDocumentRead(SQLModel):
+    id: uuid.UUID
+    document_type: DocumentType
+    file_url: str
+    file_name: str
+    uploaded_at: datetime
+
+
+class PickupDocumentUploadResponse(SQLModel):
+    document: PickupDocumentRead
+    # SHA-256 of the file's bytes
+    content_hash: str
+    size_bytes: int
+    # True if the tenant already had a file with this content, which is reused.
+    deduplicated: bool
+
+
+class PickupRead(SQLModel):
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    created_by_user_id: uuid.UUID
+    order_reference_id: str
+    tracking_id: Optional[str] = None
+
+    shipment_type: ShipmentType
+    service_type: ServiceType
+    status: PickupStatus
+
+    product_category: Optional[str] = None
+    shipment_description: Optional[str] = None
+    reason_for_return: Optional[str] = None
+
+    requested_pickup_date: date
+
+    pickup_address: AddressRead
+    delivery_address: AddressRead
+    packages: List[PackageRead]
+    documents: List[PickupDocumentRead]
+    payment_details: Optional[PaymentRead] = None
+
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class PickupExportRow(SQLModel):
+    """
+    One pickup in an export, flattened to a single row: both addresses,
+    package totals and payment. Matches the columns of the CSV export.
+    """
+
+    pickup_id: uuid.UUID
+    order_reference_id: str
+    tracking_id: Optional[str] = None
+    status: PickupStatus
+    shipment_type: ShipmentType
+    service_type: ServiceType
+    requested_pickup_date: date
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    pickup_name: str
+    pickup_phone: str
+    pickup_address_line1: str
+    pickup_address_line2: Optional[str] = None
+    pickup_city: str
+    pickup_state: str
+    pickup_pincode: str
+
+    delivery_name: str
+    delivery_phone: str
+    delivery_address_line1: str
+    delivery_address_line2: Optional[str] = None
+    delivery_city: str
+    delivery_state: str
+    delivery_pincode: str
+
+    package_count: int
+    box_count: int
+    total_weight_kg: float
+
+    payment_mode: Optional[PaymentMode] = None
+    amount: Optional[float] = None
+    currency: Optional[str] = None
+    declared_value: Optional[float] = None
+    invoice_number: Optional[str] = None
+    eway_bill_number: Optional[str] = None
+
+
+class PickupImportRowError(SQLModel):
+    # 1-based row number in the manifest, not counting the header.
+    row: int
+    errors: List[str]
+
+
+class PickupImportJobRead(SQLModel):
+    id: uuid.UUID
+    status: ImportJobStatus
+    file_name: Optional[str] = None
+    rows_processed: int
+    created_count: int
+    failed_count: int
+    # The first PICKUP_IMPORT_MAX_ERRORS failed rows.
+    errors: List[PickupImportRowError]
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class PickupStatsTotals(SQLModel):
+    pickup_count: int = 0
+    # Sum of payment amounts of COD pickups
+    cod_amount: float = 0.0
+    total_weight_kg: float = 0.0
+    total_volume_cm3: float = 0.0
+
+
+class PickupDailyStats(PickupStatsTotals):
+    day: date
+    by_status: Dict[PickupStatus, PickupStatsTotals]
+
+
+class PickupStatsResponse(SQLModel):
+    date_from: date
+    date_to: date
+    totals: PickupStatsTotals
+    by_status: Dict[PickupStatus, PickupStatsTotals]
+    # Only days with pickups are listed, oldest first.
+    days: List[PickupDailyStats]
+
+
+class PickupTransition(SQLModel):
+    pickup_id: uuid.UUID
+    status: PickupStatus
+    # If given, the transition only applies to this version of the pickup.
+    expected_version: Optional[int] = Field(default=None, ge=1)
+    reason: Optional[str] = Field(default=None, max_length=255)
+
+
+class PickupTransitionBatch(SQLModel):
+    # Items for the same pickup are applied in order, so a batch can carry
+    # several consecutive events for one pickup.
+    items: List[PickupTransition] = Field(
+        min_length=1, max_length=settings.PICKUP_TRANSITION_MAX_ITEMS
+    )
+
+
+class TransitionOutcome(str, Enum):
+    APPLIED = "APPLIED"
+    UNCHANGED = "UNCHANGED"  # Already in the requested status
+    NOT_FOUND = "NOT_FOUND"
+    INVALID_TRANSITION = "INVALID_TRANSITION"
+    CONFLICT = "CONFLICT"  # The pickup changed since it was read
+
+
+class PickupTransitionResult(SQLModel):
+    index: int
+    pickup_id: uuid.UUID
+    outcome: TransitionOutcome
+    status: Optional[PickupStatus] = None
+    version: Optional[int] = None
+
+
+class PickupTransitionBatchResponse(SQLModel):
+    applied: int
+    failed: int
+    results: List[PickupTransitionResult]
+
+
+class RiderShift(SQLModel):
+    rider_code: str = Field(min_length=1, max_length=50)
+    # The rider only collects pickups whose pickup address is in this city.
+    city: str = Field(min_length=1, max_length=50)
+    max_weight_kg: float = Field(gt=0)
+    max_boxes: int = Field(gt=0)
+    shift_start: time
+    shift_end: time
+
+    @model_validator(mode="after")
+    def check_shift(self) -> "RiderShift":
+        if self.shift_end <= self.shift_start:
+            raise ValueError("shift_end must be after shift_start")
+        return self
+
+
+class PickupAssignmentRequest(SQLModel):
+    # OPEN pickups requested for this day or earlier are assigned.
+    pickup_date: date
+    riders: List[RiderShift] = Field(
+        min_length=1, max_length=settings.PICKUP_ASSIGNMENT_MAX_RIDERS
+    )
+    # Plan the routes without assigning any pickup.
+    dry_run: bool = False
+
+    @model_validator(mode="after")
+    def check_rider_codes(self) -> "PickupAssignmentRequest":
+        codes = [rider.rider_code for rider in self.riders]
+        if len(set(codes)) != len(codes):
+            raise ValueError("rider_code must be unique")
+        return self
+
+
+class UnassignedReason(str, Enum):
+    NO_RIDER_IN_CITY = "NO_RIDER_IN_CITY"
+    EXCEEDS_RIDER_CAPACITY = "EXCEEDS_RIDER_CAPACITY"  # Too big for any rider in its city
+    OUT_OF_CAPACITY = "OUT_OF_CAPACITY"  # The city's riders are full
+    CONFLICT = "CONFLICT"  # The pickup changed while the run was writing
+
+
+class PickupAssignmentRead(SQLModel):
+    pickup_id: uuid.UUID
+    rider_code: str
+    sequence: int
+    window_start: time
+    window_end: time
+
+
+class PickupUnassigned(SQLModel):
+    pickup_id: uuid.UUID
+    reason: UnassignedReason
+
+
+class RiderRoute(SQLModel):
+    rider_code: str
+    pickups: int
+    stops: int
+    weight_kg: float
+    boxes: int
+    # When the rider finishes the last pickup; None if the rider has none.
+    finishes_at: Optional[time] = None
+
+
+class PickupAssignmentResponse(SQLModel):
+    pickup_date: date
+    dry_run: bool
+    assigned: int
+    unassigned: int
+    riders: List[RiderRoute]
+    assignments: List[PickupAssignmentRead]
+    unassigned_pickups: List[PickupUnassigned]
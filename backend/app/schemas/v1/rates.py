@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.pickups import ServiceType, Zone
+from app.schemas.v1.pickups import PackageCreate
+from sqlmodel import Field, SQLModel
+
+# These are Pydantic models, not table models.
+# They define the shape of rate quote requests and responses.
+
+PINCODE_PATTERN = r"^[1-9][0-9]{5}$"
+
+
+class RateQuoteItem(SQLModel):
+    # Echoed back, e.g. an order reference.
+    reference: Optional[str] = Field(default=None, max_length=100)
+    service_type: ServiceType = ServiceType.SURFACE
+    pickup_pincode: str = Field(regex=PINCODE_PATTERN)
+    delivery_pincode: str = Field(regex=PINCODE_PATTERN)
+    packages: List[PackageCreate] = Field(min_length=1)
+
+
+class RateQuoteRequest(SQLModel):
+    items: List[RateQuoteItem] = Field(min_length=1, max_length=settings.RATE_QUOTE_MAX_ITEMS)
+
+
+class RateQuote(SQLModel):
+    index: int
+    reference: Optional[str] = None
+    zone: Zone
+    dead_weight_kg: float
+    volumetric_weight_kg: float
+    # The larger of the two, rounded up to the rate card's weight slab.
+    chargeable_weight_kg: float
+    amount: float
+    currency: str = "INR"
+
+
+class RateQuoteResponse(SQLModel):
+    quotes: List[RateQuote]
@@ -0,0 +1,57 @@
+from enum import Enum
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.pickups import ServiceType, Zone
+from app.schemas.v1.rates import PINCODE_PATTERN
+from sqlmodel import Field, SQLModel
+
+# These are Pydantic models, not table models.
+# They define the shape of serviceability requests and responses.
+
+
+class ServiceabilityIssue(str, Enum):
+    ORIGIN_NOT_SERVICEABLE = "ORIGIN_NOT_SERVICEABLE"
+    DESTINATION_NOT_SERVICEABLE = "DESTINATION_NOT_SERVICEABLE"
+    EXPRESS_NOT_AVAILABLE = "EXPRESS_NOT_AVAILABLE"
+    COD_NOT_AVAILABLE = "COD_NOT_AVAILABLE"
+
+
+class PincodeServiceability(SQLModel):
+    pincode: str
+    serviceable: bool
+    hub: Optional[str] = None
+    region: Optional[str] = None
+    cod_available: bool = False
+    express_available: bool = False
+
+
+class RouteServiceabilityQuery(SQLModel):
+    origin_pincode: str = Field(regex=PINCODE_PATTERN)
+    destination_pincode: str = Field(regex=PINCODE_PATTERN)
+    service_type: ServiceType = ServiceType.SURFACE
+    # Whether the shipment is cash on delivery.
+    cod: bool = False
+
+
+class RouteServiceabilityRequest(SQLModel):
+    items: List[RouteServiceabilityQuery] = Field(
+        min_length=1, max_length=settings.SERVICEABILITY_MAX_ITEMS
+    )
+
+
+class RouteServiceability(SQLModel):
+    index: int
+    origin_pincode: str
+    destination_pincode: str
+    service_type: ServiceType
+    serviceable: bool
+    # Set when the route is serviceable.
+    zone: Optional[Zone] = None
+    sla_days: Optional[int] = None
+    # Set when it isn't.
+    issue: Optional[ServiceabilityIssue] = None
+
+
+class RouteServiceabilityResponse(SQLModel):
+    results: List[RouteServiceability]
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.pickups import PickupStatus
+from pydantic import field_validator
+from sqlmodel import Field, SQLModel
+
+# These are Pydantic models, not table models.
+# They define the shape of courier webhook payloads.
+
+
+class CourierEventIn(SQLModel):
+    tracking_id: str = Field(min_length=1, max_length=100)
+    status: PickupStatus
+    occurred_at: datetime
+    reason: Optional[str] = Field(default=None, max_length=255)
+
+    @field_validator("occurred_at")
+    @classmethod
+    def as_naive_utc(cls, value: datetime) -> datetime:
+        # Timestamps are stored as naive UTC; naive input is taken to be UTC.
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class CourierWebhookPayload(SQLModel):
+    events: List[CourierEventIn] = Field(
+        min_length=1, max_length=settings.COURIER_WEBHOOK_MAX_EVENTS
+    )
+
+
+class CourierWebhookAccepted(SQLModel):
+    accepted: int
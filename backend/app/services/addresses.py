@@ -0,0 +1,40 @@
+import hashlib
+import re
+from typing import Optional
+
+from app.schemas.v1.pickups import AddressCreate
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D")
+
+# The fields that make two addresses "the same", in hashing order.
+_TEXT_FIELDS = (
+    "name",
+    "email",
+    "company_name",
+    "address_line1",
+    "address_line2",
+    "landmark",
+    "city",
+    "state",
+)
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return _WHITESPACE.sub(" ", value).strip().casefold()
+
+
+def address_content_hash(address: AddressCreate) -> str:
+    """
+    Returns a SHA-256 hex digest of the address's normalized content.
+    Case, repeated whitespace and phone formatting are ignored, so the same
+    warehouse typed slightly differently still maps to one address row.
+    """
+    parts = [_normalize_text(getattr(address, field)) for field in _TEXT_FIELDS]
+    parts.append(_NON_DIGITS.sub("", address.phone))
+    parts.append(address.pincode.strip())
+    parts.append(address.country.strip().upper())
+    # The unit separator can't appear in normalized text, so fields can't run together.
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
@@ -0,0 +1,348 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.metrics import Counter, Gauge, Histogram, registry
+from app.exceptions.definitions import CourierQueueFullException
+from app.models.pickups import CourierEvent, PickupStatus
+from app.repositories.courier_events import CourierEventRepository
+from app.repositories.pickups import PickupRepository
+from app.schemas.v1.pickups import PickupTransition
+from app.schemas.v1.webhooks import CourierEventIn
+from app.services.pickups import PickupService
+
+logger = logging.getLogger(__name__)
+
+# How long shutdown waits for queued events to be applied.
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = 10.0
+
+# Buckets (seconds) for the time from enqueue to being applied.
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+@dataclass
+class QueuedEvent:
+    """
+    A validated courier event waiting in the queue.
+    `enqueued_at` is a time.monotonic() value used for the lag metric.
+    """
+
+    id: uuid.UUID
+    courier: str
+    tracking_id: str
+    status: PickupStatus
+    occurred_at: datetime
+    reason: Optional[str]
+    enqueued_at: float
+
+
+def coalesce_events(events: list[QueuedEvent]) -> dict[str, list[QueuedEvent]]:
+    """
+    Groups events by tracking id into the status changes to apply, in the
+    order they happened. Repeated deliveries of the same status collapse
+    into one, so a burst for one shipment costs as few writes as possible.
+    """
+    by_tracking_id: dict[str, list[QueuedEvent]] = defaultdict(list)
+    for event in events:
+        by_tracking_id[event.tracking_id].append(event)
+
+    coalesced: dict[str, list[QueuedEvent]] = {}
+    for tracking_id, group in by_tracking_id.items():
+        group.sort(key=lambda e: e.occurred_at)
+        changes = [group[0]]
+        for event in group[1:]:
+            if event.status != changes[-1].status:
+                changes.append(event)
+        coalesced[tracking_id] = changes
+    return coalesced
+
+
+class CourierEventQueue:
+    """
+    A bounded in-process queue of courier events and the background worker
+    that applies them as batched pickup status transitions.
+
+    Webhooks only validate and enqueue, so they never wait on the database
+    (unless the queue is durable, when events are also inserted into the
+    courier_events table). When the queue is full, webhooks get a 429.
+    The worker flushes a batch once it holds COURIER_QUEUE_BATCH_SIZE events
+    or the oldest has waited COURIER_QUEUE_FLUSH_INTERVAL_SECONDS.
+
+    Durable mode is at-least-once: events are deleted only after they are
+    applied, and replayed on startup. Replays are harmless because a pickup
+    already in the event's status is left unchanged. Each process replays
+    every stored event, so run the worker in one process per database.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        retry_after: int,
+        durable: bool,
+    ):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_after = retry_after
+        self.durable = durable
+        self._queue: asyncio.Queue[QueuedEvent] = asyncio.Queue()
+        # Slots claimed by webhooks that are still writing to the durable table.
+        self._reserved = 0
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def enqueue(self, courier: str, events: list[CourierEventIn]) -> None:
+        """
+        Adds a webhook's events to the queue, all or none.
+        Raises CourierQueueFullException if they don't fit.
+        """
+        if self.depth + self._reserved + len(events) > self.max_size:
+            courier_events_received_total.inc(("rejected",), len(events))
+            raise CourierQueueFullException(retry_after=self.retry_after)
+
+        now = time.monotonic()
+        queued = [
+            QueuedEvent(
+                id=uuid.uuid4(),
+                courier=courier,
+                tracking_id=event.tracking_id,
+                status=event.status,
+                occurred_at=event.occurred_at,
+                reason=event.reason,
+                enqueued_at=now,
+            )
+            for event in events
+        ]
+        if self.durable:
+            self._reserved += len(queued)
+            try:
+                async with AsyncSessionLocal() as session:  # type: ignore
+                    await CourierEventRepository(session).insert_events(
+                        [_event_row(event) for event in queued]
+                    )
+            finally:
+                self._reserved -= len(queued)
+
+        for event in queued:
+            self._queue.put_nowait(event)
+        courier_events_received_total.inc(("accepted",), len(queued))
+
+    def start(self) -> None:
+        """
+        Starts the worker, and replays stored events if the queue is durable.
+        """
+        self._tasks.append(asyncio.create_task(self._run()))
+        if self.durable:
+            self._tasks.append(asyncio.create_task(self._replay(datetime.utcnow())))
+
+    async def stop(self) -> None:
+        """
+        Waits (up to SHUTDOWN_DRAIN_TIMEOUT_SECONDS) for queued events to be
+        applied, then stops the worker.
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping with %d courier events still queued", self.depth
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            except Exception:
+                # Durable events stay in the table and are replayed on restart.
+                logger.exception("Failed to apply %d courier events", len(batch))
+                courier_events_applied_total.inc(("ERROR",), len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[QueuedEvent]) -> None:
+        """
+        Applies one batch: coalesces it, resolves tracking ids to pickups,
+        and runs one batched transition per tenant.
+        """
+        changes = coalesce_events(batch)
+        async with AsyncSessionLocal() as session:  # type: ignore
+            pickup_repo = PickupRepository(session)
+            pickups = await pickup_repo.get_ids_by_tracking_ids(list(changes))
+
+            # Tenants set tracking ids themselves and webhooks don't say which
+            # tenant an event is for, so an id shared by several pickups
+            # can't be resolved safely; its events are skipped.
+            matches: dict[str, int] = defaultdict(int)
+            for tracking_id, _, _ in pickups:
+                matches[tracking_id] += 1
+            ambiguous = {tracking_id for tracking_id, count in matches.items() if count > 1}
+            if ambiguous:
+                logger.warning(
+                    "Skipping courier events for %d tracking ids shared by "
+                    "several pickups: %s",
+                    len(ambiguous),
+                    ", ".join(sorted(ambiguous)[:20]),
+                )
+                courier_events_applied_total.inc(("AMBIGUOUS_TRACKING_ID",), len(ambiguous))
+
+            transitions: dict[uuid.UUID, list[PickupTransition]] = defaultdict(list)
+            for tracking_id, tenant_id, pickup_id in pickups:
+                if tracking_id in ambiguous:
+                    continue
+                transitions[tenant_id].extend(
+                    PickupTransition(
+                        pickup_id=pickup_id,
+                        status=event.status,
+                        reason=_history_reason(event),
+                    )
+                    for event in changes[tracking_id]
+                )
+            unknown = changes.keys() - {tracking_id for tracking_id, _, _ in pickups}
+            if unknown:
+                courier_events_applied_total.inc(("UNKNOWN_TRACKING_ID",), len(unknown))
+
+            pickup_service = PickupService(pickup_repo)
+            for tenant_id, items in transitions.items():
+                response = await pickup_service.transition_pickups(
+                    items=items, tenant_id=tenant_id
+                )
+                for result in response.results:
+                    courier_events_applied_total.inc((result.outcome.value,))
+
+            if self.durable:
+                await CourierEventRepository(session).delete_events(
+                    [event.id for event in batch]
+                )
+
+        now = time.monotonic()
+        for event in batch:
+            courier_events_lag_seconds.observe((), now - event.enqueued_at)
+
+    async def _replay(self, received_before: datetime) -> None:
+        """
+        Re-queues events stored before this process started, a batch at a
+        time, waiting for room in the queue as the worker drains it.
+        """
+        after = None
+        replayed = 0
+        while True:
+            async with AsyncSessionLocal() as session:  # type: ignore
+                rows = await CourierEventRepository(session).list_pending_events(
+                    received_before=received_before, limit=self.batch_size, after=after
+                )
+            if not rows:
+                break
+            for row in rows:
+                while self.depth + self._reserved >= self.max_size:
+                    await asyncio.sleep(self.flush_interval)
+                self._queue.put_nowait(_queued_event(row))
+            replayed += len(rows)
+            after = (rows[-1].received_at, rows[-1].id)
+        if replayed:
+            logger.info("Replayed %d stored courier events", replayed)
+
+
+def _event_row(event: QueuedEvent) -> dict:
+    return {
+        "id": event.id,
+        "courier": event.courier,
+        "tracking_id": event.tracking_id,
+        "status": event.status,
+        "occurred_at": event.occurred_at,
+        "reason": event.reason,
+        "received_at": datetime.utcnow(),
+    }
+
+
+def _queued_event(row: CourierEvent) -> QueuedEvent:
+    return QueuedEvent(
+        id=row.id,
+        courier=row.courier,
+        tracking_id=row.tracking_id,
+        status=row.status,
+        occurred_at=row.occurred_at,
+        reason=row.reason,
+        enqueued_at=time.monotonic(),
+    )
+
+
+def _history_reason(event: QueuedEvent) -> str:
+    reason = f"{event.courier} webhook"
+    if event.reason:
+        reason = f"{reason}: {event.reason}"
+    return reason[:255]
+
+
+courier_event_queue = CourierEventQueue(
+    max_size=settings.COURIER_QUEUE_MAX_SIZE,
+    batch_size=settings.COURIER_QUEUE_BATCH_SIZE,
+    flush_interval=settings.COURIER_QUEUE_FLUSH_INTERVAL_SECONDS,
+    retry_after=settings.COURIER_QUEUE_RETRY_AFTER_SECONDS,
+    durable=settings.COURIER_QUEUE_DURABLE,
+)
+
+
+# --- Metrics ---
+
+courier_events_received_total = registry.register(
+    Counter(
+        "courier_events_received_total",
+        "Courier webhook events accepted into or rejected by the queue.",
+        ("result",),
+    )
+)
+courier_events_applied_total = registry.register(
+    Counter(
+        "courier_events_applied_total",
+        "Coalesced courier events applied by the worker, by transition outcome.",
+        ("outcome",),
+    )
+)
+courier_events_lag_seconds = registry.register(
+    Histogram(
+        "courier_events_lag_seconds",
+        "Time from a courier event being queued to its batch being applied.",
+        buckets=LAG_BUCKETS,
+    )
+)
+registry.register(
+    Gauge(
+        "courier_events_queue_depth",
+        "Courier events waiting in the queue.",
+        collect=lambda: [((), courier_event_queue.depth)],
+    )
+)
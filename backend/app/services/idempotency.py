@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+from app.core.cache import MISSING, TTLCache, idempotency_cache
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.metrics import Counter, registry
+from app.exceptions.definitions import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
+from app.models.idempotency import IdempotencyKey
+from app.repositories.idempotency import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+# Expired keys deleted per statement by the purge worker.
+PURGE_BATCH_SIZE = 1000
+
+# Retry-After (seconds) sent when a duplicate gives up waiting. The retry
+# waits again, so it can come back right away.
+IN_PROGRESS_RETRY_AFTER_SECONDS = 1
+
+
+@dataclass(frozen=True)
+class IdempotentRequest:
+    """
+    A write request sent with an Idempotency-Key. `scope` identifies the
+    caller and `request_hash` the method, path, query string and body.
+    """
+
+    scope: str
+    key: str
+    method: str
+    path: str
+    request_hash: str
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    The response of the first request with a key, replayed to its retries.
+    """
+
+    request_hash: str
+    status: int
+    headers: list[list[str]]
+    body: bytes
+    expires_at: datetime
+
+
+@dataclass(frozen=True)
+class Claim:
+    """
+    A key this process holds: its request must run, then be completed or
+    released. `claimed_at` tells this claim apart from later ones.
+    """
+
+    request: IdempotentRequest
+    claimed_at: datetime
+
+
+class IdempotencyStore:
+    """
+    Runs each idempotency key once and keeps its response for replays.
+
+    A request claims its key with an upsert into idempotency_keys before it
+    runs. Duplicates in this process wait on the claimant's asyncio.Event;
+    duplicates in other processes poll the row. Either way they replay the
+    stored response once it's there, or claim the key themselves if it was
+    released (the request failed) or its lock expired (its process died).
+    Stored responses with bodies up to `cache_max_body_bytes` are also kept
+    in idempotency_cache, so most replays don't touch Postgres either.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        lock_timeout: float,
+        wait_timeout: float,
+        poll_interval: float,
+        purge_interval: float,
+        cache: TTLCache,
+        cache_max_body_bytes: int,
+    ):
+        self.ttl = timedelta(seconds=ttl)
+        self.lock_timeout = timedelta(seconds=lock_timeout)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self.cache = cache
+        self.cache_max_body_bytes = cache_max_body_bytes
+        # Keys claimed or being waited on by this process, by (scope, key).
+        self._in_flight: dict[tuple[str, str], asyncio.Event] = {}
+        self._purger: Optional[asyncio.Task] = None
+
+    async def begin(self, request: IdempotentRequest) -> Claim | StoredResponse:
+        """
+        Claims the request's key, or returns the stored response to replay,
+        waiting while another request with the key runs.
+        Raises IdempotencyKeyReusedException if the key was used for a
+        different request, and IdempotencyKeyInProgressException if the
+        other request is still running after IDEMPOTENCY_WAIT_TIMEOUT_SECONDS.
+        """
+        cache_key = (request.scope, request.key)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            stored = self.cache.get(cache_key)
+            if stored is not MISSING:
+                return self._replay(stored, request)
+
+            event = self._in_flight.get(cache_key)
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    raise self._in_progress()
+                continue
+
+            self._in_flight[cache_key] = asyncio.Event()
+            try:
+                outcome = await self._claim(request, deadline)
+            except BaseException:
+                self._finish(cache_key)
+                raise
+            if isinstance(outcome, StoredResponse):
+                self._finish(cache_key)
+                return self._replay(outcome, request)
+            idempotent_requests_total.inc(("executed",))
+            return outcome
+
+    async def complete(
+        self, claim: Claim, *, status: int, headers: list[list[str]], body: bytes
+    ) -> None:
+        """
+        Stores the response of a claimed key and wakes its duplicates.
+        """
+        request = claim.request
+        try:
+            async with self._repository() as repo:
+                await repo.complete(
+                    scope=request.scope,
+                    key=request.key,
+                    claimed_at=claim.claimed_at,
+                    status=status,
+                    headers=headers,
+                    body=body,
+                )
+            self._cache(
+                StoredResponse(
+                    request_hash=request.request_hash,
+                    status=status,
+                    headers=headers,
+                    body=body,
+                    expires_at=claim.claimed_at + self.ttl,
+                ),
+                request,
+            )
+        except Exception:
+            # The key stays in flight until its lock expires, then runs again.
+            logger.exception("Failed to store the response for an idempotency key")
+        finally:
+            self._finish((request.scope, request.key))
+
+    async def release(self, claim: Claim) -> None:
+        """
+        Gives up a claimed key without a response, so the next duplicate runs.
+        """
+        request = claim.request
+        try:
+            async with self._repository() as repo:
+                await repo.release(
+                    scope=request.scope, key=request.key, claimed_at=claim.claimed_at
+                )
+        except Exception:
+            logger.exception("Failed to release an idempotency key")
+        finally:
+            self._finish((request.scope, request.key))
+
+    def start(self) -> None:
+        self._purger = asyncio.create_task(self._purge())
+
+    async def stop(self) -> None:
+        if self._purger is not None:
+            self._purger.cancel()
+            await asyncio.gather(self._purger, return_exceptions=True)
+            self._purger = None
+
+    @asynccontextmanager
+    async def _repository(self) -> AsyncIterator[IdempotencyRepository]:
+        async with AsyncSessionLocal() as session:  # type: ignore
+            yield IdempotencyRepository(session)
+
+    async def _claim(
+        self, request: IdempotentRequest, deadline: float
+    ) -> Claim | StoredResponse:
+        """
+        Claims the key in Postgres, polling while another process holds it.
+        """
+        while True:
+            now = datetime.utcnow()
+            async with self._repository() as repo:
+                claimed = await repo.claim(
+                    scope=request.scope,
+                    key=request.key,
+                    method=request.method,
+                    path=request.path,
+                    request_hash=request.request_hash,
+                    now=now,
+                    locked_until=now + self.lock_timeout,
+                    expires_at=now + self.ttl,
+                )
+                record = None if claimed else await repo.get(scope=request.scope, key=request.key)
+            if claimed:
+                return Claim(request=request, claimed_at=now)
+
+            # A missing record was released just now; claim it on the next try.
+            if record is not None:
+                if record.request_hash != request.request_hash:
+                    idempotent_requests_total.inc(("reused",))
+                    raise IdempotencyKeyReusedException()
+                if record.response_status is not None:
+                    stored = _stored_response(record)
+                    self._cache(stored, request)
+                    return stored
+
+            if time.monotonic() >= deadline:
+                raise self._in_progress()
+            await asyncio.sleep(self.poll_interval)
+
+    def _replay(self, stored: StoredResponse, request: IdempotentRequest) -> StoredResponse:
+        if stored.request_hash != request.request_hash:
+            idempotent_requests_total.inc(("reused",))
+            raise IdempotencyKeyReusedException()
+        idempotent_requests_total.inc(("replayed",))
+        return stored
+
+    def _in_progress(self) -> IdempotencyKeyInProgressException:
+        idempotent_requests_total.inc(("in_progress",))
+        return IdempotencyKeyInProgressException(retry_after=IN_PROGRESS_RETRY_AFTER_SECONDS)
+
+    def _cache(self, stored: StoredResponse, request: IdempotentRequest) -> None:
+        if len(stored.body) > self.cache_max_body_bytes:
+            return
+        ttl = (stored.expires_at - datetime.utcnow()).total_seconds()
+        self.cache.set((request.scope, request.key), stored, ttl=ttl)
+
+    def _finish(self, cache_key: tuple[str, str]) -> None:
+        event = self._in_flight.pop(cache_key, None)
+        if event is not None:
+            event.set()
+
+    async def _purge(self) -> None:
+        while True:
+            try:
+                deleted = PURGE_BATCH_SIZE
+                while deleted == PURGE_BATCH_SIZE:
+                    async with self._repository() as repo:
+                        deleted = await repo.purge_expired(
+                            now=datetime.utcnow(), limit=PURGE_BATCH_SIZE
+                        )
+            except Exception:
+                logger.exception("Failed to purge expired idempotency keys")
+            await asyncio.sleep(self.purge_interval)
+
+
+def _stored_response(record: IdempotencyKey) -> StoredResponse:
+    return StoredResponse(
+        request_hash=record.request_hash,
+        status=record.response_status,  # type: ignore[arg-type]
+        headers=record.response_headers or [],
+        body=record.response_body or b"",
+        expires_at=record.expires_at,
+    )
+
+
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    lock_timeout=settings.IDEMPOTENCY_LOCK_SECONDS,
+    wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT_SECONDS,
+    poll_interval=settings.IDEMPOTENCY_POLL_INTERVAL_SECONDS,
+    purge_interval=settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+    cache=idempotency_cache,
+    cache_max_body_bytes=settings.IDEMPOTENCY_CACHE_MAX_BODY_BYTES,
+)
+
+
+# --- Metrics ---
+
+idempotent_requests_total = registry.register(
+    Counter(
+        "idempotent_requests_total",
+        "Write requests sent with an Idempotency-Key, by outcome "
+        "(executed, replayed, reused, in_progress).",
+        ("outcome",),
+    )
+)
@@ -0,0 +1,439 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Sequence
+
+import numpy as np
+from app.core.config import settings
+from app.core.db import get_session
+from app.models.pickups import PickupStatus
+from app.repositories.pickup_assignments import PickupAssignmentRepository
+from app.repositories.pickups import PickupRepository
+from app.schemas.v1.pickups import (
+    PickupAssignmentRead,
+    PickupAssignmentResponse,
+    PickupTransition,
+    PickupUnassigned,
+    RiderRoute,
+    RiderShift,
+    TransitionOutcome,
+    UnassignedReason,
+)
+from app.services.pickups import PickupService
+from fastapi import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+REASONS = list(UnassignedReason)
+_REASON_CODES = {reason: code for code, reason in enumerate(REASONS)}
+
+# Marks pickups without a rider (and assigned pickups without a reason).
+NONE = -1
+# Slack for float sums compared against capacities.
+_EPSILON = 1e-9
+
+
+@dataclass
+class AssignmentBatch:
+    """
+    Pickups to assign as column arrays, one entry per pickup. Cities,
+    pincodes and addresses are integer codes; pincode codes must sort like
+    the pincodes, so neighbouring pincodes end up on the same route.
+    """
+
+    city: np.ndarray
+    pincode: np.ndarray
+    address: np.ndarray
+    requested_day: np.ndarray  # date ordinals
+    weight_kg: np.ndarray
+    boxes: np.ndarray
+
+
+@dataclass
+class Rider:
+    city: int  # code as in AssignmentBatch.city
+    max_weight_kg: float
+    max_boxes: int
+    shift_minutes: float
+
+
+@dataclass
+class RouteTimes:
+    """
+    Minutes spent travelling to each new pincode, stopping at each new
+    address, and handling each pickup.
+    """
+
+    travel: float
+    stop: float
+    handling: float
+
+
+@dataclass
+class AssignmentPlan:
+    """
+    The result of plan_assignments, one entry per pickup of the batch.
+    """
+
+    rider: np.ndarray  # index into the riders, NONE if unassigned
+    sequence: np.ndarray  # 1-based position in the rider's route
+    arrival_minutes: np.ndarray  # when the rider gets there, after the shift start
+    reason: np.ndarray  # codes into REASONS, NONE if assigned
+
+
+def plan_assignments(
+    batch: AssignmentBatch, riders: Sequence[Rider], times: RouteTimes
+) -> AssignmentPlan:
+    """
+    Assigns pickups to riders with a greedy sweep. Pickups are clustered
+    by city, then ordered by pincode, pickup address and requested day, so
+    a route visits each address once and moves through neighbouring
+    pincodes. Each city's riders, in the order given, take the next run of
+    that order until their weight, box or shift-time capacity is reached.
+
+    A route's time is the travel, stop and handling minutes of its pickups
+    (see RouteTimes). Cumulative sums make every rider's cut one binary
+    search per constraint, so the cost is a sort plus O(riders x log n).
+    """
+    n = len(batch.weight_kg)
+    rider = np.full(n, NONE, dtype=np.int32)
+    sequence = np.zeros(n, dtype=np.int32)
+    arrival = np.zeros(n, dtype=np.float64)
+    reason = np.full(n, NONE, dtype=np.int8)
+    if n == 0:
+        return AssignmentPlan(rider, sequence, arrival, reason)
+
+    # Everything below works on the pickups in route order.
+    order = np.lexsort((batch.requested_day, batch.address, batch.pincode, batch.city))
+    city = batch.city[order]
+    pincode = batch.pincode[order]
+    address = batch.address[order]
+    weight = batch.weight_kg[order]
+    boxes = batch.boxes[order]
+
+    crews: dict[int, list[int]] = {}
+    for index, r in enumerate(riders):
+        crews.setdefault(r.city, []).append(index)
+
+    city_starts = np.flatnonzero(np.r_[True, city[1:] != city[:-1]])
+    for lo, hi in zip(city_starts.tolist(), [*city_starts[1:].tolist(), n]):
+        positions = np.arange(lo, hi)
+        crew = crews.get(int(city[lo]))
+        if not crew:
+            reason[order[positions]] = _REASON_CODES[UnassignedReason.NO_RIDER_IN_CITY]
+            continue
+        too_big = (weight[positions] > max(riders[r].max_weight_kg for r in crew) + _EPSILON) | (
+            boxes[positions] > max(riders[r].max_boxes for r in crew)
+        )
+        reason[order[positions[too_big]]] = _REASON_CODES[UnassignedReason.EXCEEDS_RIDER_CAPACITY]
+        route = positions[~too_big]
+        if not len(route):
+            continue
+
+        # Route costs over the pickups left; the first of the city starts
+        # a new pincode and address.
+        new_pincode = np.r_[True, pincode[route[1:]] != pincode[route[:-1]]]
+        new_address = new_pincode | np.r_[True, address[route[1:]] != address[route[:-1]]]
+        cost = times.handling + times.stop * new_address + times.travel * new_pincode
+        cum_weight = np.r_[0.0, np.cumsum(weight[route])]
+        cum_boxes = np.r_[0, np.cumsum(boxes[route])]
+        cum_minutes = np.r_[0.0, np.cumsum(cost)]
+
+        start, end = 0, len(route)
+        for r in crew:
+            if start == end:
+                break
+            shift = riders[r]
+            # Starting mid-address, the rider still travels there and stops.
+            extra = (0.0 if new_address[start] else times.stop) + (
+                0.0 if new_pincode[start] else times.travel
+            )
+            stop_at = min(
+                np.searchsorted(cum_weight, cum_weight[start] + shift.max_weight_kg + _EPSILON, "right"),
+                np.searchsorted(cum_boxes, cum_boxes[start] + shift.max_boxes, "right"),
+                np.searchsorted(
+                    cum_minutes, cum_minutes[start] + shift.shift_minutes - extra + _EPSILON, "right"
+                ),
+            ) - 1
+            if stop_at <= start:
+                continue
+            taken = order[route[start:stop_at]]
+            rider[taken] = r
+            sequence[taken] = np.arange(1, stop_at - start + 1)
+            # Arrival is before handling the pickup: travel and stop are done.
+            arrival[taken] = (
+                cum_minutes[start + 1 : stop_at + 1] - cum_minutes[start] + extra - times.handling
+            )
+            start = stop_at
+        reason[order[route[start:]]] = _REASON_CODES[UnassignedReason.OUT_OF_CAPACITY]
+
+    return AssignmentPlan(rider, sequence, arrival, reason)
+
+
+def _normalize_city(city: str) -> str:
+    return " ".join(city.split()).casefold()
+
+
+def _codes(values: list[Any]) -> np.ndarray:
+    """
+    Codes values by first appearance.
+    """
+    seen: dict[Any, int] = {}
+    return np.array([seen.setdefault(v, len(seen)) for v in values], dtype=np.int64)
+
+
+def _sorted_codes(values: list[str]) -> np.ndarray:
+    """
+    Codes values so that codes sort like the values.
+    """
+    if not values:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.array(values), return_inverse=True)[1].astype(np.int64)
+
+
+def _at(pickup_date: date, start: time, minutes: float) -> time:
+    return (datetime.combine(pickup_date, start) + timedelta(minutes=minutes)).time()
+
+
+def _summarize(
+    assignments: list[tuple[int, float, PickupAssignmentRead]],
+    *,
+    rows: list[Any],
+    riders: list[RiderShift],
+    pickup_date: date,
+) -> list[RiderRoute]:
+    """
+    Totals each rider's route, for assignments ordered by rider and sequence.
+    """
+    # rider code -> [pickups, stops, weight, boxes, last address, last arrival]
+    totals: dict[str, list[Any]] = {}
+    for i, minutes, assignment in assignments:
+        row = rows[i]
+        route = totals.setdefault(assignment.rider_code, [0, 0, 0.0, 0, None, 0.0])
+        route[0] += 1
+        route[1] += route[4] != row.pickup_address_id
+        route[2] += row.weight_kg
+        route[3] += row.boxes
+        route[4] = row.pickup_address_id
+        route[5] = minutes
+
+    routes = []
+    for rider in riders:
+        pickups, stops, weight, boxes, _, last_arrival = totals.get(
+            rider.rider_code, [0, 0, 0.0, 0, None, 0.0]
+        )
+        routes.append(
+            RiderRoute(
+                rider_code=rider.rider_code,
+                pickups=pickups,
+                stops=stops,
+                weight_kg=round(weight, 3),
+                boxes=boxes,
+                finishes_at=_at(
+                    pickup_date,
+                    rider.shift_start,
+                    last_arrival + settings.PICKUP_ASSIGNMENT_HANDLING_MINUTES,
+                )
+                if pickups
+                else None,
+            )
+        )
+    return routes
+
+
+class PickupAssignmentService:
+    """
+    This class handles the daily assignment of OPEN pickups to riders.
+    Routes are planned in memory by plan_assignments; the assigned pickups
+    are then moved to ASSIGNED through the bulk status transition path,
+    together with their assignment rows, a chunk per transaction.
+    """
+
+    def __init__(
+        self, pickup_repo: PickupRepository, assignment_repo: PickupAssignmentRepository
+    ):
+        self.assignment_repo = assignment_repo
+        self.pickup_service = PickupService(pickup_repo)
+
+    async def assign_pickups(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        pickup_date: date,
+        riders: list[RiderShift],
+        dry_run: bool = False,
+    ) -> PickupAssignmentResponse:
+        """
+        Assigns the tenant's OPEN pickups requested for `pickup_date` or
+        earlier to the given riders. Each assigned pickup gets a pickup
+        window of PICKUP_ASSIGNMENT_SLOT_MINUTES around the rider's
+        estimated arrival. With `dry_run`, the plan is returned and nothing
+        is written.
+        """
+        rows = await self.assignment_repo.get_assignable_pickups(
+            tenant_id=tenant_id, pickup_date=pickup_date
+        )
+        cities = [_normalize_city(row.city) for row in rows]
+        city_codes: dict[str, int] = {}
+        for name in [*cities, *(_normalize_city(r.city) for r in riders)]:
+            city_codes.setdefault(name, len(city_codes))
+
+        batch = AssignmentBatch(
+            city=np.array([city_codes[name] for name in cities], dtype=np.int64),
+            pincode=_sorted_codes([row.pincode for row in rows]),
+            address=_codes([row.pickup_address_id for row in rows]),
+            requested_day=np.array(
+                [row.requested_pickup_date.toordinal() for row in rows], dtype=np.int64
+            ),
+            weight_kg=np.array([row.weight_kg for row in rows], dtype=np.float64),
+            boxes=np.array([row.boxes for row in rows], dtype=np.int64),
+        )
+        shifts = [
+            Rider(
+                city=city_codes[_normalize_city(r.city)],
+                max_weight_kg=r.max_weight_kg,
+                max_boxes=r.max_boxes,
+                shift_minutes=(
+                    datetime.combine(pickup_date, r.shift_end)
+                    - datetime.combine(pickup_date, r.shift_start)
+                ).total_seconds()
+                / 60,
+            )
+            for r in riders
+        ]
+        plan = plan_assignments(
+            batch,
+            shifts,
+            RouteTimes(
+                travel=settings.PICKUP_ASSIGNMENT_TRAVEL_MINUTES,
+                stop=settings.PICKUP_ASSIGNMENT_STOP_MINUTES,
+                handling=settings.PICKUP_ASSIGNMENT_HANDLING_MINUTES,
+            ),
+        )
+
+        unassigned = [
+            PickupUnassigned(pickup_id=rows[i].id, reason=REASONS[plan.reason[i]])
+            for i in np.flatnonzero(plan.rider == NONE).tolist()
+        ]
+        slot = settings.PICKUP_ASSIGNMENT_SLOT_MINUTES
+        assigned = np.flatnonzero(plan.rider != NONE)
+        assigned = assigned[np.lexsort((plan.sequence[assigned], plan.rider[assigned]))]
+        # (row, arrival minutes, assignment), by rider and sequence.
+        assignments: list[tuple[int, float, PickupAssignmentRead]] = []
+        for i, r, seq, minutes in zip(
+            assigned.tolist(),
+            plan.rider[assigned].tolist(),
+            plan.sequence[assigned].tolist(),
+            plan.arrival_minutes[assigned].tolist(),
+        ):
+            window = minutes // slot * slot
+            shift = riders[r]
+            assignments.append(
+                (
+                    i,
+                    minutes,
+                    PickupAssignmentRead(
+                        pickup_id=rows[i].id,
+                        rider_code=shift.rider_code,
+                        sequence=seq,
+                        window_start=_at(pickup_date, shift.shift_start, window),
+                        window_end=min(
+                            _at(pickup_date, shift.shift_start, window + slot), shift.shift_end
+                        ),
+                    ),
+                )
+            )
+
+        if not dry_run:
+            conflicts = await self._write_assignments(
+                assignments, rows=rows, tenant_id=tenant_id, pickup_date=pickup_date
+            )
+            if conflicts:
+                logger.warning(
+                    "%d pickups changed during their assignment run", len(conflicts)
+                )
+                unassigned.extend(
+                    PickupUnassigned(pickup_id=pickup_id, reason=UnassignedReason.CONFLICT)
+                    for pickup_id in conflicts
+                )
+                assignments = [a for a in assignments if a[2].pickup_id not in conflicts]
+
+        return PickupAssignmentResponse(
+            pickup_date=pickup_date,
+            dry_run=dry_run,
+            assigned=len(assignments),
+            unassigned=len(unassigned),
+            riders=_summarize(assignments, rows=rows, riders=riders, pickup_date=pickup_date),
+            assignments=[assignment for _, _, assignment in assignments],
+            unassigned_pickups=unassigned,
+        )
+
+    async def _write_assignments(
+        self,
+        assignments: list[tuple[int, float, PickupAssignmentRead]],
+        *,
+        rows: list[Any],
+        tenant_id: uuid.UUID,
+        pickup_date: date,
+    ) -> set[uuid.UUID]:
+        """
+        Moves the assigned pickups to ASSIGNED and stores their assignments,
+        PICKUP_ASSIGNMENT_CHUNK_SIZE pickups per transaction. Each transition
+        expects the version the plan was made from. Returns the pickups
+        that changed since and were left alone.
+        """
+        conflicts: set[uuid.UUID] = set()
+        chunk_size = settings.PICKUP_ASSIGNMENT_CHUNK_SIZE
+        for start in range(0, len(assignments), chunk_size):
+            chunk = assignments[start : start + chunk_size]
+            items = [
+                PickupTransition(
+                    pickup_id=assignment.pickup_id,
+                    status=PickupStatus.ASSIGNED,
+                    expected_version=rows[i].version,
+                    reason=f"Assigned to rider {assignment.rider_code} for {pickup_date}",
+                )
+                for i, _, assignment in chunk
+            ]
+            try:
+                results = await self.pickup_service.apply_transitions(
+                    items=items, tenant_id=tenant_id
+                )
+                applied = []
+                for (_, _, assignment), result in zip(chunk, results):
+                    if result.outcome == TransitionOutcome.APPLIED:
+                        applied.append(
+                            {
+                                "id": uuid.uuid4(),
+                                "tenant_id": tenant_id,
+                                "pickup_id": assignment.pickup_id,
+                                "pickup_date": pickup_date,
+                                "rider_code": assignment.rider_code,
+                                "sequence": assignment.sequence,
+                                "window_start": assignment.window_start,
+                                "window_end": assignment.window_end,
+                                "created_at": datetime.utcnow(),
+                            }
+                        )
+                    else:
+                        conflicts.add(assignment.pickup_id)
+                await self.assignment_repo.insert_assignments(applied)
+                await self.assignment_repo.commit()
+            except Exception:
+                await self.assignment_repo.rollback()
+                raise
+        return conflicts
+
+
+# This is a factory function that FastAPI will use for dependency injection.
+def get_pickup_assignment_service(
+    session: AsyncSession = Depends(get_session),
+) -> PickupAssignmentService:
+    """
+    Factory for creating a PickupAssignmentService instance with its dependencies.
+    """
+    return PickupAssignmentService(
+        PickupRepository(session), PickupAssignmentRepository(session)
+    )
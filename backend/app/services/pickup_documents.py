@@ -0,0 +1,126 @@
+import contextlib
+import hashlib
+import uuid
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from app.core.config import settings
+from app.core.db import get_session
+from app.core.storage import StorageBackend, document_storage
+from app.exceptions.definitions import (
+    DocumentTooLargeException,
+    InvalidDocumentException,
+    PickupNotFoundException,
+)
+from app.models.pickups import DocumentBlob, DocumentType, PickupDocument
+from app.repositories.pickup_documents import PickupDocumentRepository
+from app.schemas.v1.pickups import PickupDocumentRead, PickupDocumentUploadResponse
+from fastapi import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class _HashingReader:
+    """
+    Passes an upload's chunks through while hashing and counting them,
+    and stops the upload as soon as it exceeds `max_bytes`.
+    """
+
+    def __init__(self, chunks: AsyncIterable[bytes], max_bytes: int):
+        self.chunks = chunks
+        self.max_bytes = max_bytes
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.chunks:
+            if not chunk:
+                continue
+            self.size += len(chunk)
+            if self.size > self.max_bytes:
+                raise DocumentTooLargeException()
+            self.sha256.update(chunk)
+            yield chunk
+
+
+class PickupDocumentService:
+    """
+    This class contains the business logic for uploading pickup documents.
+    Uploads are streamed to the storage backend, so no file is held in
+    memory; a tenant's identical files are stored once.
+    """
+
+    def __init__(self, document_repo: PickupDocumentRepository, storage: StorageBackend):
+        self.document_repo = document_repo
+        self.storage = storage
+
+    async def upload_document(
+        self,
+        *,
+        pickup_id: uuid.UUID,
+        tenant_id: uuid.UUID,
+        document_type: DocumentType,
+        file_name: str,
+        chunks: AsyncIterable[bytes],
+        content_length: Optional[int] = None,
+    ) -> PickupDocumentUploadResponse:
+        """
+        Stores an uploaded file and attaches it to one of the tenant's pickups.
+        The file is hashed (SHA-256) as it is written; if the tenant already
+        has a file with that hash, the new copy is deleted and the document
+        points at the existing one.
+        """
+        # Reject what we can before reading the body.
+        if content_length is not None and content_length > settings.DOCUMENT_MAX_BYTES:
+            raise DocumentTooLargeException()
+        if not await self.document_repo.pickup_exists(pickup_id=pickup_id, tenant_id=tenant_id):
+            raise PickupNotFoundException()
+        # The existence check opened a transaction; don't hold it during the upload.
+        await self.document_repo.rollback()
+
+        storage_key = f"{tenant_id}/{uuid.uuid4().hex}"
+        reader = _HashingReader(chunks, settings.DOCUMENT_MAX_BYTES)
+        await self.storage.write(storage_key, reader)
+
+        try:
+            if reader.size == 0:
+                raise InvalidDocumentException("The document is empty.")
+            blob, created = await self.document_repo.get_or_create_blob(
+                DocumentBlob(
+                    tenant_id=tenant_id,
+                    content_hash=reader.sha256.hexdigest(),
+                    storage_key=storage_key,
+                    size_bytes=reader.size,
+                )
+            )
+            document = await self.document_repo.add_document(
+                PickupDocument(
+                    pickup_id=pickup_id,
+                    document_type=document_type,
+                    file_url=self.storage.url(blob.storage_key),
+                    file_name=file_name,
+                    blob_id=blob.id,
+                )
+            )
+        except BaseException:
+            await self.document_repo.rollback()
+            with contextlib.suppress(Exception):
+                await self.storage.delete(storage_key)
+            raise
+
+        if not created:
+            await self.storage.delete(storage_key)
+        return PickupDocumentUploadResponse(
+            document=PickupDocumentRead.model_validate(document),
+            content_hash=blob.content_hash,
+            size_bytes=blob.size_bytes,
+            deduplicated=not created,
+        )
+
+
+# This is a factory function that FastAPI will use for dependency injection.
+def get_pickup_document_service(
+    session: AsyncSession = Depends(get_session),
+) -> PickupDocumentService:
+    """
+    Factory for creating a PickupDocumentService instance with its dependencies.
+    """
+    return PickupDocumentService(PickupDocumentRepository(session), document_storage)
@@ -0,0 +1,474 @@
+import asyncio
+import contextlib
+import csv
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, AsyncIterable, Iterator, Optional
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, get_session
+from app.exceptions.definitions import (
+    ImportFileTooLargeException,
+    InvalidImportFileException,
+    PickupImportNotFoundException,
+)
+from app.models.pickups import ImportJobStatus, PickupImportJob
+from app.repositories.pickup_imports import PickupImportRepository
+from app.repositories.pickups import PickupRepository
+from app.schemas.v1.pickups import AddressCreate, PackageCreate, PaymentCreate, PickupCreate
+from app.services.pickups import PickupService
+from app.services.serviceability import serviceability
+from fastapi import Depends
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# --- Manifest format ---
+# One pickup per CSV row, with a header line. Addresses are given twice,
+# with `pickup_` and `delivery_` prefixes (e.g. pickup_name, delivery_city);
+# the package with a `package_` prefix (package_weight; use package_box_count
+# for several identical boxes); payment fields unprefixed (amount,
+# payment_mode). Blank cells take the API defaults.
+PICKUP_COLUMNS = (
+    "order_reference_id",
+    "tracking_id",
+    "shipment_type",
+    "service_type",
+    "product_category",
+    "shipment_description",
+    "reason_for_return",
+    "requested_pickup_date",
+)
+ADDRESS_PREFIXES = {"pickup_address": "pickup_", "delivery_address": "delivery_"}
+PACKAGE_PREFIX = "package_"
+
+REQUIRED_COLUMNS = {
+    *(name for name in PICKUP_COLUMNS if PickupCreate.model_fields[name].is_required()),
+    *(
+        f"{prefix}{name}"
+        for prefix in ADDRESS_PREFIXES.values()
+        for name, field in AddressCreate.model_fields.items()
+        if field.is_required()
+    ),
+    *(
+        f"{PACKAGE_PREFIX}{name}"
+        for name, field in PackageCreate.model_fields.items()
+        if field.is_required()
+    ),
+}
+
+pickup_list_adapter = TypeAdapter(list[PickupCreate])
+
+# Reported for a row the database rejects. The database's own message
+# names tables and constraints, so it is only logged.
+DATABASE_REJECTED_ERROR = "row: Rejected by the database"
+
+# The job error for failures other than an unreadable file; details are logged.
+UNEXPECTED_FAILURE_ERROR = "The import failed unexpectedly."
+
+
+def manifest_item(row: dict[str, Any]) -> dict[str, Any]:
+    """
+    Turns a manifest row into a PickupCreate-shaped dict, leaving out blank
+    cells so their fields take their defaults.
+    """
+    values = {
+        key.strip(): value.strip()
+        for key, value in row.items()
+        if isinstance(key, str) and isinstance(value, str) and value.strip()
+    }
+    item: dict[str, Any] = {name: values[name] for name in PICKUP_COLUMNS if name in values}
+    for field, prefix in ADDRESS_PREFIXES.items():
+        item[field] = {
+            name: values[prefix + name]
+            for name in AddressCreate.model_fields
+            if prefix + name in values
+        }
+    item["packages"] = [
+        {
+            name: values[PACKAGE_PREFIX + name]
+            for name in PackageCreate.model_fields
+            if PACKAGE_PREFIX + name in values
+        }
+    ]
+    payment = {name: values[name] for name in PaymentCreate.model_fields if name in values}
+    if payment:
+        item["payment"] = payment
+    return item
+
+
+def _column_name(loc: tuple) -> str:
+    """
+    Maps a PickupCreate error location back to its manifest column.
+    """
+    if not loc:
+        return "row"
+    field, *rest = loc
+    if field in ADDRESS_PREFIXES and rest:
+        return f"{ADDRESS_PREFIXES[field]}{rest[0]}"
+    if field == "packages" and len(rest) > 1:
+        return f"{PACKAGE_PREFIX}{rest[1]}"
+    if field == "payment" and rest:
+        return str(rest[0])
+    return str(field)
+
+
+def validate_manifest_rows(
+    rows: list[tuple[int, dict[str, Any]]],
+) -> tuple[list[tuple[int, PickupCreate]], dict[int, list[str]]]:
+    """
+    Validates a chunk of (row number, manifest row) pairs as one list, so
+    pydantic-core checks the whole chunk in a single call. Returns the
+    valid pickups and the errors of each invalid row.
+    """
+    items = [manifest_item(row) for _, row in rows]
+    try:
+        return list(zip((number for number, _ in rows), pickup_list_adapter.validate_python(items))), {}
+    except ValidationError as e:
+        errors: dict[int, list[str]] = defaultdict(list)
+        for error in e.errors():
+            index, *loc = error["loc"]
+            errors[rows[index][0]].append(f"{_column_name(tuple(loc))}: {error['msg']}")
+
+    # Validate the rest again; they passed above, so this can't fail.
+    valid_rows = [(number, item) for (number, _), item in zip(rows, items) if number not in errors]
+    pickups = pickup_list_adapter.validate_python([item for _, item in valid_rows])
+    return list(zip((number for number, _ in valid_rows), pickups)), dict(errors)
+
+
+def _read_header(path: str) -> list[str]:
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            return [name.strip() for name in next(csv.reader(file))]
+    except StopIteration:
+        raise InvalidImportFileException("The file is empty.")
+    except (UnicodeDecodeError, csv.Error):
+        raise InvalidImportFileException("The file must be a UTF-8 encoded CSV file.")
+
+
+def _read_chunk(
+    rows: Iterator[tuple[int, dict[str, Any]]], size: int
+) -> tuple[int, list[tuple[int, PickupCreate]], dict[int, list[str]]]:
+    """
+    Reads and validates the next `size` manifest rows, and checks that
+    their routes are serviceable.
+    Returns the number of rows read, the valid pickups and the row errors.
+    """
+    chunk = list(islice(rows, size))
+    valid, errors = validate_manifest_rows(chunk) if chunk else ([], {})
+    unserviceable = serviceability.check_pickups(valid)
+    if unserviceable:
+        errors.update(unserviceable)
+        valid = [(number, item) for number, item in valid if number not in unserviceable]
+    return len(chunk), valid, errors
+
+
+class ImportTakenOverException(Exception):
+    """
+    Raised when another process took over an import job mid-run.
+    """
+
+
+class PickupImportService:
+    """
+    This class handles the business logic for importing CSV manifests.
+    The upload is saved to disk and a job is created; the job is then run
+    in the background by pickup_import_runner, a chunk at a time.
+    """
+
+    def __init__(self, pickup_repo: PickupRepository, import_repo: PickupImportRepository):
+        self.pickup_repo = pickup_repo
+        self.import_repo = import_repo
+        self.pickup_service = PickupService(pickup_repo)
+
+    async def create_import(
+        self,
+        *,
+        chunks: AsyncIterable[bytes],
+        file_name: Optional[str],
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> PickupImportJob:
+        """
+        Saves an uploaded manifest to PICKUP_IMPORT_DIR as it arrives,
+        checks its header, and creates a pending job for it.
+        """
+        job_id = uuid.uuid4()
+        # File I/O runs in threads so uploads don't block the event loop.
+        await asyncio.to_thread(os.makedirs, settings.PICKUP_IMPORT_DIR, exist_ok=True)
+        path = os.path.join(settings.PICKUP_IMPORT_DIR, f"{job_id}.csv")
+        try:
+            size = 0
+            file = await asyncio.to_thread(open, path, "wb")
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > settings.PICKUP_IMPORT_MAX_BYTES:
+                        raise ImportFileTooLargeException()
+                    await asyncio.to_thread(file.write, chunk)
+            finally:
+                await asyncio.to_thread(file.close)
+            missing = REQUIRED_COLUMNS - set(await asyncio.to_thread(_read_header, path))
+            if missing:
+                raise InvalidImportFileException(
+                    f"Missing required columns: {', '.join(sorted(missing))}"
+                )
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            raise
+
+        job = PickupImportJob(
+            id=job_id,
+            tenant_id=tenant_id,
+            created_by_user_id=user_id,
+            file_name=file_name[:255] if file_name else None,
+            file_path=path,
+        )
+        return await self.import_repo.create_job(job)
+
+    async def get_import(
+        self, *, job_id: uuid.UUID, tenant_id: uuid.UUID
+    ) -> PickupImportJob:
+        """
+        Retrieves one of the tenant's import jobs.
+        """
+        job = await self.import_repo.get_job(job_id, tenant_id)
+        if not job:
+            raise PickupImportNotFoundException()
+        return job
+
+    async def run_import(self, job_id: uuid.UUID) -> None:
+        """
+        Claims a job and imports the rest of its manifest. Each chunk of
+        PICKUP_IMPORT_CHUNK_SIZE rows is validated in one pass and written,
+        together with the job's progress, in one transaction; a job that is
+        interrupted resumes after the last committed chunk. A job that errors
+        is marked failed, as a retry would stop at the same chunk.
+        """
+        job = await self.import_repo.claim_job(job_id, stale_before=_stale_before())
+        if job is None:
+            return
+        logger.info("Importing pickups for job %s from row %d", job.id, job.rows_processed + 1)
+
+        try:
+            with open(job.file_path, newline="", encoding="utf-8-sig") as file:
+                rows = enumerate(csv.DictReader(file), start=1)
+                # Skip the rows earlier runs already committed.
+                for _ in islice(rows, job.rows_processed):
+                    pass
+                while True:
+                    # Parsing and validation hold the CPU, so run them off the event loop.
+                    read, valid, errors = await asyncio.to_thread(
+                        _read_chunk, rows, settings.PICKUP_IMPORT_CHUNK_SIZE
+                    )
+                    if not read:
+                        break
+                    await self._import_chunk(job, read, valid, errors)
+        except ImportTakenOverException:
+            logger.warning("Pickup import %s was taken over by another process", job.id)
+            return
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            logger.warning("Pickup import %s failed: %s", job.id, e)
+            await self.import_repo.finish_job(
+                job.id, status=ImportJobStatus.FAILED, error=f"Could not read the file: {e}"
+            )
+            return
+        except Exception:
+            # If this can't be recorded either, the job is retried once it
+            # goes stale.
+            logger.exception("Pickup import %s failed", job.id)
+            await self.import_repo.rollback()
+            await self.import_repo.finish_job(
+                job.id, status=ImportJobStatus.FAILED, error=UNEXPECTED_FAILURE_ERROR
+            )
+            return
+
+        await self.import_repo.finish_job(job.id, status=ImportJobStatus.COMPLETED)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(job.file_path)
+        logger.info(
+            "Imported %d pickups for job %s (%d rows failed)",
+            job.created_count, job.id, job.failed_count,
+        )
+
+    async def _import_chunk(
+        self,
+        job: PickupImportJob,
+        read: int,
+        valid: list[tuple[int, PickupCreate]],
+        errors: dict[int, list[str]],
+    ) -> None:
+        """
+        Writes one validated chunk. If the database rejects it, the valid
+        rows are written one by one so only the offending rows fail.
+        """
+        try:
+            await self._write_rows(job, read, valid, errors)
+            return
+        except DBAPIError:
+            logger.warning(
+                "Import chunk of %d rows failed for job %s; retrying rows one by one",
+                read, job.id,
+            )
+
+        # Each valid row commits with the rows read since the last commit.
+        first_row = job.rows_processed + 1
+        pending_errors: dict[int, list[str]] = {}
+        pending_rows = 0
+        valid_by_row = dict(valid)
+        for number in range(first_row, first_row + read):
+            pending_rows += 1
+            if number in errors:
+                pending_errors[number] = errors[number]
+                continue
+            try:
+                await self._write_rows(job, pending_rows, [(number, valid_by_row[number])], pending_errors)
+            except DBAPIError as e:
+                logger.warning("Pickup import %s row %d rejected: %s", job.id, number, e.orig)
+                pending_errors[number] = [DATABASE_REJECTED_ERROR]
+                continue
+            pending_errors, pending_rows = {}, 0
+        if pending_rows:
+            await self._write_rows(job, pending_rows, [], pending_errors)
+
+    async def _write_rows(
+        self,
+        job: PickupImportJob,
+        read: int,
+        valid: list[tuple[int, PickupCreate]],
+        errors: dict[int, list[str]],
+    ) -> None:
+        """
+        Writes valid pickups and the job's progress in one transaction,
+        then advances the job's in-memory counters.
+        """
+        batch, _ = self.pickup_service.build_batch(
+            valid, tenant_id=job.tenant_id, user_id=job.created_by_user_id
+        )
+        room = max(0, settings.PICKUP_IMPORT_MAX_ERRORS - job.failed_count)
+        row_errors = [
+            {"row": number, "errors": messages}
+            for number, messages in sorted(errors.items())[:room]
+        ]
+        try:
+            await self.pickup_repo.copy_pickup_batch(
+                tenant_id=job.tenant_id,
+                addresses=list(batch.addresses.values()),
+                pickups=batch.pickups,
+                packages=batch.packages,
+                payments=batch.payments,
+            )
+            # Both repositories share one session: this commits the pickups
+            # and the progress that accounts for them together.
+            recorded = await self.import_repo.record_progress(
+                job.id,
+                expected_rows_processed=job.rows_processed,
+                rows=read,
+                created=len(valid),
+                failed=len(errors),
+                errors=row_errors,
+            )
+            if not recorded:
+                raise ImportTakenOverException()
+            await self.import_repo.commit()
+        except BaseException:
+            await self.import_repo.rollback()
+            raise
+
+        job.rows_processed += read
+        job.created_count += len(valid)
+        job.failed_count += len(errors)
+
+
+def _stale_before() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.PICKUP_IMPORT_STALE_SECONDS)
+
+
+class PickupImportRunner:
+    """
+    Runs import jobs in background tasks, at most `concurrency` at a time.
+
+    Jobs are claimed with a conditional UPDATE, so each runs in one process
+    at a time. Every `poll_interval` seconds (and on startup) the runner
+    also picks up pending jobs and jobs abandoned by a process that died,
+    i.e. whose progress hasn't moved for PICKUP_IMPORT_STALE_SECONDS.
+    """
+
+    def __init__(self, *, concurrency: int, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._running: dict[uuid.UUID, asyncio.Task] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    def submit(self, job_id: uuid.UUID) -> None:
+        """
+        Schedules a job to run in the background, unless it already is.
+        """
+        if job_id in self._running:
+            return
+        task = asyncio.create_task(self._run(job_id))
+        self._running[job_id] = task
+        task.add_done_callback(lambda _: self._running.pop(job_id, None))
+
+    def start(self) -> None:
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """
+        Stops the runner. Chunks in flight are rolled back; their jobs resume
+        from the last committed chunk once they are found to be abandoned.
+        """
+        tasks = [*self._running.values(), *([self._poller] if self._poller else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._poller = None
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as session:  # type: ignore
+                    job_ids = await PickupImportRepository(session).list_claimable_job_ids(
+                        stale_before=_stale_before()
+                    )
+                for job_id in job_ids:
+                    self.submit(job_id)
+            except Exception:
+                logger.exception("Failed to look for pickup import jobs")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run(self, job_id: uuid.UUID) -> None:
+        async with self._semaphore:
+            try:
+                async with AsyncSessionLocal() as session:  # type: ignore
+                    service = PickupImportService(
+                        PickupRepository(session), PickupImportRepository(session)
+                    )
+                    await service.run_import(job_id)
+            except Exception:
+                # The job couldn't be claimed or marked failed (e.g. the
+                # database is down); it is retried once it goes stale.
+                logger.exception("Pickup import %s failed", job_id)
+
+
+pickup_import_runner = PickupImportRunner(
+    concurrency=settings.PICKUP_IMPORT_CONCURRENCY,
+    poll_interval=settings.PICKUP_IMPORT_STALE_SECONDS,
+)
+
+
+# This is a factory function that FastAPI will use for dependency injection.
+def get_pickup_import_service(
+    session: AsyncSession = Depends(get_session),
+) -> PickupImportService:
+    """
+    Factory for creating a PickupImportService instance with its dependencies.
+    """
+    return PickupImportService(PickupRepository(session), PickupImportRepository(session))
@@ -0,0 +1,82 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.db import get_read_session
+from app.exceptions.definitions import InvalidDateRangeException
+from app.models.pickups import TenantPickupDailyStats
+from app.repositories.pickup_stats import STATS_COLUMNS, PickupStatsRepository
+from app.schemas.v1.pickups import PickupDailyStats, PickupStatsResponse, PickupStatsTotals
+from fastapi import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def _add(totals: PickupStatsTotals, row: TenantPickupDailyStats) -> None:
+    for name in STATS_COLUMNS:
+        setattr(totals, name, getattr(totals, name) + getattr(row, name))
+
+
+class PickupStatsService:
+    """
+    This class contains the business logic for the pickup dashboard.
+    It reads the daily stats rollup, so its cost grows with the number of
+    days asked for, not with the number of pickups.
+    """
+
+    def __init__(self, stats_repo: PickupStatsRepository):
+        self.stats_repo = stats_repo
+
+    async def get_stats(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> PickupStatsResponse:
+        """
+        Summarizes the tenant's pickups created between two days (both
+        inclusive, UTC) by day and by current status. Without a range,
+        covers the last PICKUP_STATS_DEFAULT_DAYS days.
+        """
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - timedelta(days=settings.PICKUP_STATS_DEFAULT_DAYS - 1)
+        if date_from > date_to:
+            raise InvalidDateRangeException("date_from must not be after date_to.")
+        if (date_to - date_from).days >= settings.PICKUP_STATS_MAX_DAYS:
+            raise InvalidDateRangeException(
+                f"The range may cover at most {settings.PICKUP_STATS_MAX_DAYS} days."
+            )
+
+        rows = await self.stats_repo.get_daily_stats(
+            tenant_id=tenant_id, day_from=date_from, day_to=date_to
+        )
+        response = PickupStatsResponse(
+            date_from=date_from,
+            date_to=date_to,
+            totals=PickupStatsTotals(),
+            by_status={},
+            days=[],
+        )
+        for row in rows:
+            # Transitions can leave a status with nothing in it.
+            if row.pickup_count == 0:
+                continue
+            if not response.days or response.days[-1].day != row.day:
+                response.days.append(PickupDailyStats(day=row.day, by_status={}))
+            day = response.days[-1]
+            _add(day, row)
+            _add(day.by_status.setdefault(row.status, PickupStatsTotals()), row)
+            _add(response.by_status.setdefault(row.status, PickupStatsTotals()), row)
+            _add(response.totals, row)
+        return response
+
+
+# This is a factory function that FastAPI will use for dependency injection.
+def get_pickup_stats_service(
+    read_session: AsyncSession = Depends(get_read_session),
+) -> PickupStatsService:
+    """
+    Factory for creating a PickupStatsService instance with its dependencies.
+    """
+    return PickupStatsService(PickupStatsRepository(read_session))
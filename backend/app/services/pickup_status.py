@@ -0,0 +1,21 @@
+from app.models.pickups import PickupStatus
+
+# The pickup lifecycle. Statuses missing from the keys are terminal.
+ALLOWED_TRANSITIONS: dict[PickupStatus, frozenset[PickupStatus]] = {
+    PickupStatus.DRAFT: frozenset({PickupStatus.OPEN, PickupStatus.CANCELLED}),
+    PickupStatus.OPEN: frozenset({PickupStatus.ASSIGNED, PickupStatus.CANCELLED}),
+    PickupStatus.ASSIGNED: frozenset(
+        # A courier can hand an assigned pickup back before collecting it.
+        {PickupStatus.IN_TRANSIT, PickupStatus.OPEN, PickupStatus.CANCELLED}
+    ),
+    PickupStatus.IN_TRANSIT: frozenset(
+        {PickupStatus.COMPLETED, PickupStatus.RTO_INITIATED}
+    ),
+}
+
+
+def is_allowed_transition(from_status: PickupStatus, to_status: PickupStatus) -> bool:
+    """
+    Returns whether a pickup may move directly from `from_status` to `to_status`.
+    """
+    return to_status in ALLOWED_TRANSITIONS.get(from_status, frozenset())
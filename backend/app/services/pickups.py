@@ -0,0 +1,461 @@
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Literal, Optional
+
+from app.core.cache import MISSING, address_cache
+from app.core.config import settings
+from app.core.db import get_read_session, get_session
+from app.core.pagination import decode_cursor, decode_timestamp_id_cursor, paginate
+from app.core.streaming import ndjson_lines
+from app.exceptions.definitions import InvalidCursorException, PickupNotFoundException
+from app.models.pickups import PickupRequest, PickupStatus
+from app.repositories.pickups import PickupRepository
+from app.schemas.v1.pickups import (
+    AddressCreate,
+    PaymentCreate,
+    PickupBulkCreateResponse,
+    PickupBulkItemResult,
+    PickupCreate,
+    PickupExportRow,
+    PickupFilters,
+    PickupTransition,
+    PickupTransitionBatchResponse,
+    PickupTransitionResult,
+    TransitionOutcome,
+)
+from app.services.addresses import address_content_hash
+from app.services.pickup_status import is_allowed_transition
+from app.services.serviceability import serviceability
+from fastapi import Depends
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+pickup_create_adapter = TypeAdapter(PickupCreate)
+
+# Reported for an item the database rejects. The database's own message
+# names tables and constraints, so it is only logged.
+DATABASE_REJECTED_ERROR = "item: Rejected by the database"
+
+
+@dataclass
+class PickupBatch:
+    """
+    Column-keyed rows for a batch of pickups, ready for multi-row INSERTs.
+    Addresses are keyed by content hash. Until address ids are resolved,
+    pickups hold those hashes in `pickup_address_id`/`delivery_address_id`.
+    """
+
+    addresses: dict[str, dict[str, Any]] = field(default_factory=dict)
+    pickups: list[dict[str, Any]] = field(default_factory=list)
+    packages: list[dict[str, Any]] = field(default_factory=list)
+    payments: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _address_row(
+    address: AddressCreate, tenant_id: uuid.UUID, content_hash: str
+) -> dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "content_hash": content_hash,
+        **address.model_dump(),
+    }
+
+
+def _payment_row(payment: PaymentCreate, pickup_id: uuid.UUID) -> dict[str, Any]:
+    return {"id": uuid.uuid4(), "pickup_id": pickup_id, **payment.model_dump()}
+
+
+def _format_validation_errors(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+class PickupService:
+    """
+    This class handles the business logic for pickups.
+    It depends on the PickupRepository for data access.
+    """
+
+    def __init__(self, pickup_repo: PickupRepository):
+        self.pickup_repo = pickup_repo
+
+    async def get_pickup(
+        self, *, pickup_id: uuid.UUID, tenant_id: uuid.UUID
+    ) -> PickupRequest:
+        """
+        Retrieves one pickup of the tenant with all its details.
+        """
+        pickup = await self.pickup_repo.get_pickup(pickup_id=pickup_id, tenant_id=tenant_id)
+        if not pickup:
+            raise PickupNotFoundException()
+        return pickup
+
+    async def list_pickups(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[PickupFilters] = None,
+    ) -> tuple[list[PickupRequest], Optional[str]]:
+        """
+        Retrieves one page of the tenant's pickups, newest first, with all
+        their details and the cursor for the next page.
+        """
+        pickups = await self.pickup_repo.list_pickups(
+            tenant_id=tenant_id,
+            limit=limit + 1,
+            after=decode_timestamp_id_cursor(cursor),
+            **(filters.model_dump(exclude_none=True) if filters else {}),
+        )
+        return paginate(pickups, limit, key=lambda p: (p.created_at.isoformat(), p.id))
+
+    async def search_pickups(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[PickupRequest], Optional[str]]:
+        """
+        Retrieves one page of the tenant's pickups matching a search term,
+        best match first, and the cursor for the next page.
+        """
+        rows = await self.pickup_repo.search_pickups(
+            tenant_id=tenant_id,
+            query=query,
+            limit=limit + 1,
+            after=_decode_rank_cursor(cursor),
+        )
+        page, next_cursor = paginate(rows, limit, key=lambda row: (row[1], row[0].id))
+        return [pickup for pickup, _ in page], next_cursor
+
+    def export_pickups(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        format: Literal["csv", "ndjson"],
+        filters: Optional[PickupFilters] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams the tenant's pickups, oldest first, as CSV (formatted by
+        Postgres with COPY) or NDJSON (one PickupExportRow per line).
+        """
+        query = {
+            "tenant_id": tenant_id,
+            "created_from": _as_utc(created_from),
+            "created_to": _as_utc(created_to),
+            **(filters.model_dump(exclude_none=True) if filters else {}),
+        }
+        if format == "csv":
+            return self.pickup_repo.copy_export_csv(**query)
+        return ndjson_lines(self.pickup_repo.stream_export_rows(**query), PickupExportRow)
+
+    def build_batch(
+        self,
+        items: list[tuple[int, PickupCreate]],
+        *,
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> tuple[PickupBatch, dict[int, uuid.UUID]]:
+        """
+        Turns validated pickups into rows for every table, generating all
+        pickup and package keys up front so their INSERTs need no RETURNING.
+        Identical addresses within the batch collapse to one row.
+        Returns the rows and the new pickup id for each item index.
+        """
+        batch = PickupBatch()
+        pickup_ids: dict[int, uuid.UUID] = {}
+        now = datetime.utcnow()
+
+        for index, item in items:
+            address_hashes = []
+            for address in (item.pickup_address, item.delivery_address):
+                content_hash = address_content_hash(address)
+                if content_hash not in batch.addresses:
+                    batch.addresses[content_hash] = _address_row(
+                        address, tenant_id, content_hash
+                    )
+                address_hashes.append(content_hash)
+
+            pickup_id = uuid.uuid4()
+            pickup_ids[index] = pickup_id
+            batch.pickups.append(
+                {
+                    "id": pickup_id,
+                    "tenant_id": tenant_id,
+                    "created_by_user_id": user_id,
+                    "order_reference_id": item.order_reference_id,
+                    "tracking_id": item.tracking_id,
+                    "shipment_type": item.shipment_type,
+                    "service_type": item.service_type,
+                    # Bulk uploads are submitted pickups, not drafts.
+                    "status": PickupStatus.OPEN,
+                    "product_category": item.product_category,
+                    "shipment_description": item.shipment_description,
+                    "reason_for_return": item.reason_for_return,
+                    "requested_pickup_date": item.requested_pickup_date,
+                    "pickup_address_id": address_hashes[0],
+                    "delivery_address_id": address_hashes[1],
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            batch.packages.extend(
+                {"id": uuid.uuid4(), "pickup_id": pickup_id, **package.model_dump()}
+                for package in item.packages
+            )
+            batch.payments.append(_payment_row(item.payment or PaymentCreate(), pickup_id))
+
+        return batch, pickup_ids
+
+    async def _resolve_address_ids(
+        self, batch: PickupBatch, *, tenant_id: uuid.UUID
+    ) -> dict[str, uuid.UUID]:
+        """
+        Maps every address hash in the batch to an address id, using the
+        in-process address cache first and one insert-or-get for the rest.
+        """
+        address_ids: dict[str, uuid.UUID] = {}
+        missing: list[dict[str, Any]] = []
+        for content_hash, row in batch.addresses.items():
+            address_id = address_cache.get((tenant_id, content_hash))
+            if address_id is MISSING:
+                missing.append(row)
+            else:
+                address_ids[content_hash] = address_id
+
+        address_ids.update(
+            await self.pickup_repo.get_or_create_addresses(tenant_id=tenant_id, rows=missing)
+        )
+        return address_ids
+
+    async def _write_chunk(
+        self,
+        chunk: list[tuple[int, PickupCreate]],
+        *,
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> dict[int, uuid.UUID]:
+        """
+        Writes one chunk of pickups in a single transaction.
+        """
+        batch, pickup_ids = self.build_batch(chunk, tenant_id=tenant_id, user_id=user_id)
+        try:
+            address_ids = await self._resolve_address_ids(batch, tenant_id=tenant_id)
+            for pickup in batch.pickups:
+                pickup["pickup_address_id"] = address_ids[pickup["pickup_address_id"]]
+                pickup["delivery_address_id"] = address_ids[pickup["delivery_address_id"]]
+            await self.pickup_repo.insert_pickups(
+                pickups=batch.pickups, packages=batch.packages, payments=batch.payments
+            )
+            await self.pickup_repo.commit()
+        except Exception:
+            await self.pickup_repo.rollback()
+            raise
+
+        # Only cache addresses once they are committed.
+        for content_hash, address_id in address_ids.items():
+            address_cache.set((tenant_id, content_hash), address_id)
+        return pickup_ids
+
+    async def bulk_create_pickups(
+        self,
+        *,
+        items: list[dict[str, Any]],
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> PickupBulkCreateResponse:
+        """
+        Validates and creates many pickups, reporting a result per item.
+        Pickups whose route isn't serviceable are rejected like invalid ones.
+        Valid items are written in chunks of PICKUP_BULK_CHUNK_SIZE, one
+        transaction per chunk. If a chunk fails, its items are retried one
+        by one so only the offending items are reported as failed.
+        """
+        results = [PickupBulkItemResult(index=index) for index in range(len(items))]
+
+        valid: list[tuple[int, PickupCreate]] = []
+        for index, raw_item in enumerate(items):
+            try:
+                valid.append((index, pickup_create_adapter.validate_python(raw_item)))
+            except ValidationError as e:
+                results[index].errors = _format_validation_errors(e)
+
+        # One batch lookup for every route, instead of one per pickup.
+        unserviceable = serviceability.check_pickups(valid)
+        for index, errors in unserviceable.items():
+            results[index].errors = errors
+        valid = [(index, item) for index, item in valid if index not in unserviceable]
+
+        chunk_size = settings.PICKUP_BULK_CHUNK_SIZE
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start : start + chunk_size]
+            try:
+                pickup_ids = await self._write_chunk(
+                    chunk, tenant_id=tenant_id, user_id=user_id
+                )
+            except DBAPIError:
+                logger.warning(
+                    "Bulk pickup chunk of %d failed; retrying items one by one",
+                    len(chunk),
+                )
+                pickup_ids = {}
+                for index, item in chunk:
+                    try:
+                        pickup_ids.update(
+                            await self._write_chunk(
+                                [(index, item)], tenant_id=tenant_id, user_id=user_id
+                            )
+                        )
+                    except DBAPIError as e:
+                        logger.warning("Bulk pickup item %d rejected: %s", index, e.orig)
+                        results[index].errors = [DATABASE_REJECTED_ERROR]
+
+            for index, pickup_id in pickup_ids.items():
+                results[index].pickup_id = pickup_id
+
+        created = sum(1 for r in results if r.pickup_id is not None)
+        return PickupBulkCreateResponse(
+            created=created, failed=len(items) - created, results=results
+        )
+
+    async def transition_pickups(
+        self, *, items: list[PickupTransition], tenant_id: uuid.UUID
+    ) -> PickupTransitionBatchResponse:
+        """
+        Validates and applies a batch of status transitions in one
+        transaction, reporting an outcome per item.
+        """
+        try:
+            results = await self.apply_transitions(items=items, tenant_id=tenant_id)
+            await self.pickup_repo.commit()
+        except Exception:
+            await self.pickup_repo.rollback()
+            raise
+
+        applied = sum(1 for r in results if r.outcome == TransitionOutcome.APPLIED)
+        unchanged = sum(1 for r in results if r.outcome == TransitionOutcome.UNCHANGED)
+        return PickupTransitionBatchResponse(
+            applied=applied, failed=len(results) - applied - unchanged, results=results
+        )
+
+    async def apply_transitions(
+        self, *, items: list[PickupTransition], tenant_id: uuid.UUID
+    ) -> list[PickupTransitionResult]:
+        """
+        Validates and applies a batch of status transitions without
+        committing, so callers can write more in the same transaction.
+        Returns an outcome per item.
+        Every item is checked against the pickup's current status and
+        version. Items for the same pickup are chained in order: the n-th
+        item for a pickup goes into the n-th round, and each round is one
+        batched UPDATE. A transition that loses a race with another writer is
+        reported as CONFLICT, along with any later items for that pickup.
+        """
+        current = await self.pickup_repo.get_statuses(
+            tenant_id=tenant_id, pickup_ids=list({item.pickup_id for item in items})
+        )
+        results: list[PickupTransitionResult] = []
+        rounds: list[list[dict[str, Any]]] = []
+        # Applied results per round, checked against what the database returns.
+        planned: list[list[PickupTransitionResult]] = []
+        transitions_seen: dict[uuid.UUID, int] = {}
+
+        for index, item in enumerate(items):
+            result = PickupTransitionResult(
+                index=index, pickup_id=item.pickup_id, outcome=TransitionOutcome.APPLIED
+            )
+            results.append(result)
+            state = current.get(item.pickup_id)
+            if state is None:
+                result.outcome = TransitionOutcome.NOT_FOUND
+                continue
+
+            status, version = state
+            result.status, result.version = status, version
+            if item.expected_version is not None and item.expected_version != version:
+                result.outcome = TransitionOutcome.CONFLICT
+            elif item.status == status:
+                result.outcome = TransitionOutcome.UNCHANGED
+            elif not is_allowed_transition(status, item.status):
+                result.outcome = TransitionOutcome.INVALID_TRANSITION
+            else:
+                round_ = transitions_seen.get(item.pickup_id, 0)
+                transitions_seen[item.pickup_id] = round_ + 1
+                if round_ == len(rounds):
+                    rounds.append([])
+                    planned.append([])
+                rounds[round_].append(
+                    {
+                        "pickup_id": item.pickup_id,
+                        "history_id": uuid.uuid4(),
+                        "from_status": status,
+                        "to_status": item.status,
+                        "version": version,
+                        "reason": item.reason,
+                    }
+                )
+                planned[round_].append(result)
+                current[item.pickup_id] = (item.status, version + 1)
+                result.status, result.version = item.status, version + 1
+
+        lost: set[uuid.UUID] = set()
+        for rows, round_results in zip(rounds, planned):
+            # Once a pickup loses a race, its later transitions were
+            # validated against a state it never reached.
+            rows = [row for row in rows if row["pickup_id"] not in lost]
+            new_versions = await self.pickup_repo.apply_status_transitions(
+                tenant_id=tenant_id, rows=rows
+            )
+            for result in round_results:
+                if new_versions.get(result.pickup_id) != result.version:
+                    lost.add(result.pickup_id)
+                    result.outcome = TransitionOutcome.CONFLICT
+                    result.status = result.version = None
+        return results
+
+
+def _decode_rank_cursor(cursor: Optional[str]) -> Optional[tuple[float, uuid.UUID]]:
+    """
+    Decodes a (search rank, id)-keyed pagination cursor.
+    """
+    if cursor is None:
+        return None
+    raw_rank, raw_id = decode_cursor(cursor, 2)
+    try:
+        return float(raw_rank), uuid.UUID(raw_id)
+    except ValueError:
+        raise InvalidCursorException()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Converts an aware datetime to naive UTC, as timestamps are stored.
+    Naive datetimes are taken to be UTC already.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# This is a factory function that FastAPI will use for dependency injection.
+def get_pickup_service(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+) -> PickupService:
+    """
+    Factory for creating a PickupService instance with its dependencies.
+    """
+    return PickupService(PickupRepository(session, read_session))
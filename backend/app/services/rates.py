@@ -0,0 +1,239 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+from app.models.pickups import ServiceType, Zone
+from app.schemas.v1.rates import RateQuote, RateQuoteItem
+from app.services.serviceability import NOT_FOUND, ServiceabilityIndex, serviceability
+
+# --- Rate card ---
+# Volumetric weight (kg) = length x breadth x height (cm) / divisor.
+VOLUMETRIC_DIVISORS = {ServiceType.SURFACE: 4500, ServiceType.EXPRESS: 5000}
+# Chargeable weight is rounded up to whole slabs of this many grams.
+SLAB_GRAMS = {ServiceType.SURFACE: 500, ServiceType.EXPRESS: 500}
+# INR per shipment: (first slab, each additional slab).
+RATE_CARD = {
+    ServiceType.SURFACE: {
+        Zone.A: (30.0, 24.0),
+        Zone.B: (36.0, 30.0),
+        Zone.C: (42.0, 36.0),
+        Zone.D: (48.0, 42.0),
+        Zone.E: (64.0, 56.0),
+    },
+    ServiceType.EXPRESS: {
+        Zone.A: (40.0, 34.0),
+        Zone.B: (52.0, 44.0),
+        Zone.C: (62.0, 54.0),
+        Zone.D: (74.0, 66.0),
+        Zone.E: (96.0, 86.0),
+    },
+}
+
+# --- Zones ---
+# Zones come from the serviceability index (hub regions and metro/special
+# flags), the same as on /serviceability/routes. These pincode prefix rules
+# are only a fallback, for when no index is loaded or a pincode isn't in it.
+# Indian pincodes: the first two digits are the postal circle, the first
+# three the sorting district.
+METRO_DISTRICTS = (110, 400, 700, 600, 560, 500, 380, 411)
+# North East (78x, 79x) and Jammu & Kashmir / Ladakh (18x, 19x).
+SPECIAL_CIRCLES = (18, 19, 78, 79)
+# Sikkim, Andaman & Nicobar.
+SPECIAL_DISTRICTS = (737, 744)
+# ---
+
+SERVICE_TYPES = list(ServiceType)
+ZONES = list(Zone)
+SERVICE_CODES = {service_type: code for code, service_type in enumerate(SERVICE_TYPES)}
+
+# The rate card as arrays indexed by service type code (and zone code).
+_DIVISORS = np.array([VOLUMETRIC_DIVISORS[s] for s in SERVICE_TYPES], dtype=np.float64)
+_SLAB_GRAMS = np.array([SLAB_GRAMS[s] for s in SERVICE_TYPES], dtype=np.int64)
+_FIRST_SLAB = np.array([[RATE_CARD[s][z][0] for z in ZONES] for s in SERVICE_TYPES])
+_ADDITIONAL_SLAB = np.array([[RATE_CARD[s][z][1] for z in ZONES] for s in SERVICE_TYPES])
+_ZONE_CODES = {zone: code for code, zone in enumerate(ZONES)}
+
+
+@dataclass
+class QuoteBatch:
+    """
+    A batch of shipments as column arrays. Shipment columns have one entry
+    per shipment; package columns one per package, with `shipment` giving
+    the index of the package's shipment.
+    """
+
+    service_type: np.ndarray  # codes into SERVICE_TYPES
+    pickup_pincode: np.ndarray
+    delivery_pincode: np.ndarray
+
+    shipment: np.ndarray
+    length: np.ndarray
+    breadth: np.ndarray
+    height: np.ndarray
+    weight: np.ndarray
+    box_count: np.ndarray
+
+
+@dataclass
+class QuoteResult:
+    """
+    Quotes for a QuoteBatch, one entry per shipment.
+    """
+
+    zone: np.ndarray  # codes into ZONES
+    dead_weight_kg: np.ndarray
+    volumetric_weight_kg: np.ndarray
+    chargeable_weight_kg: np.ndarray
+    amount: np.ndarray
+
+
+def prefix_zones(pickup_pincode: np.ndarray, delivery_pincode: np.ndarray) -> np.ndarray:
+    """
+    Returns the zone code of each (pickup, delivery) pincode pair by the
+    pincode prefix rules. Later rules win: a delivery within the same city
+    is always zone A.
+    """
+    pickup_district, delivery_district = pickup_pincode // 1000, delivery_pincode // 1000
+    pickup_circle, delivery_circle = pickup_pincode // 10000, delivery_pincode // 10000
+
+    zone = np.full(len(pickup_pincode), _ZONE_CODES[Zone.D], dtype=np.int8)
+    zone[
+        np.isin(pickup_district, METRO_DISTRICTS) & np.isin(delivery_district, METRO_DISTRICTS)
+    ] = _ZONE_CODES[Zone.C]
+    zone[pickup_circle == delivery_circle] = _ZONE_CODES[Zone.B]
+    zone[
+        np.isin(pickup_circle, SPECIAL_CIRCLES)
+        | np.isin(delivery_circle, SPECIAL_CIRCLES)
+        | np.isin(pickup_district, SPECIAL_DISTRICTS)
+        | np.isin(delivery_district, SPECIAL_DISTRICTS)
+    ] = _ZONE_CODES[Zone.E]
+    zone[pickup_district == delivery_district] = _ZONE_CODES[Zone.A]
+    return zone
+
+
+def zones(
+    pickup_pincode: np.ndarray,
+    delivery_pincode: np.ndarray,
+    index: Optional[ServiceabilityIndex] = None,
+) -> np.ndarray:
+    """
+    Returns the zone code of each (pickup, delivery) pincode pair: from the
+    serviceability index where it has both pincodes, otherwise by the
+    prefix rules.
+    """
+    zone = prefix_zones(pickup_pincode, delivery_pincode)
+    if index is not None and len(index):
+        indexed = index.zones(pickup_pincode, delivery_pincode)
+        zone = np.where(indexed != NOT_FOUND, indexed, zone).astype(np.int8)
+    return zone
+
+
+def quote_batch(batch: QuoteBatch, index: Optional[ServiceabilityIndex] = None) -> QuoteResult:
+    """
+    Prices every shipment of a batch with array operations, with no
+    Python-level loop over shipments or packages:
+
+    - dead weight is the sum of weight x box_count of its packages, and
+      volumetric weight the sum of their volumes over the service type's
+      divisor;
+    - the larger of the two is rounded up to whole weight slabs (at least
+      one);
+    - the price is the zone's first-slab rate plus its additional-slab rate
+      for every further slab, with zones taken from `index` when given
+      (see zones()).
+    """
+    shipments = len(batch.service_type)
+    dead = np.bincount(
+        batch.shipment, weights=batch.weight * batch.box_count, minlength=shipments
+    )
+    volume = np.bincount(
+        batch.shipment,
+        weights=batch.length * batch.breadth * batch.height * batch.box_count,
+        minlength=shipments,
+    )
+    volumetric = volume / _DIVISORS[batch.service_type]
+
+    # Slabs are counted in whole grams, so float noise can't add a slab.
+    grams = np.rint(np.maximum(dead, volumetric) * 1000).astype(np.int64)
+    slab_grams = _SLAB_GRAMS[batch.service_type]
+    slabs = np.maximum(-(-grams // slab_grams), 1)
+
+    zone = zones(batch.pickup_pincode, batch.delivery_pincode, index)
+    amount = (
+        _FIRST_SLAB[batch.service_type, zone]
+        + (slabs - 1) * _ADDITIONAL_SLAB[batch.service_type, zone]
+    )
+    return QuoteResult(
+        zone=zone,
+        dead_weight_kg=np.round(dead, 3),
+        volumetric_weight_kg=np.round(volumetric, 3),
+        chargeable_weight_kg=slabs * slab_grams / 1000,
+        amount=np.round(amount, 2),
+    )
+
+
+def build_quote_batch(items: Sequence[RateQuoteItem]) -> QuoteBatch:
+    """
+    Lays out validated quote items as column arrays, in one pass over the
+    shipments and one over the packages.
+    """
+    shipments = np.array(
+        [
+            (
+                SERVICE_CODES[item.service_type],
+                int(item.pickup_pincode),
+                int(item.delivery_pincode),
+                len(item.packages),
+            )
+            for item in items
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 4)
+    packages = np.array(
+        [
+            (package.length, package.breadth, package.height, package.weight, package.box_count)
+            for item in items
+            for package in item.packages
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 5)
+    return QuoteBatch(
+        service_type=shipments[:, 0],
+        pickup_pincode=shipments[:, 1],
+        delivery_pincode=shipments[:, 2],
+        shipment=np.repeat(np.arange(len(shipments)), shipments[:, 3]),
+        length=packages[:, 0],
+        breadth=packages[:, 1],
+        height=packages[:, 2],
+        weight=packages[:, 3],
+        box_count=packages[:, 4],
+    )
+
+
+def quote_items(items: Sequence[RateQuoteItem]) -> list[RateQuote]:
+    """
+    Quotes a batch of shipments, one quote per item in the same order.
+    Zones come from the loaded serviceability index, if any.
+    """
+    result = quote_batch(build_quote_batch(items), serviceability.index)
+    return [
+        RateQuote(
+            index=index,
+            reference=item.reference,
+            zone=ZONES[zone],
+            dead_weight_kg=dead,
+            volumetric_weight_kg=volumetric,
+            chargeable_weight_kg=chargeable,
+            amount=amount,
+        )
+        for index, (item, zone, dead, volumetric, chargeable, amount) in enumerate(
+            zip(
+                items,
+                result.zone.tolist(),
+                result.dead_weight_kg.tolist(),
+                result.volumetric_weight_kg.tolist(),
+                result.chargeable_weight_kg.tolist(),
+                result.amount.tolist(),
+            )
+        )
+    ]
@@ -0,0 +1,493 @@
+import asyncio
+import csv
+import io
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Sequence
+
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, registry
+from app.exceptions.definitions import ServiceabilityUnavailableException
+from app.models.pickups import PaymentMode, ServiceType, Zone
+from app.schemas.v1.pickups import PickupCreate
+from app.schemas.v1.serviceability import (
+    PincodeServiceability,
+    RouteServiceability,
+    RouteServiceabilityQuery,
+    ServiceabilityIssue,
+)
+
+logger = logging.getLogger(__name__)
+
+# --- Source file ---
+# A CSV with a header line and one row per serviceable pincode:
+#
+#     pincode,hub,region,metro,special,cod,express
+#     110001,DEL-01,DL,1,0,1,1
+#
+# `hub` is the delivery hub serving the pincode; `region` (usually the
+# state) and the metro/special flags describe the hub, so they must be the
+# same on every row of a hub. `cod` and `express` say whether the pincode
+# takes cash on delivery and express shipments. Booleans are 1/0,
+# true/false or yes/no.
+#
+# The file is watched for changes; replace it by renaming a complete file
+# over it, so a half-written file is never picked up.
+SOURCE_COLUMNS = ("pincode", "hub", "region", "metro", "special", "cod", "express")
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"0", "false", "no", "n", ""}
+
+# --- SLA ---
+# Days from pickup to delivery, by service type and zone.
+SLA_DAYS = {
+    ServiceType.SURFACE: {Zone.A: 1, Zone.B: 2, Zone.C: 3, Zone.D: 5, Zone.E: 7},
+    ServiceType.EXPRESS: {Zone.A: 1, Zone.B: 1, Zone.C: 2, Zone.D: 3, Zone.E: 4},
+}
+# ---
+
+SERVICE_TYPES = list(ServiceType)
+ZONES = list(Zone)
+ISSUES = list(ServiceabilityIssue)
+SERVICE_CODES = {service_type: code for code, service_type in enumerate(SERVICE_TYPES)}
+_ZONE_CODES = {zone: code for code, zone in enumerate(ZONES)}
+_ISSUE_CODES = {issue: code for code, issue in enumerate(ISSUES)}
+_SLA_DAYS = np.array([[SLA_DAYS[s][z] for z in ZONES] for s in SERVICE_TYPES], dtype=np.int16)
+
+# Bits of ServiceabilityIndex.flags.
+COD = 1
+EXPRESS = 2
+
+# Returned for pincodes that aren't in the index.
+NOT_FOUND = -1
+
+
+class ServiceabilityFileError(ValueError):
+    """
+    Raised when the serviceability file can't be read as a pincode table.
+    """
+
+
+@dataclass(frozen=True)
+class RouteCheck:
+    """
+    Serviceability of a batch of routes as column arrays, one entry per
+    route. `zone` and `sla_days` are -1 where the route isn't serviceable.
+    """
+
+    serviceable: np.ndarray
+    issue: np.ndarray  # codes into ISSUES, -1 for none
+    zone: np.ndarray  # codes into ZONES
+    sla_days: np.ndarray
+
+
+@dataclass(frozen=True)
+class ServiceabilityIndex:
+    """
+    An immutable, in-memory pincode table. Pincodes are kept as one sorted
+    int32 array with parallel per-pincode columns, so a lookup is a binary
+    search and a batch of lookups a single np.searchsorted call.
+
+    Zones come from a precomputed matrix over hub classes (a class being a
+    region with its metro/special flags), with pickups and deliveries
+    served by the same hub always in zone A.
+    """
+
+    pincodes: np.ndarray  # int32, sorted
+    hub: np.ndarray  # int32 codes into hubs, per pincode
+    flags: np.ndarray  # uint8 COD/EXPRESS bits, per pincode
+    hub_class: np.ndarray  # int32 codes into the zone matrix, per hub
+    zone_matrix: np.ndarray  # int8 zone codes, [origin class, destination class]
+    hubs: tuple[str, ...]
+    hub_regions: tuple[str, ...]
+    loaded_at: datetime
+
+    def __len__(self) -> int:
+        return len(self.pincodes)
+
+    def locate(self, pincodes: np.ndarray) -> np.ndarray:
+        """
+        Returns the row of each pincode, or NOT_FOUND.
+        """
+        rows = np.searchsorted(self.pincodes, pincodes)
+        rows = np.minimum(rows, len(self.pincodes) - 1)
+        return np.where(self.pincodes[rows] == pincodes, rows, NOT_FOUND)
+
+    def locate_one(self, pincode: int) -> int:
+        row = int(np.searchsorted(self.pincodes, pincode))
+        if row < len(self.pincodes) and self.pincodes[row] == pincode:
+            return row
+        return NOT_FOUND
+
+    def check_routes(
+        self,
+        origin: np.ndarray,
+        destination: np.ndarray,
+        service_type: np.ndarray,
+        cod: np.ndarray,
+    ) -> RouteCheck:
+        """
+        Checks a batch of routes. The first issue found is reported: an
+        unknown origin, then an unknown destination, then express or COD
+        not being available at either end (COD at the destination only).
+        """
+        origin_row = self.locate(origin)
+        destination_row = self.locate(destination)
+        origin_found = origin_row != NOT_FOUND
+        destination_found = destination_row != NOT_FOUND
+        origin_flags = np.where(origin_found, self.flags[origin_row], 0)
+        destination_flags = np.where(destination_found, self.flags[destination_row], 0)
+
+        # Later rules win, so the first issue is written last.
+        issue = np.full(len(origin), NOT_FOUND, dtype=np.int8)
+        issue[cod & ((destination_flags & COD) == 0)] = _ISSUE_CODES[
+            ServiceabilityIssue.COD_NOT_AVAILABLE
+        ]
+        issue[
+            (service_type == SERVICE_CODES[ServiceType.EXPRESS])
+            & ((origin_flags & destination_flags & EXPRESS) == 0)
+        ] = _ISSUE_CODES[ServiceabilityIssue.EXPRESS_NOT_AVAILABLE]
+        issue[~destination_found] = _ISSUE_CODES[ServiceabilityIssue.DESTINATION_NOT_SERVICEABLE]
+        issue[~origin_found] = _ISSUE_CODES[ServiceabilityIssue.ORIGIN_NOT_SERVICEABLE]
+        serviceable = issue == NOT_FOUND
+
+        zone = self._zones(origin_row, destination_row)
+        zone[~serviceable] = NOT_FOUND
+        sla_days = np.where(serviceable, _SLA_DAYS[service_type, zone], NOT_FOUND)
+        return RouteCheck(serviceable=serviceable, issue=issue, zone=zone, sla_days=sla_days)
+
+    def zones(self, origin: np.ndarray, destination: np.ndarray) -> np.ndarray:
+        """
+        Returns the zone code of each (origin, destination) pincode pair,
+        whether or not the route is serviceable, and NOT_FOUND where either
+        pincode isn't in the index. Rate quotes price by these zones.
+        """
+        origin_row = self.locate(origin)
+        destination_row = self.locate(destination)
+        zone = self._zones(origin_row, destination_row)
+        zone[(origin_row == NOT_FOUND) | (destination_row == NOT_FOUND)] = NOT_FOUND
+        return zone
+
+    def _zones(self, origin_row: np.ndarray, destination_row: np.ndarray) -> np.ndarray:
+        origin_hub = self.hub[origin_row]
+        destination_hub = self.hub[destination_row]
+        return np.where(
+            origin_hub == destination_hub,
+            _ZONE_CODES[Zone.A],
+            self.zone_matrix[self.hub_class[origin_hub], self.hub_class[destination_hub]],
+        ).astype(np.int8)
+
+    def pincode(self, pincode: str) -> PincodeServiceability:
+        row = self.locate_one(_pincode_number(pincode))
+        if row == NOT_FOUND:
+            return PincodeServiceability(pincode=pincode, serviceable=False)
+        hub = int(self.hub[row])
+        flags = int(self.flags[row])
+        return PincodeServiceability(
+            pincode=pincode,
+            serviceable=True,
+            hub=self.hubs[hub],
+            region=self.hub_regions[hub],
+            cod_available=bool(flags & COD),
+            express_available=bool(flags & EXPRESS),
+        )
+
+    def routes(self, queries: Sequence[RouteServiceabilityQuery]) -> list[RouteServiceability]:
+        """
+        Checks routes given as API queries, one result per query in order.
+        """
+        check = self.check_routes(
+            np.array([_pincode_number(q.origin_pincode) for q in queries], dtype=np.int64),
+            np.array([_pincode_number(q.destination_pincode) for q in queries], dtype=np.int64),
+            np.array([SERVICE_CODES[q.service_type] for q in queries], dtype=np.int64),
+            np.array([q.cod for q in queries], dtype=bool),
+        )
+        return [
+            RouteServiceability(
+                index=index,
+                origin_pincode=query.origin_pincode,
+                destination_pincode=query.destination_pincode,
+                service_type=query.service_type,
+                serviceable=serviceable,
+                zone=ZONES[zone] if serviceable else None,
+                sla_days=sla_days if serviceable else None,
+                issue=ISSUES[issue] if not serviceable else None,
+            )
+            for index, (query, serviceable, issue, zone, sla_days) in enumerate(
+                zip(
+                    queries,
+                    check.serviceable.tolist(),
+                    check.issue.tolist(),
+                    check.zone.tolist(),
+                    check.sla_days.tolist(),
+                )
+            )
+        ]
+
+
+def _pincode_number(pincode: str) -> int:
+    """
+    Returns the pincode as an int, or NOT_FOUND if it isn't a number
+    (addresses accept non-Indian postcodes, which are never serviceable).
+    str.isdigit() alone also accepts digits int() rejects, such as "²".
+    """
+    return int(pincode) if pincode.isascii() and pincode.isdigit() else NOT_FOUND
+
+
+def _flag(value: str, line: int, column: str) -> bool:
+    value = value.strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ServiceabilityFileError(f"Line {line}: {column} must be a boolean, got {value!r}")
+
+
+def _zone_matrix(classes: list[tuple[str, bool, bool]]) -> np.ndarray:
+    """
+    The zone between hubs of every two classes, by the same rules as the
+    rate card (later rules win): zone D by default, C between metros, B
+    within a region, E to or from special regions.
+    """
+    region = np.array([c[0] for c in classes])
+    metro = np.array([c[1] for c in classes])
+    special = np.array([c[2] for c in classes])
+
+    matrix = np.full((len(classes), len(classes)), _ZONE_CODES[Zone.D], dtype=np.int8)
+    matrix[np.outer(metro, metro)] = _ZONE_CODES[Zone.C]
+    matrix[region[:, None] == region[None, :]] = _ZONE_CODES[Zone.B]
+    matrix[special[:, None] | special[None, :]] = _ZONE_CODES[Zone.E]
+    return matrix
+
+
+def build_index(data: bytes) -> ServiceabilityIndex:
+    """
+    Compiles the contents of a serviceability file into an index.
+    Raises ServiceabilityFileError if the file is invalid.
+    """
+    try:
+        reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig")))
+        missing = set(SOURCE_COLUMNS) - {name.strip() for name in reader.fieldnames or ()}
+        if missing:
+            raise ServiceabilityFileError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        pincodes: list[int] = []
+        hub_codes: list[int] = []
+        flags: list[int] = []
+        hubs: dict[str, int] = {}
+        hub_classes: list[tuple[str, bool, bool]] = []
+        for line, row in enumerate(reader, start=2):
+            row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            if not (row["pincode"].isdigit() and len(row["pincode"]) == 6):
+                raise ServiceabilityFileError(f"Line {line}: invalid pincode {row['pincode']!r}")
+            if not row["hub"]:
+                raise ServiceabilityFileError(f"Line {line}: hub is empty")
+            hub_class = (
+                row["region"],
+                _flag(row["metro"], line, "metro"),
+                _flag(row["special"], line, "special"),
+            )
+            hub = hubs.setdefault(row["hub"], len(hubs))
+            if hub == len(hub_classes):
+                hub_classes.append(hub_class)
+            elif hub_classes[hub] != hub_class:
+                raise ServiceabilityFileError(
+                    f"Line {line}: region/metro/special differ from earlier rows of hub {row['hub']}"
+                )
+            pincodes.append(int(row["pincode"]))
+            hub_codes.append(hub)
+            flags.append(
+                (COD if _flag(row["cod"], line, "cod") else 0)
+                | (EXPRESS if _flag(row["express"], line, "express") else 0)
+            )
+    except UnicodeDecodeError:
+        raise ServiceabilityFileError("The file must be a UTF-8 encoded CSV file.")
+    except csv.Error as e:
+        raise ServiceabilityFileError(f"Invalid CSV: {e}")
+
+    if not pincodes:
+        raise ServiceabilityFileError("The file has no pincodes.")
+
+    order = np.argsort(np.array(pincodes, dtype=np.int32), kind="stable")
+    sorted_pincodes = np.array(pincodes, dtype=np.int32)[order]
+    duplicates = sorted_pincodes[1:][sorted_pincodes[1:] == sorted_pincodes[:-1]]
+    if len(duplicates):
+        raise ServiceabilityFileError(f"Pincode {duplicates[0]} is listed more than once.")
+
+    classes = sorted(set(hub_classes))
+    class_codes = {hub_class: code for code, hub_class in enumerate(classes)}
+    return ServiceabilityIndex(
+        pincodes=sorted_pincodes,
+        hub=np.array(hub_codes, dtype=np.int32)[order],
+        flags=np.array(flags, dtype=np.uint8)[order],
+        hub_class=np.array([class_codes[c] for c in hub_classes], dtype=np.int32),
+        zone_matrix=_zone_matrix(classes),
+        hubs=tuple(hubs),
+        hub_regions=tuple(c[0] for c in hub_classes),
+        loaded_at=datetime.utcnow(),
+    )
+
+
+def _file_signature(path: str) -> tuple[int, int, int]:
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _read_file(path: str) -> tuple[tuple[int, int, int], bytes]:
+    """
+    Reads the file with its signature. Raises ServiceabilityFileError if
+    the file changed while it was read.
+    """
+    signature = _file_signature(path)
+    with open(path, "rb") as file:
+        data = file.read()
+    if _file_signature(path) != signature:
+        raise ServiceabilityFileError("The file changed while it was read.")
+    return signature, data
+
+
+class ServiceabilityRegistry:
+    """
+    Holds the current ServiceabilityIndex and replaces it when its source
+    file changes. A new index is built off the event loop and swapped in
+    with a single reference assignment; callers take `index` once per
+    request, so every lookup sees one complete table. If the new file is
+    invalid, the previous index stays in use.
+    """
+
+    def __init__(self, *, path: str, reload_interval: float):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._index: Optional[ServiceabilityIndex] = None
+        self._signature: Optional[tuple[int, int, int]] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def index(self) -> Optional[ServiceabilityIndex]:
+        return self._index
+
+    def require_index(self) -> ServiceabilityIndex:
+        """
+        Returns the current index.
+        Raises ServiceabilityUnavailableException if none is loaded.
+        """
+        index = self._index
+        if index is None:
+            raise ServiceabilityUnavailableException()
+        return index
+
+    def _load(self) -> bool:
+        """
+        Builds a new index if the file changed since the last load.
+        Returns whether the index was replaced.
+        """
+        try:
+            if _file_signature(self.path) == self._signature:
+                return False
+            signature, data = _read_file(self.path)
+        except (OSError, ServiceabilityFileError) as e:
+            serviceability_reloads_total.inc(("error",))
+            logger.error("Failed to read serviceability file %s: %s", self.path, e)
+            return False
+        # An invalid file is only reported once, until it changes again.
+        self._signature = signature
+        try:
+            index = build_index(data)
+        except ServiceabilityFileError as e:
+            serviceability_reloads_total.inc(("error",))
+            logger.error("Invalid serviceability file %s: %s", self.path, e)
+            return False
+        self._index = index
+        serviceability_reloads_total.inc(("loaded",))
+        logger.info(
+            "Loaded %d serviceable pincodes in %d hubs from %s",
+            len(index),
+            len(index.hubs),
+            self.path,
+        )
+        return True
+
+    async def reload(self) -> bool:
+        return await asyncio.to_thread(self._load)
+
+    def start(self) -> None:
+        """
+        Loads the file, so the first requests already see it, and starts
+        watching it for changes.
+        """
+        if not self.enabled:
+            return
+        self._load()
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watcher:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self.reload()
+
+    def check_pickups(self, items: Sequence[tuple[int, PickupCreate]]) -> dict[int, list[str]]:
+        """
+        Checks the routes of a batch of pickups in one lookup, returning
+        an error for each (index, pickup) that can't be served. Every
+        pickup passes while no index is loaded.
+        """
+        index = self._index
+        if index is None or not items:
+            return {}
+        check = index.check_routes(
+            np.array([_pincode_number(p.pickup_address.pincode) for _, p in items], dtype=np.int64),
+            np.array([_pincode_number(p.delivery_address.pincode) for _, p in items], dtype=np.int64),
+            np.array([SERVICE_CODES[p.service_type] for _, p in items], dtype=np.int64),
+            np.array(
+                [p.payment is not None and p.payment.payment_mode == PaymentMode.COD for _, p in items],
+                dtype=bool,
+            ),
+        )
+        return {
+            items[i][0]: [_ISSUE_MESSAGES[ISSUES[check.issue[i]]]]
+            for i in np.flatnonzero(~check.serviceable).tolist()
+        }
+
+
+_ISSUE_MESSAGES = {
+    ServiceabilityIssue.ORIGIN_NOT_SERVICEABLE: "pickup_address.pincode: Pincode is not serviceable",
+    ServiceabilityIssue.DESTINATION_NOT_SERVICEABLE: "delivery_address.pincode: Pincode is not serviceable",
+    ServiceabilityIssue.EXPRESS_NOT_AVAILABLE: "service_type: EXPRESS is not available on this route",
+    ServiceabilityIssue.COD_NOT_AVAILABLE: "payment.payment_mode: COD is not available at the delivery pincode",
+}
+
+
+serviceability = ServiceabilityRegistry(
+    path=settings.SERVICEABILITY_FILE,
+    reload_interval=settings.SERVICEABILITY_RELOAD_INTERVAL_SECONDS,
+)
+
+
+# --- Metrics ---
+
+serviceability_reloads_total = registry.register(
+    Counter(
+        "serviceability_reloads_total",
+        "Serviceability file loads, by result.",
+        ("result",),
+    )
+)
+registry.register(
+    Gauge(
+        "serviceability_pincodes",
+        "Serviceable pincodes in the loaded index.",
+        collect=lambda: [((), len(serviceability.index or ()))],
+    )
+)
@@ -1,6 +1,8 @@
 import uuid
+from typing import AsyncIterator, Optional
 
-from app.core.db import get_session
+from app.core.db import get_read_session, get_session
+from app.core.pagination import decode_id_cursor, paginate
 from app.core.security import TokenPayload
 from app.exceptions.definitions import TenantNotFoundException
 from app.models.tenants import Tenant, User, UserRole
@@ -24,16 +26,9 @@ class TenantService:
         """
         Gets a user profile if it exists, or creates a new one if it does not.
         This is the core "Just-in-Time" provisioning logic.
+        It is a single upsert, so repeated or concurrent onboarding calls for
+        the same user return the same profile instead of failing.
         """
-        # Use the repository to find the user
-        user = await self.tenant_repo.get_user_by_supabase_id_and_tenant_id(
-            supabase_user_id=token_data.sub, tenant_id=tenant.id
-        )
-
-        if user:
-            return user
-
-        # If user does not exist, create a new user profile
         new_user = User(
             email=token_data.email,
             supabase_user_id=token_data.sub,
@@ -41,30 +36,65 @@ class TenantService:
             role=UserRole.customer,  # New users default to 'customer'
             is_active=True,
         )
-        # Use the repository to save the new user
-        return await self.tenant_repo.create_user(new_user)
+        # Use the repository to insert the user, or fetch the existing profile
+        return await self.tenant_repo.upsert_user(new_user)
+
+    async def list_tenants(
+        self, *, limit: int, cursor: Optional[str] = None
+    ) -> tuple[list[Tenant], Optional[str]]:
+        """
+        Retrieves one page of tenants and the cursor for the next page.
+        """
+        tenants = await self.tenant_repo.list_tenants(
+            limit=limit + 1, after_id=decode_id_cursor(cursor)
+        )
+        return paginate(tenants, limit, key=lambda t: (t.id,))
 
-    async def list_tenants(self) -> list[Tenant]:
+    def stream_tenants(self, *, cursor: Optional[str] = None) -> AsyncIterator[Tenant]:
         """
-        Retrieves all tenants from the repository.
+        Streams all tenants, starting after the given cursor.
         """
-        return await self.tenant_repo.list_tenants()
+        return self.tenant_repo.stream_tenants(after_id=decode_id_cursor(cursor))
 
-    async def list_users_for_tenant(self, tenant_id: uuid.UUID) -> list[User]:
+    async def list_users_for_tenant(
+        self, *, tenant_id: uuid.UUID, limit: int, cursor: Optional[str] = None
+    ) -> tuple[list[User], Optional[str]]:
         """
-        Retrieves all users for a specific tenant.
+        Retrieves one page of users for a specific tenant
+        and the cursor for the next page.
         """
+        await self._ensure_tenant_exists(tenant_id)
+        users = await self.tenant_repo.list_users_for_tenant(
+            tenant_id=tenant_id, limit=limit + 1, after_id=decode_id_cursor(cursor)
+        )
+        return paginate(users, limit, key=lambda u: (u.id,))
+
+    async def stream_users_for_tenant(
+        self, *, tenant_id: uuid.UUID, cursor: Optional[str] = None
+    ) -> AsyncIterator[User]:
+        """
+        Streams all users for a specific tenant, starting after the given cursor.
+        The tenant is checked before streaming starts, so a 404 can still be sent.
+        """
+        await self._ensure_tenant_exists(tenant_id)
+        return self.tenant_repo.stream_users_for_tenant(
+            tenant_id=tenant_id, after_id=decode_id_cursor(cursor)
+        )
+
+    async def _ensure_tenant_exists(self, tenant_id: uuid.UUID) -> None:
         tenant = await self.tenant_repo.get_tenant_by_id(tenant_id)
         if not tenant:
             raise TenantNotFoundException()
-        return await self.tenant_repo.list_users_for_tenant(tenant_id=tenant_id)
 
 
 # This is a factory function that FastAPI will use for dependency injection.
 # It creates a TenantRepository with a session and then creates our service.
-def get_tenant_service(session: AsyncSession = Depends(get_session)) -> TenantService:
+def get_tenant_service(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+) -> TenantService:
     """
     Factory for creating a TenantService instance with its dependencies.
     """
-    tenant_repo = TenantRepository(session)
+    tenant_repo = TenantRepository(session, read_session)
     return TenantService(tenant_repo)
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.repositories.pickups import PickupRepository
+from app.services.pickups import PickupService
+from sqlalchemy import text
+
+# --- Configuration ---
+TOTAL_PICKUPS = 20000
+# Target from the bulk upload requirements.
+TARGET_PICKUPS_PER_SECOND = 5000
+# ---
+
+CITIES = [("Mumbai", "MH", "400001"), ("Pune", "MH", "411001"), ("Delhi", "DL", "110001")]
+
+
+def make_address(i: int) -> dict:
+    city, state, pincode = random.choice(CITIES)
+    return {
+        "name": f"Consignee {i}",
+        "phone": f"98{i:08d}"[:10],
+        "address_line1": f"{i} Bench Street",
+        "city": city,
+        "state": state,
+        "pincode": pincode,
+    }
+
+
+def make_pickup(i: int) -> dict:
+    return {
+        "order_reference_id": f"BENCH-{i}",
+        "requested_pickup_date": (date.today() + timedelta(days=1)).isoformat(),
+        "pickup_address": make_address(i),
+        "delivery_address": make_address(i + 1),
+        "packages": [{"length": 30, "breadth": 20, "height": 10, "weight": 1.5}],
+        "payment": {"amount": 499.0, "payment_mode": "COD", "declared_value": 499.0},
+    }
+
+
+async def cleanup(tenant_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        params = {"tenant_id": tenant_id}
+        pickup_ids = "SELECT id FROM pickups WHERE tenant_id = :tenant_id"
+        await session.exec(text(f"DELETE FROM package_details WHERE pickup_id IN ({pickup_ids})"), params=params)  # type: ignore
+        await session.exec(text(f"DELETE FROM payment_details WHERE pickup_id IN ({pickup_ids})"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM pickups WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM addresses WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM tenant_pickup_daily_stats WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.commit()
+
+
+async def run_benchmark() -> None:
+    tenant_id, user_id = uuid.uuid4(), uuid.uuid4()
+    items = [make_pickup(i) for i in range(TOTAL_PICKUPS)]
+    print(
+        f"Creating {TOTAL_PICKUPS} pickups "
+        f"(chunk size {settings.PICKUP_BULK_CHUNK_SIZE}, "
+        f"max {settings.PICKUP_BULK_MAX_ITEMS} per request)..."
+    )
+
+    try:
+        start = time.perf_counter()
+        created = 0
+        async with AsyncSessionLocal() as session:  # type: ignore
+            service = PickupService(PickupRepository(session))
+            for offset in range(0, TOTAL_PICKUPS, settings.PICKUP_BULK_MAX_ITEMS):
+                response = await service.bulk_create_pickups(
+                    items=items[offset : offset + settings.PICKUP_BULK_MAX_ITEMS],
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                )
+                created += response.created
+        elapsed = time.perf_counter() - start
+    finally:
+        await cleanup(tenant_id)
+
+    rate = created / elapsed
+    print(f"Created {created} pickups in {elapsed:.2f}s: {rate:,.0f} pickups/s")
+    print("✅ target met" if rate >= TARGET_PICKUPS_PER_SECOND else "❌ below target")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,233 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, get_session
+from app.core.dependencies import get_current_active_user
+from app.core.storage import LocalStorage
+from app.main import app
+from app.models.tenants import User, UserRole
+from app.repositories.pickup_documents import PickupDocumentRepository
+from app.services.pickup_documents import PickupDocumentService, get_pickup_document_service
+from fastapi import Depends
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- Configuration ---
+UPLOADS = 200
+CONCURRENCY = 50
+FILE_SIZE = 2 * 1024 * 1024
+# Size of the body chunks the "client" sends, like a socket read.
+CHUNK_SIZE = 64 * 1024
+# Target throughput for distinct files written to local storage.
+TARGET_MB_PER_SECOND = 100
+# ---
+
+
+async def seed(tenant_id: uuid.UUID) -> uuid.UUID:
+    """
+    Creates one pickup for the tenant to attach the documents to.
+    """
+    pickup_id = uuid.uuid4()
+    address_id = uuid.uuid4()
+    params = {"tenant_id": tenant_id, "pickup_id": pickup_id, "address_id": address_id}
+    async with AsyncSessionLocal() as session:  # type: ignore
+        await session.exec(  # type: ignore
+            text(
+                """
+                INSERT INTO addresses (id, tenant_id, name, phone, address_line1, city, state, pincode, country)
+                VALUES (:address_id, :tenant_id, 'Bench', '9000000000', '1 Upload Street', 'Pune', 'MH', '411001', 'IN')
+                """
+            ),
+            params=params,
+        )
+        await session.exec(  # type: ignore
+            text(
+                """
+                INSERT INTO pickups (
+                    id, tenant_id, created_by_user_id, order_reference_id,
+                    shipment_type, service_type, status, requested_pickup_date,
+                    pickup_address_id, delivery_address_id, version, created_at, updated_at
+                )
+                VALUES (
+                    :pickup_id, :tenant_id, :tenant_id, 'ORD-UPLOAD-BENCH',
+                    'FORWARD', 'SURFACE', 'OPEN', current_date,
+                    :address_id, :address_id, 1, now(), now()
+                )
+                """
+            ),
+            params=params,
+        )
+        await session.commit()
+    return pickup_id
+
+
+async def cleanup(tenant_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        params = {"tenant_id": tenant_id}
+        await session.exec(  # type: ignore
+            text(
+                "DELETE FROM pickup_documents WHERE pickup_id IN "
+                "(SELECT id FROM pickups WHERE tenant_id = :tenant_id)"
+            ),
+            params=params,
+        )
+        for table in ("document_blobs", "pickups", "addresses"):
+            await session.exec(text(f"DELETE FROM {table} WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.commit()
+
+
+async def count_blobs(tenant_id: uuid.UUID) -> int:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        result = await session.exec(  # type: ignore
+            text("SELECT count(*) FROM document_blobs WHERE tenant_id = :tenant_id"),
+            params={"tenant_id": tenant_id},
+        )
+        return result.scalar_one()
+
+
+async def upload(pickup_id: uuid.UUID, content: bytes, *, send_length: bool = True) -> int:
+    """
+    Calls the upload endpoint directly through ASGI, sending the body in
+    CHUNK_SIZE pieces as a server would (httpx's ASGITransport would send
+    it in one piece). Returns the HTTP status.
+    """
+    status = 0
+    chunks = [content[i : i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)] or [b""]
+    sent = 0
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal sent
+        if sent < len(chunks):
+            sent += 1
+            return {"type": "http.request", "body": chunks[sent - 1], "more_body": sent < len(chunks)}
+        # The client stays connected until the response has arrived.
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            finished.set()
+
+    path = f"/api/v1/pickups/{pickup_id}/documents"
+    headers = [(b"host", b"bench"), (b"content-type", b"application/octet-stream")]
+    if send_length:
+        headers.append((b"content-length", str(len(content)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 12345),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"document_type=BOX_PHOTO&file_name=photo.jpg",
+        "headers": headers,
+    }
+    await app(scope, receive, send)
+    return status
+
+
+async def upload_all(pickup_id: uuid.UUID, files: list[bytes]) -> tuple[list[int], float]:
+    """
+    Uploads the files with at most CONCURRENCY in flight.
+    Returns their statuses and the elapsed time.
+    """
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(content: bytes) -> int:
+        async with semaphore:
+            return await upload(pickup_id, content)
+
+    start = time.perf_counter()
+    statuses = await asyncio.gather(*(one(content) for content in files))
+    return list(statuses), time.perf_counter() - start
+
+
+def stored_files(root: str) -> int:
+    return sum(len(files) for _, _, files in os.walk(root))
+
+
+async def run_benchmark() -> bool:
+    tenant_id = uuid.uuid4()
+    root = tempfile.mkdtemp(prefix="naviera-bench-documents-")
+    storage = LocalStorage(root)
+
+    def get_service(session: AsyncSession = Depends(get_session)) -> PickupDocumentService:
+        return PickupDocumentService(PickupDocumentRepository(session), storage)
+
+    app.dependency_overrides[get_pickup_document_service] = get_service
+    app.dependency_overrides[get_current_active_user] = lambda: User(
+        id=uuid.uuid4(),
+        supabase_user_id=str(uuid.uuid4()),
+        email="upload-bench@naviera.com",
+        role=UserRole.customer,
+        tenant_id=tenant_id,
+    )
+
+    passed = True
+    try:
+        pickup_id = await seed(tenant_id)
+        total_mb = UPLOADS * FILE_SIZE / 2**20
+
+        print(f"--- {UPLOADS} distinct {FILE_SIZE / 2**20:.0f} MiB files, {CONCURRENCY} at a time ---")
+        statuses, seconds = await upload_all(
+            pickup_id, [os.urandom(FILE_SIZE) for _ in range(UPLOADS)]
+        )
+        ok = statuses.count(201) == UPLOADS and await count_blobs(tenant_id) == UPLOADS
+        ok &= total_mb / seconds >= TARGET_MB_PER_SECOND
+        passed &= ok
+        print(
+            f"{'✅' if ok else '❌'} {statuses.count(201)}/{UPLOADS} stored in {seconds:.2f}s: "
+            f"{total_mb / seconds:,.0f} MiB/s, {UPLOADS / seconds:,.0f} uploads/s"
+        )
+
+        print(f"--- {UPLOADS} identical files, {CONCURRENCY} at a time ---")
+        files_before = stored_files(root)
+        statuses, seconds = await upload_all(pickup_id, [b"same" * (FILE_SIZE // 4)] * UPLOADS)
+        new_files = stored_files(root) - files_before
+        ok = statuses.count(201) == UPLOADS and new_files == 1
+        passed &= ok
+        print(
+            f"{'✅' if ok else '❌'} {statuses.count(201)}/{UPLOADS} stored in {seconds:.2f}s "
+            f"as {new_files} file(s): {UPLOADS / seconds:,.0f} uploads/s"
+        )
+
+        print(f"--- Files over DOCUMENT_MAX_BYTES ({settings.DOCUMENT_MAX_BYTES / 2**20:.0f} MiB) ---")
+        files_before = stored_files(root)
+        too_large = b"x" * (settings.DOCUMENT_MAX_BYTES + 1)
+        declared = await upload(pickup_id, too_large)
+        streamed = await upload(pickup_id, too_large, send_length=False)
+        ok = declared == streamed == 413 and stored_files(root) == files_before
+        passed &= ok
+        print(
+            f"{'✅' if ok else '❌'} HTTP {declared} with Content-Length, "
+            f"HTTP {streamed} without, nothing left in storage"
+        )
+    finally:
+        app.dependency_overrides.clear()
+        await cleanup(tenant_id)
+        shutil.rmtree(root, ignore_errors=True)
+    return passed
+
+
+def main():
+    passed = asyncio.run(run_benchmark())
+    print("✅ All upload checks passed" if passed else "❌ FAILED")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
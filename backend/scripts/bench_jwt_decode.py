@@ -0,0 +1,57 @@
+import time
+import timeit
+import uuid
+
+from app.core.cache import jwt_cache
+from app.core.config import settings
+from app.core.security import decode_access_token
+from jose import jwt
+
+# --- Configuration ---
+ITERATIONS = 20000
+# ---
+
+
+def make_token() -> str:
+    """Builds a token shaped like the ones Supabase issues."""
+    claims = {
+        "sub": str(uuid.uuid4()),
+        "email": "bench@naviera.com",
+        "aud": "authenticated",
+        "iss": settings.JWT_ISSUER,
+        "exp": int(time.time()) + 3600,
+    }
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def bench_cold(token: str) -> float:
+    """Every decode misses the cache and runs full verification."""
+
+    def run():
+        jwt_cache.clear()
+        decode_access_token(token)
+
+    return timeit.timeit(run, number=ITERATIONS)
+
+
+def bench_warm(token: str) -> float:
+    """Every decode after the first is served from the cache."""
+    jwt_cache.clear()
+    decode_access_token(token)
+    return timeit.timeit(lambda: decode_access_token(token), number=ITERATIONS)
+
+
+def main():
+    token = make_token()
+    cold = bench_cold(token)
+    warm = bench_warm(token)
+
+    print(f"--- decode_access_token x {ITERATIONS} ---")
+    print(f"cold: {ITERATIONS / cold:>12,.0f} decodes/s ({cold / ITERATIONS * 1e6:.1f}us each)")
+    print(f"warm: {ITERATIONS / warm:>12,.0f} decodes/s ({warm / ITERATIONS * 1e6:.1f}us each)")
+    print(f"speedup: {cold / warm:.1f}x")
+    print(f"cache stats: {jwt_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from datetime import time as clock
+
+import numpy as np
+from app.core.config import settings
+from app.repositories.pickup_assignments import PickupAssignmentRepository
+from app.repositories.pickups import PickupRepository
+from app.schemas.v1.pickups import RiderShift, UnassignedReason
+from app.services.pickup_assignments import (
+    NONE,
+    AssignmentBatch,
+    PickupAssignmentService,
+    Rider,
+    RouteTimes,
+    plan_assignments,
+)
+
+# Plans a day's assignment run over synthetic OPEN pickups, checks every
+# route against its rider's limits, and times the solver and the whole
+# service (as a dry run, so no database is needed).
+
+# --- Configuration ---
+PICKUPS = 50_000
+CITIES = 25
+PINCODES_PER_CITY = 60
+# Share of pickups coming from a few large shippers' warehouses.
+WAREHOUSE_SHARE = 0.4
+WAREHOUSES_PER_CITY = 5
+RIDERS_PER_CITY = 75
+# Cities with no riders at all.
+CITIES_WITHOUT_RIDERS = 1
+MAX_SECONDS = 5.0
+# ---
+
+PickupRow = namedtuple(
+    "PickupRow",
+    "id version requested_pickup_date pickup_address_id city pincode weight_kg boxes",
+)
+PICKUP_DATE = date(2026, 10, 19)
+
+
+def make_pickups(count: int) -> list[PickupRow]:
+    random.seed(24)
+    cities = [f"City {c}" for c in range(CITIES)]
+    pincodes = {
+        city: [str(110000 + c * 1000 + p) for p in range(PINCODES_PER_CITY)]
+        for c, city in enumerate(cities)
+    }
+    warehouses = {
+        city: [(uuid.uuid4(), random.choice(pincodes[city])) for _ in range(WAREHOUSES_PER_CITY)]
+        for city in cities
+    }
+    rows = []
+    for _ in range(count):
+        city = random.choice(cities)
+        if random.random() < WAREHOUSE_SHARE:
+            address_id, pincode = random.choice(warehouses[city])
+        else:
+            address_id, pincode = uuid.uuid4(), random.choice(pincodes[city])
+        boxes = random.choice((1, 1, 1, 2, 3))
+        rows.append(
+            PickupRow(
+                id=uuid.uuid4(),
+                version=1,
+                requested_pickup_date=PICKUP_DATE - timedelta(days=random.choice((0, 0, 0, 1, 2))),
+                pickup_address_id=address_id,
+                # Cities are matched case- and space-insensitively.
+                city=random.choice((city, city.upper(), f" {city.lower()} ")),
+                pincode=pincode,
+                # A few pickups are too heavy for any rider.
+                weight_kg=round(random.uniform(0.2, 15) * boxes, 3)
+                if random.random() > 0.001
+                else 500.0,
+                boxes=boxes,
+            )
+        )
+    return rows
+
+
+def make_riders() -> list[RiderShift]:
+    random.seed(25)
+    return [
+        RiderShift(
+            rider_code=f"R{c:02d}-{r:02d}",
+            city=f"City {c}",
+            max_weight_kg=random.choice((150, 250, 400)),
+            max_boxes=random.choice((40, 60, 80)),
+            shift_start=clock(random.choice((8, 9, 10)), 0),
+            shift_end=clock(random.choice((17, 18, 19)), 30),
+        )
+        for c in range(CITIES_WITHOUT_RIDERS, CITIES)
+        for r in range(RIDERS_PER_CITY)
+    ]
+
+
+class InMemoryAssignmentRepository(PickupAssignmentRepository):
+    def __init__(self, rows: list[PickupRow]):
+        self.rows = rows
+
+    async def get_assignable_pickups(self, *, tenant_id, pickup_date):
+        return self.rows
+
+
+async def run_service(rows, riders):
+    """
+    Runs the service as a dry run. Returns the response and the seconds
+    taken, timed inside the event loop.
+    """
+    service = PickupAssignmentService(
+        PickupRepository(None), InMemoryAssignmentRepository(rows)  # type: ignore[arg-type]
+    )
+    start = time.perf_counter()
+    response = await service.assign_pickups(
+        tenant_id=uuid.uuid4(), pickup_date=PICKUP_DATE, riders=riders, dry_run=True
+    )
+    return response, time.perf_counter() - start
+
+
+def check_plan(rows, riders, response) -> list[str]:
+    """
+    Walks every route in stop order and checks it against its rider's
+    weight, box and shift limits, recomputing the route time from scratch.
+    """
+    problems = []
+    by_id = {row.id: row for row in rows}
+    limits = {rider.rider_code: rider for rider in riders}
+    routes: dict[str, list] = {}
+    for assignment in response.assignments:
+        routes.setdefault(assignment.rider_code, []).append(assignment)
+
+    for code, route in routes.items():
+        rider = limits[code]
+        if [a.sequence for a in route] != list(range(1, len(route) + 1)):
+            problems.append(f"{code}: sequence isn't 1..{len(route)}")
+        weight = sum(by_id[a.pickup_id].weight_kg for a in route)
+        boxes = sum(by_id[a.pickup_id].boxes for a in route)
+        minutes, pincode, address, visited = 0.0, None, None, set()
+        for a in route:
+            row = by_id[a.pickup_id]
+            if row.pincode != pincode:
+                minutes += settings.PICKUP_ASSIGNMENT_TRAVEL_MINUTES
+            if (row.pincode, row.pickup_address_id) != (pincode, address):
+                if row.pickup_address_id in visited:
+                    problems.append(f"{code}: visits address {row.pickup_address_id} twice")
+                visited.add(row.pickup_address_id)
+                minutes += settings.PICKUP_ASSIGNMENT_STOP_MINUTES
+            minutes += settings.PICKUP_ASSIGNMENT_HANDLING_MINUTES
+            pincode, address = row.pincode, row.pickup_address_id
+            if not rider.shift_start <= a.window_start < a.window_end <= rider.shift_end:
+                problems.append(f"{code}: window {a.window_start}-{a.window_end} outside the shift")
+        shift = (
+            datetime.combine(PICKUP_DATE, rider.shift_end)
+            - datetime.combine(PICKUP_DATE, rider.shift_start)
+        ).total_seconds() / 60
+        if weight > rider.max_weight_kg + 1e-6:
+            problems.append(f"{code}: {weight:.1f}kg over {rider.max_weight_kg}kg")
+        if boxes > rider.max_boxes:
+            problems.append(f"{code}: {boxes} boxes over {rider.max_boxes}")
+        if minutes > shift + 1e-6:
+            problems.append(f"{code}: {minutes:.0f} minutes over a {shift:.0f} minute shift")
+
+    covered = len(response.assignments) + len(response.unassigned_pickups)
+    ids = {a.pickup_id for a in response.assignments} | {u.pickup_id for u in response.unassigned_pickups}
+    if covered != len(rows) or len(ids) != len(rows):
+        problems.append(f"{covered} results for {len(rows)} pickups")
+    return problems
+
+
+def main():
+    rows = make_pickups(PICKUPS)
+    riders = make_riders()
+    print(f"--- {PICKUPS:,} OPEN pickups, {len(riders):,} riders in {CITIES - CITIES_WITHOUT_RIDERS} of {CITIES} cities ---")
+
+    # The solver alone, on arrays.
+    cities = {}
+    batch = AssignmentBatch(
+        city=np.array([cities.setdefault(r.city.strip().casefold(), len(cities)) for r in rows]),
+        pincode=np.array([int(r.pincode) for r in rows]),
+        address=np.unique([str(r.pickup_address_id) for r in rows], return_inverse=True)[1],
+        requested_day=np.array([r.requested_pickup_date.toordinal() for r in rows]),
+        weight_kg=np.array([r.weight_kg for r in rows]),
+        boxes=np.array([r.boxes for r in rows]),
+    )
+    shifts = [
+        Rider(
+            city=cities.setdefault(r.city.casefold(), len(cities)),
+            max_weight_kg=r.max_weight_kg,
+            max_boxes=r.max_boxes,
+            shift_minutes=(
+                datetime.combine(PICKUP_DATE, r.shift_end) - datetime.combine(PICKUP_DATE, r.shift_start)
+            ).total_seconds()
+            / 60,
+        )
+        for r in riders
+    ]
+    times = RouteTimes(
+        travel=settings.PICKUP_ASSIGNMENT_TRAVEL_MINUTES,
+        stop=settings.PICKUP_ASSIGNMENT_STOP_MINUTES,
+        handling=settings.PICKUP_ASSIGNMENT_HANDLING_MINUTES,
+    )
+    start = time.perf_counter()
+    plan = plan_assignments(batch, shifts, times)
+    solver_seconds = time.perf_counter() - start
+
+    # The whole run, from rows to the API response.
+    response, service_seconds = asyncio.run(run_service(rows, riders))
+
+    reasons = {reason: 0 for reason in UnassignedReason}
+    for u in response.unassigned_pickups:
+        reasons[u.reason] += 1
+    busy = [route for route in response.riders if route.pickups]
+    print(f"Solver:       {solver_seconds * 1000:8.1f}ms ({int((plan.rider != NONE).sum()):,} assigned)")
+    print(f"Service run:  {service_seconds * 1000:8.1f}ms (dry run, including the response)")
+    print(
+        f"Assigned {response.assigned:,}, unassigned {response.unassigned:,}: "
+        + ", ".join(f"{reason.value} {count:,}" for reason, count in reasons.items() if count)
+    )
+    if busy:
+        print(
+            f"{len(busy)} riders used, "
+            f"{sum(r.pickups for r in busy) / len(busy):.0f} pickups and "
+            f"{sum(r.stops for r in busy) / len(busy):.0f} stops per route on average"
+        )
+
+    problems = check_plan(rows, riders, response)
+    checks = [
+        (not problems, f"{len(problems)} routes break their rider's limits"),
+        (service_seconds < MAX_SECONDS, f"The run takes {service_seconds:.2f}s (limit {MAX_SECONDS:.0f}s)"),
+    ]
+    for problem in problems[:20]:
+        print(f"   {problem}")
+    for passed, message in checks:
+        print(f"{'✅' if passed else '❌'} {message}")
+    sys.exit(0 if all(passed for passed, _ in checks) else 1)
+
+
+if __name__ == "__main__":
+    main()
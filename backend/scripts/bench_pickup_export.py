@@ -0,0 +1,198 @@
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+import uuid
+
+from app.core.db import AsyncSessionLocal
+from app.core.dependencies import get_current_active_user
+from app.main import app
+from app.models.tenants import User, UserRole
+from scripts.bench_pickup_search import TOTAL_PICKUPS, seed
+from scripts.bench_pickup_search import cleanup as cleanup_pickups
+from sqlalchemy import text
+
+# --- Configuration ---
+# Pickups are seeded by scripts.bench_pickup_search (TOTAL_PICKUPS = 1M).
+# Each export runs in its own process, so its peak RSS is its own.
+SCENARIOS = {
+    "csv": {"format": "csv", "gzip": False},
+    "csv, gzip": {"format": "csv", "gzip": True},
+    "ndjson": {"format": "ndjson", "gzip": False},
+    "ndjson, gzip": {"format": "ndjson", "gzip": True},
+}
+# How much an export may grow the process's peak RSS over its idle peak.
+MAX_RSS_GROWTH_MB = 64
+# ---
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed_packages(tenant_id: uuid.UUID) -> None:
+    """
+    Gives every seeded pickup one package and a payment, so the export
+    reads the same tables it would in production.
+    """
+    params = {"tenant_id": tenant_id}
+    async with AsyncSessionLocal() as session:  # type: ignore
+        await session.exec(  # type: ignore
+            text(
+                """
+                INSERT INTO package_details (id, pickup_id, length, breadth, height, weight, box_count, is_fragile)
+                SELECT gen_random_uuid(), id, 30, 20, 10, 1.5, 1, false
+                FROM pickups WHERE tenant_id = :tenant_id
+                """
+            ),
+            params=params,
+        )
+        await session.exec(  # type: ignore
+            text(
+                """
+                INSERT INTO payment_details (id, pickup_id, amount, currency, payment_mode, declared_value, tax_amount)
+                SELECT gen_random_uuid(), id, 120, 'INR', 'PREPAID', 1000, 0
+                FROM pickups WHERE tenant_id = :tenant_id
+                """
+            ),
+            params=params,
+        )
+        await session.commit()
+        await session.exec(text("ANALYZE package_details"))  # type: ignore
+        await session.exec(text("ANALYZE payment_details"))  # type: ignore
+        await session.commit()
+
+
+async def cleanup(tenant_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        params = {"tenant_id": tenant_id}
+        pickup_ids = "SELECT id FROM pickups WHERE tenant_id = :tenant_id"
+        for table in ("package_details", "payment_details"):
+            await session.exec(text(f"DELETE FROM {table} WHERE pickup_id IN ({pickup_ids})"), params=params)  # type: ignore
+        await session.commit()
+    await cleanup_pickups(tenant_id)
+
+
+async def export(query: str) -> tuple[int, int]:
+    """
+    Calls the export endpoint directly through ASGI and discards the body
+    as it arrives (httpx's ASGITransport would buffer all of it).
+    Returns the HTTP status and the number of body bytes.
+    """
+    status = 0
+    received = 0
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client stays connected until the whole body has arrived.
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, received
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 12345),
+        "root_path": "",
+        "path": "/api/v1/pickups/export",
+        "raw_path": b"/api/v1/pickups/export",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"bench")],
+    }
+    await app(scope, receive, send)
+    return status, received
+
+
+def run_child(tenant_id: str, options: dict) -> None:
+    """Runs one export for the seeded tenant and prints its numbers."""
+    user = User(
+        id=uuid.uuid4(),
+        supabase_user_id=str(uuid.uuid4()),
+        email="export-bench@naviera.com",
+        role=UserRole.customer,
+        tenant_id=uuid.UUID(tenant_id),
+    )
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    query = f"format={options['format']}&gzip={str(options['gzip']).lower()}"
+
+    async def bench() -> dict:
+        # A one-day range returns nothing but warms up every code path.
+        await export(f"{query}&created_to=2000-01-02T00:00:00")
+        idle_rss_mb = peak_rss_mb()
+        start = time.perf_counter()
+        status, received = await export(query)
+        return {
+            "status": status,
+            "bytes": received,
+            "seconds": time.perf_counter() - start,
+            "idle_rss_mb": idle_rss_mb,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    print(json.dumps(asyncio.run(bench())))
+
+
+async def run_benchmark() -> bool:
+    tenant_id = uuid.uuid4()
+    print(f"Seeding {TOTAL_PICKUPS:,} pickups...")
+    start = time.perf_counter()
+    passed = True
+    try:
+        await seed(tenant_id)
+        await seed_packages(tenant_id)
+        print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+        print(f"--- GET /api/v1/pickups/export of {TOTAL_PICKUPS:,} pickups ---")
+        for name, options in SCENARIOS.items():
+            output = subprocess.run(
+                [sys.executable, "-m", "scripts.bench_pickup_export", str(tenant_id), json.dumps(options)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            growth_mb = result["peak_rss_mb"] - result["idle_rss_mb"]
+            ok = result["status"] == 200 and growth_mb <= MAX_RSS_GROWTH_MB
+            passed &= ok
+            print(
+                f"{'✅' if ok else '❌'} {name:>12}: HTTP {result['status']}, "
+                f"{result['bytes'] / 2**20:,.0f} MiB in {result['seconds']:.1f}s "
+                f"({TOTAL_PICKUPS / result['seconds']:,.0f} rows/s), "
+                f"peak RSS {result['peak_rss_mb']:.0f} MiB (+{growth_mb:.0f} MiB)"
+            )
+    finally:
+        await cleanup(tenant_id)
+    return passed
+
+
+def main():
+    passed = asyncio.run(run_benchmark())
+    print(f"✅ RSS growth within {MAX_RSS_GROWTH_MB} MiB" if passed else "❌ FAILED")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_child(sys.argv[1], json.loads(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,160 @@
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from app.core.db import AsyncSessionLocal
+from app.repositories.pickups import PickupRepository
+from app.services.pickups import PickupService
+from sqlalchemy import text
+
+# --- Configuration ---
+TOTAL_PICKUPS = 1_000_000
+# Consignees are reused across pickups, as address deduplication would.
+TOTAL_ADDRESSES = 200_000
+SEARCHES = 500
+PAGE_SIZE = 20
+# Target p95 latency for one search page.
+TARGET_P95_SECONDS = 0.2
+# ---
+
+FIRST_NAMES = [
+    "Aarav", "Vihaan", "Aditya", "Arjun", "Sai", "Reyansh", "Krishna", "Ishaan",
+    "Ananya", "Diya", "Saanvi", "Aadhya", "Pari", "Anika", "Navya", "Myra",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Iyer", "Reddy", "Nair", "Patel", "Gupta", "Khan",
+    "Das", "Mehta", "Joshi", "Rao", "Singh", "Kapoor", "Bose", "Menon",
+]
+CITIES = [
+    "Mumbai", "Pune", "Delhi", "Bengaluru", "Chennai", "Hyderabad", "Kolkata",
+    "Ahmedabad", "Jaipur", "Lucknow", "Indore", "Nagpur", "Surat", "Kochi",
+]
+
+
+def _sql_array(values: list[str]) -> str:
+    return "ARRAY[" + ",".join(f"'{v}'" for v in values) + "]"
+
+
+async def seed(tenant_id: uuid.UUID) -> None:
+    """
+    Generates addresses and pickups server-side with generate_series,
+    which is far faster than sending a million rows from Python.
+    """
+    params = {"tenant_id": tenant_id}
+    async with AsyncSessionLocal() as session:  # type: ignore
+        await session.exec(  # type: ignore
+            text(
+                f"""
+                CREATE TEMP TABLE bench_addresses AS
+                SELECT i, gen_random_uuid() AS id FROM generate_series(1, {TOTAL_ADDRESSES}) AS i
+                """
+            )
+        )
+        await session.exec(  # type: ignore
+            text(
+                f"""
+                INSERT INTO addresses (id, tenant_id, name, phone, address_line1, city, state, pincode, country)
+                SELECT
+                    a.id, :tenant_id,
+                    ({_sql_array(FIRST_NAMES)})[1 + i % {len(FIRST_NAMES)}] || ' '
+                        || ({_sql_array(LAST_NAMES)})[1 + (i / {len(FIRST_NAMES)}) % {len(LAST_NAMES)}]
+                        || ' ' || i,
+                    '9' || lpad(i::text, 9, '0'),
+                    i || ' Search Street',
+                    ({_sql_array(CITIES)})[1 + i % {len(CITIES)}],
+                    'XX', '400001', 'IN'
+                FROM bench_addresses AS a
+                """
+            ),
+            params=params,
+        )
+        await session.exec(  # type: ignore
+            text(
+                f"""
+                INSERT INTO pickups (
+                    id, tenant_id, created_by_user_id, order_reference_id, tracking_id,
+                    shipment_type, service_type, status, requested_pickup_date,
+                    pickup_address_id, delivery_address_id, version, created_at, updated_at
+                )
+                SELECT
+                    gen_random_uuid(), :tenant_id, :tenant_id,
+                    'ORD-' || lpad(i::text, 8, '0'),
+                    'AWB' || lpad((i * 7919 % 1000000000)::text, 10, '0'),
+                    'FORWARD', 'SURFACE', 'OPEN', current_date,
+                    pa.id, da.id, 1,
+                    now() - i * interval '1 second', now()
+                FROM generate_series(1, {TOTAL_PICKUPS}) AS i
+                JOIN bench_addresses AS pa ON pa.i = 1 + i % {TOTAL_ADDRESSES}
+                JOIN bench_addresses AS da ON da.i = 1 + (i * 31) % {TOTAL_ADDRESSES}
+                """
+            ),
+            params=params,
+        )
+        await session.commit()
+        await session.exec(text("ANALYZE pickups"))  # type: ignore
+        await session.exec(text("ANALYZE addresses"))  # type: ignore
+        await session.commit()
+
+
+async def cleanup(tenant_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        params = {"tenant_id": tenant_id}
+        await session.exec(text("DELETE FROM pickups WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM addresses WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.commit()
+
+
+def make_queries() -> list[str]:
+    """
+    A mix of the searches ops staff run: partial order references,
+    tracking ids and phones, consignee names, cities, and misses.
+    """
+    makers = [
+        lambda: f"ORD-{random.randint(1, TOTAL_PICKUPS):08d}"[: random.randint(7, 12)],
+        lambda: f"{random.randint(1, TOTAL_PICKUPS) * 7919 % 1000000000:010d}"[2:8],
+        lambda: f"9{random.randint(1, TOTAL_ADDRESSES):09d}"[-6:],
+        lambda: f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}",
+        lambda: random.choice(LAST_NAMES),
+        lambda: random.choice(CITIES),
+        lambda: uuid.uuid4().hex[:8],
+    ]
+    return [random.choice(makers)() for _ in range(SEARCHES)]
+
+
+async def run_benchmark() -> bool:
+    tenant_id = uuid.uuid4()
+    print(f"Seeding {TOTAL_PICKUPS:,} pickups and {TOTAL_ADDRESSES:,} addresses...")
+    start = time.perf_counter()
+    try:
+        await seed(tenant_id)
+        print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+        latencies = []
+        async with AsyncSessionLocal() as session:  # type: ignore
+            service = PickupService(PickupRepository(session))
+            for query in make_queries():
+                start = time.perf_counter()
+                await service.search_pickups(tenant_id=tenant_id, query=query, limit=PAGE_SIZE)
+                latencies.append(time.perf_counter() - start)
+                # Don't let the identity map grow across searches.
+                session.expunge_all()
+    finally:
+        await cleanup(tenant_id)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    print(f"{SEARCHES} searches: p50={p50 * 1000:.1f}ms p95={p95 * 1000:.1f}ms p99={p99 * 1000:.1f}ms")
+    return p95 <= TARGET_P95_SECONDS
+
+
+def main():
+    passed = asyncio.run(run_benchmark())
+    print(f"✅ p95 within {TARGET_P95_SECONDS * 1000:.0f}ms" if passed else "❌ p95 above target")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import asyncio
+import math
+import random
+import sys
+import time
+import uuid
+
+import httpx
+import numpy as np
+from app.core.dependencies import get_current_active_user
+from app.main import app
+from app.models.pickups import ServiceType, Zone
+from app.models.tenants import User, UserRole
+from app.schemas.v1.pickups import PackageCreate
+from app.schemas.v1.rates import RateQuoteItem
+from app.services.rates import (
+    METRO_DISTRICTS,
+    RATE_CARD,
+    SLAB_GRAMS,
+    SPECIAL_CIRCLES,
+    SPECIAL_DISTRICTS,
+    VOLUMETRIC_DIVISORS,
+    ZONES,
+    build_quote_batch,
+    quote_batch,
+)
+
+# --- Configuration ---
+SHIPMENTS = 100_000
+MAX_PACKAGES_PER_SHIPMENT = 5
+# Shipments per POST /rates/quote request in the end-to-end run.
+REQUEST_SIZE = 5000
+# The vectorized engine must beat the per-row loop by at least this much.
+MIN_SPEEDUP = 10
+# ---
+
+PINCODES = [
+    110001, 110017, 400001, 400076, 411001, 560001, 560034, 600001, 700001,
+    380001, 302001, 226001, 452001, 682001, 781001, 795001, 190001, 744101,
+]
+
+
+def make_items(count: int) -> list[RateQuoteItem]:
+    random.seed(42)
+    return [
+        RateQuoteItem(
+            reference=f"ORD-{i}",
+            service_type=random.choice(list(ServiceType)),
+            pickup_pincode=str(random.choice(PINCODES)),
+            delivery_pincode=str(random.choice(PINCODES)),
+            packages=[
+                PackageCreate(
+                    length=random.uniform(5, 80),
+                    breadth=random.uniform(5, 60),
+                    height=random.uniform(2, 50),
+                    weight=random.uniform(0.1, 20),
+                    box_count=random.choice((1, 1, 1, 2, 3)),
+                )
+                for _ in range(random.randint(1, MAX_PACKAGES_PER_SHIPMENT))
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def zone_for(pickup_pincode: int, delivery_pincode: int) -> Zone:
+    pickup_district, delivery_district = pickup_pincode // 1000, delivery_pincode // 1000
+    pickup_circle, delivery_circle = pickup_pincode // 10000, delivery_pincode // 10000
+    if pickup_district == delivery_district:
+        return Zone.A
+    if (
+        pickup_circle in SPECIAL_CIRCLES
+        or delivery_circle in SPECIAL_CIRCLES
+        or pickup_district in SPECIAL_DISTRICTS
+        or delivery_district in SPECIAL_DISTRICTS
+    ):
+        return Zone.E
+    if pickup_circle == delivery_circle:
+        return Zone.B
+    if pickup_district in METRO_DISTRICTS and delivery_district in METRO_DISTRICTS:
+        return Zone.C
+    return Zone.D
+
+
+def quote_loop(items: list[RateQuoteItem]) -> list[tuple[Zone, float, float]]:
+    """
+    The same rules, one shipment and one package at a time.
+    Returns (zone, chargeable weight, amount) per shipment.
+    """
+    quotes = []
+    for item in items:
+        dead = volume = 0.0
+        for package in item.packages:
+            dead += package.weight * package.box_count
+            volume += package.length * package.breadth * package.height * package.box_count
+        volumetric = volume / VOLUMETRIC_DIVISORS[item.service_type]
+        grams = round(max(dead, volumetric) * 1000)
+        slab_grams = SLAB_GRAMS[item.service_type]
+        slabs = max(math.ceil(grams / slab_grams), 1)
+        zone = zone_for(int(item.pickup_pincode), int(item.delivery_pincode))
+        first, additional = RATE_CARD[item.service_type][zone]
+        quotes.append((zone, slabs * slab_grams / 1000, round(first + (slabs - 1) * additional, 2)))
+    return quotes
+
+
+async def quote_over_http(items: list[RateQuoteItem]) -> float:
+    """
+    Sends the items to POST /api/v1/rates/quote in REQUEST_SIZE batches.
+    Returns the elapsed time.
+    """
+    app.dependency_overrides[get_current_active_user] = lambda: User(
+        id=uuid.uuid4(),
+        supabase_user_id=str(uuid.uuid4()),
+        email="rates-bench@naviera.com",
+        role=UserRole.customer,
+        tenant_id=uuid.uuid4(),
+    )
+    transport = httpx.ASGITransport(app=app)
+    bodies = [
+        {"items": [item.model_dump(mode="json") for item in items[start : start + REQUEST_SIZE]]}
+        for start in range(0, len(items), REQUEST_SIZE)
+    ]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for body in bodies:
+            response = await client.post("/api/v1/rates/quote", json=body)
+            response.raise_for_status()
+        return time.perf_counter() - start
+
+
+def main():
+    print(f"Generating {SHIPMENTS:,} shipments...")
+    items = make_items(SHIPMENTS)
+    packages = sum(len(item.packages) for item in items)
+
+    start = time.perf_counter()
+    expected = quote_loop(items)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = build_quote_batch(items)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    result = quote_batch(batch)
+    engine_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1
+        for (zone, chargeable, amount), zone_code, vector_chargeable, vector_amount in zip(
+            expected,
+            result.zone.tolist(),
+            result.chargeable_weight_kg.tolist(),
+            result.amount.tolist(),
+        )
+        if zone != ZONES[zone_code]
+        or not np.isclose(chargeable, vector_chargeable)
+        or not np.isclose(amount, vector_amount)
+    )
+
+    print(f"--- {SHIPMENTS:,} shipments, {packages:,} packages ---")
+    print(f"Per-row Python loop: {loop_seconds * 1000:8.1f}ms ({SHIPMENTS / loop_seconds:,.0f} shipments/s)")
+    print(
+        f"Vectorized engine:   {engine_seconds * 1000:8.1f}ms ({SHIPMENTS / engine_seconds:,.0f} shipments/s), "
+        f"plus {build_seconds * 1000:.1f}ms to lay out the arrays"
+    )
+    http_seconds = asyncio.run(quote_over_http(items))
+    print(
+        f"POST /rates/quote:   {http_seconds * 1000:8.1f}ms ({SHIPMENTS / http_seconds:,.0f} shipments/s, "
+        f"{REQUEST_SIZE:,} per request, including validation)"
+    )
+
+    speedup = loop_seconds / engine_seconds
+    passed = mismatches == 0 and speedup >= MIN_SPEEDUP
+    print(f"{'✅' if mismatches == 0 else '❌'} {mismatches} quotes differ from the per-row loop")
+    print(f"{'✅' if speedup >= MIN_SPEEDUP else '❌'} Engine is {speedup:.0f}x faster than the loop")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
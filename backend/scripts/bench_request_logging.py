@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+
+import httpx
+from app.middleware.logging import RequestLoggingMiddleware
+from fastapi import FastAPI, Request
+
+# --- Configuration ---
+REQUESTS = 5000
+CONCURRENCY = 50
+# ---
+
+logger = logging.getLogger("bench")
+
+
+async def legacy_log_requests(request: Request, call_next):
+    """The previous `app.middleware("http")` implementation, kept for comparison."""
+    start_time = time.time()
+    logger.info(f"Request: {request.method} {request.url.path}")
+    response = await call_next(request)
+    process_time = (time.time() - start_time) * 1000
+    logger.info(f"Response: {response.status_code} (took {process_time:.2f}ms)")
+    return response
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "ok"}
+
+    if variant == "legacy":
+        app.middleware("http")(legacy_log_requests)
+    elif variant == "asgi":
+        app.add_middleware(RequestLoggingMiddleware)
+    elif variant == "asgi-sampled":
+        app.add_middleware(RequestLoggingMiddleware, sample_rate_2xx=0.01)
+    return app
+
+
+async def bench(app: FastAPI) -> float:
+    """Returns requests/second for REQUESTS calls to /health."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def one():
+            async with semaphore:
+                await client.get("/health")
+
+        await asyncio.gather(*(one() for _ in range(200)))  # warm-up
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    # Log records are created and handled, but written nowhere, so the
+    # numbers reflect middleware overhead rather than terminal speed.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    for name in ("bench", "app.middleware.logging"):
+        log = logging.getLogger(name)
+        log.handlers = [logging.NullHandler()]
+        log.propagate = False
+        log.setLevel(logging.INFO)
+
+    print(f"--- GET /health x {REQUESTS} (concurrency {CONCURRENCY}) ---")
+    for variant in ("none", "legacy", "asgi", "asgi-sampled"):
+        rps = asyncio.run(bench(build_app(variant)))
+        print(f"{variant:>14}: {rps:>8,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
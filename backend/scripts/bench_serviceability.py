@@ -0,0 +1,224 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+from app.models.pickups import ServiceType, Zone
+from app.schemas.v1.serviceability import ServiceabilityIssue
+from app.services.serviceability import (
+    ISSUES,
+    SERVICE_CODES,
+    SLA_DAYS,
+    ZONES,
+    ServiceabilityRegistry,
+    build_index,
+)
+
+# --- Configuration ---
+# India has about 19,000 pincodes; hubs serve 5-50 each.
+PINCODES = 20_000
+HUBS = 1_500
+REGIONS = 36
+ROUTES = 100_000
+# Single lookups must take less than this on average.
+MAX_SINGLE_LOOKUP_MICROSECONDS = 50
+# ---
+
+
+def make_rows(seed: int) -> list[tuple]:
+    """
+    Random rows of a serviceability file: (pincode, hub, region, metro,
+    special, cod, express), with hub attributes the same on every row.
+    """
+    random.seed(seed)
+    hubs = [
+        (f"HUB-{h:04d}", f"R{random.randrange(REGIONS):02d}", random.random() < 0.05, random.random() < 0.05)
+        for h in range(HUBS)
+    ]
+    pincodes = random.sample(range(100000, 1000000), PINCODES)
+    return [
+        (pincode, *random.choice(hubs), random.random() < 0.8, random.random() < 0.6)
+        for pincode in pincodes
+    ]
+
+
+def to_csv(rows: list[tuple]) -> bytes:
+    lines = ["pincode,hub,region,metro,special,cod,express"]
+    lines.extend(",".join(str(int(v) if isinstance(v, bool) else v) for v in row) for row in rows)
+    return ("\n".join(lines) + "\n").encode()
+
+
+def check_loop(rows, routes) -> list[tuple]:
+    """
+    The same rules, one route at a time over a dict.
+    Returns (serviceable, issue, zone, sla_days) per route.
+    """
+    table = {row[0]: row for row in rows}
+    results = []
+    for origin, destination, service_type, cod in routes:
+        o, d = table.get(origin), table.get(destination)
+        if o is None:
+            results.append((False, ServiceabilityIssue.ORIGIN_NOT_SERVICEABLE, None, None))
+            continue
+        if d is None:
+            results.append((False, ServiceabilityIssue.DESTINATION_NOT_SERVICEABLE, None, None))
+            continue
+        if service_type == ServiceType.EXPRESS and not (o[6] and d[6]):
+            results.append((False, ServiceabilityIssue.EXPRESS_NOT_AVAILABLE, None, None))
+            continue
+        if cod and not d[5]:
+            results.append((False, ServiceabilityIssue.COD_NOT_AVAILABLE, None, None))
+            continue
+        if o[1] == d[1]:
+            zone = Zone.A
+        elif o[4] or d[4]:
+            zone = Zone.E
+        elif o[2] == d[2]:
+            zone = Zone.B
+        elif o[3] and d[3]:
+            zone = Zone.C
+        else:
+            zone = Zone.D
+        results.append((True, None, zone, SLA_DAYS[service_type][zone]))
+    return results
+
+
+def make_routes(rows, count: int) -> list[tuple]:
+    random.seed(7)
+    pincodes = [row[0] for row in rows]
+
+    def pincode() -> int:
+        # Mostly served pincodes, some that aren't.
+        return random.choice(pincodes) if random.random() < 0.95 else random.randrange(100000, 1000000)
+
+    return [
+        (pincode(), pincode(), random.choice(list(ServiceType)), random.random() < 0.3)
+        for _ in range(count)
+    ]
+
+
+async def check_reload(rows) -> list[tuple[bool, str]]:
+    """
+    Replaces a watched file and checks the registry swaps in the new index,
+    keeps the old one when the file is invalid, and never leaves readers
+    without a complete index.
+    """
+    checks = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "serviceability.csv")
+
+        def replace(data: bytes) -> None:
+            with open(path + ".tmp", "wb") as file:
+                file.write(data)
+            os.replace(path + ".tmp", path)
+
+        replace(to_csv(rows))
+        registry = ServiceabilityRegistry(path=path, reload_interval=0.01)
+        registry.start()
+        first = registry.index
+        checks.append((first is not None and len(first) == len(rows), "Initial load"))
+
+        # Readers keep looking up while the file is replaced.
+        torn = 0
+        done = asyncio.Event()
+
+        async def reader():
+            nonlocal torn
+            while not done.is_set():
+                index = registry.require_index()
+                if len(index.pincodes) != len(index.hub) or len(index.hub) != len(index.flags):
+                    torn += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(reader())
+        smaller = rows[: len(rows) // 2]
+        replace(to_csv(smaller))
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if registry.index is not first:
+                break
+        second = registry.index
+        checks.append((second is not None and len(second) == len(smaller), "Reloaded after the file changed"))
+
+        replace(b"pincode,hub\nnot-a-pincode,X\n")
+        await asyncio.sleep(0.2)
+        checks.append((registry.index is second, "Kept the previous index when the file was invalid"))
+
+        done.set()
+        await task
+        await registry.stop()
+        checks.append((torn == 0, f"Readers saw {torn} partial indexes"))
+    return checks
+
+
+def main():
+    rows = make_rows(seed=1)
+    data = to_csv(rows)
+
+    start = time.perf_counter()
+    index = build_index(data)
+    build_seconds = time.perf_counter() - start
+    size = sum(a.nbytes for a in (index.pincodes, index.hub, index.flags, index.hub_class, index.zone_matrix))
+
+    routes = make_routes(rows, ROUTES)
+    start = time.perf_counter()
+    expected = check_loop(rows, routes)
+    loop_seconds = time.perf_counter() - start
+
+    origin = np.array([r[0] for r in routes], dtype=np.int64)
+    destination = np.array([r[1] for r in routes], dtype=np.int64)
+    service_type = np.array([SERVICE_CODES[r[2]] for r in routes], dtype=np.int64)
+    cod = np.array([r[3] for r in routes], dtype=bool)
+    start = time.perf_counter()
+    check = index.check_routes(origin, destination, service_type, cod)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1
+        for (serviceable, issue, zone, sla_days), *got in zip(
+            expected,
+            check.serviceable.tolist(),
+            check.issue.tolist(),
+            check.zone.tolist(),
+            check.sla_days.tolist(),
+        )
+        if (serviceable, issue, zone, sla_days)
+        != (
+            got[0],
+            ISSUES[got[1]] if got[1] >= 0 else None,
+            ZONES[got[2]] if got[2] >= 0 else None,
+            got[3] if got[3] >= 0 else None,
+        )
+    )
+
+    # Single lookups, as GET /serviceability/pincodes/{pincode} does them.
+    samples = [str(r[0]) for r in routes[:10_000]]
+    start = time.perf_counter()
+    for pincode in samples:
+        index.pincode(pincode)
+    single_microseconds = (time.perf_counter() - start) / len(samples) * 1e6
+
+    print(f"--- {PINCODES:,} pincodes, {HUBS:,} hubs, {ROUTES:,} routes ---")
+    print(f"Index built in {build_seconds * 1000:.1f}ms, {size / 1024:.0f} KiB of arrays")
+    print(f"Per-route dict loop: {loop_seconds * 1000:8.1f}ms ({ROUTES / loop_seconds:,.0f} routes/s)")
+    print(f"Batch lookup:        {batch_seconds * 1000:8.1f}ms ({ROUTES / batch_seconds:,.0f} routes/s)")
+    print(f"Single pincode lookup: {single_microseconds:.1f}µs")
+
+    checks = [
+        (mismatches == 0, f"{mismatches} routes differ from the per-route loop"),
+        (
+            single_microseconds < MAX_SINGLE_LOOKUP_MICROSECONDS,
+            f"Single lookups take {single_microseconds:.1f}µs",
+        ),
+        *asyncio.run(check_reload(rows)),
+    ]
+    for passed, message in checks:
+        print(f"{'✅' if passed else '❌'} {message}")
+    sys.exit(0 if all(passed for passed, _ in checks) else 1)
+
+
+if __name__ == "__main__":
+    main()
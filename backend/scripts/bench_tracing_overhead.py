@@ -0,0 +1,115 @@
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+# --- Configuration ---
+REQUESTS = 3000
+# Each scenario runs in its own process, because auto-tracing can only be
+# installed once and only affects modules imported after it.
+SCENARIOS = {
+    "tracing off": {"configure": False},
+    "min_duration=0 (old)": {"min_duration": 0.0, "exclude": ""},
+    "min_duration=5ms": {"min_duration": 0.005},
+    "min_duration=5ms, sample 10%": {"min_duration": 0.005, "sample_rate": 0.1},
+    "auto-tracing disabled": {"auto_trace": False},
+}
+# ---
+
+
+def run_child(options: dict) -> None:
+    """Configures tracing as `options` says, then prints requests/second."""
+    from app.core.config import settings
+
+    settings.LOGFIRE_AUTO_TRACE_MIN_DURATION_SECONDS = options.get("min_duration", 0.005)
+    settings.LOGFIRE_TRACE_SAMPLE_RATE = options.get("sample_rate", 1.0)
+    settings.LOGFIRE_AUTO_TRACE_ENABLED = options.get("auto_trace", True)
+    if "exclude" in options:
+        settings.LOGFIRE_AUTO_TRACE_EXCLUDE_MODULES = options["exclude"]
+
+    import logfire
+    from app.core.logging import should_auto_trace
+
+    if options.get("configure", True):
+        # Spans are created and processed, but not exported anywhere.
+        logfire.configure(
+            send_to_logfire=False,
+            console=False,
+            sampling=logfire.SamplingOptions(head=settings.LOGFIRE_TRACE_SAMPLE_RATE),
+        )
+        if settings.LOGFIRE_AUTO_TRACE_ENABLED:
+            logfire.install_auto_tracing(
+                modules=should_auto_trace,
+                min_duration=settings.LOGFIRE_AUTO_TRACE_MIN_DURATION_SECONDS,
+                check_imported_modules="ignore",
+            )
+
+    # Imported after auto-tracing is installed, like in app.main.
+    import httpx
+    from app.core.cache import tenant_cache
+    from app.core.pagination import paginate
+    from app.core.security import decode_access_token
+    from fastapi import FastAPI
+    from jose import jwt
+
+    token = jwt.encode(
+        {
+            "sub": "bench",
+            "email": "bench@naviera.com",
+            "aud": "authenticated",
+            "iss": settings.JWT_ISSUER,
+            "exp": int(time.time()) + 3600,
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+    app = FastAPI()
+    logfire.instrument_fastapi(app)
+
+    @app.get("/bench")
+    async def bench_endpoint():
+        # Roughly the app-level work of a cached, authenticated list request.
+        decode_access_token(token)
+        tenant_cache.get("bench")
+        items, cursor = paginate(list(range(101)), 100, key=lambda i: (i,))
+        return {"count": len(items), "next_cursor": cursor}
+
+    async def bench() -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://b") as client:
+            for _ in range(200):  # warm-up
+                await client.get("/bench")
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                await client.get("/bench")
+            return REQUESTS / (time.perf_counter() - start)
+
+    print(json.dumps({"rps": asyncio.run(bench())}))
+
+
+def main():
+    print(f"--- GET /bench x {REQUESTS} per tracing setting ---")
+    baseline_us = None
+    for name, options in SCENARIOS.items():
+        output = subprocess.run(
+            [sys.executable, "-m", "scripts.bench_tracing_overhead", json.dumps(options)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        rps = json.loads(output.strip().splitlines()[-1])["rps"]
+        per_request_us = 1e6 / rps
+        baseline_us = baseline_us or per_request_us
+        print(
+            f"{name:>30}: {rps:>8,.0f} req/s "
+            f"({per_request_us:.0f}us/req, +{per_request_us - baseline_us:.0f}us overhead)"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_child(json.loads(sys.argv[1]))
+    else:
+        main()
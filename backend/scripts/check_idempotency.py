@@ -0,0 +1,270 @@
+import os
+
+# The app's own idempotency middleware is replaced below by two instances
+# sharing one in-memory table, standing in for two API processes.
+os.environ["IDEMPOTENCY_ENABLED"] = "False"
+
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.dependencies import get_tenant_from_header
+from app.main import app
+from app.middleware.idempotency import STREAMING_UPLOAD_PATH, IdempotencyMiddleware
+from app.models.tenants import Tenant, User, UserRole
+from app.services.idempotency import IdempotencyStore
+from app.services.tenants import get_tenant_service
+from jose import jwt
+
+# Sends concurrent duplicates of POST /api/v1/users/onboard to two
+# "processes" and checks the service runs once per key, replays skip it,
+# and a reused key, a failed request and a slow one are handled.
+
+# --- Configuration ---
+DUPLICATES = 50
+# How long the stand-in service takes per call.
+SERVICE_SECONDS = 0.05
+REPLAYS = 2000
+# ---
+
+ONBOARD_URL = f"{settings.API_V1_STR}/users/onboard"
+
+
+class InMemoryIdempotencyRepository:
+    """
+    The IdempotencyRepository operations over a dict, with the same rules.
+    """
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str], dict] = {}
+        self.calls = 0
+
+    async def claim(self, *, scope, key, method, path, request_hash, now, locked_until, expires_at):
+        self.calls += 1
+        row = self.rows.get((scope, key))
+        if row is not None and not (
+            row["expires_at"] <= now
+            or (row["response_status"] is None and row["locked_until"] <= now)
+        ):
+            return False
+        self.rows[(scope, key)] = dict(
+            request_hash=request_hash,
+            response_status=None,
+            response_headers=None,
+            response_body=None,
+            created_at=now,
+            locked_until=locked_until,
+            expires_at=expires_at,
+        )
+        return True
+
+    async def get(self, *, scope, key):
+        self.calls += 1
+        row = self.rows.get((scope, key))
+        return None if row is None else type("Record", (), row)
+
+    async def complete(self, *, scope, key, claimed_at, status, headers, body):
+        self.calls += 1
+        row = self.rows.get((scope, key))
+        if row and row["created_at"] == claimed_at and row["response_status"] is None:
+            row.update(response_status=status, response_headers=headers, response_body=body)
+
+    async def release(self, *, scope, key, claimed_at):
+        self.calls += 1
+        row = self.rows.get((scope, key))
+        if row and row["created_at"] == claimed_at and row["response_status"] is None:
+            del self.rows[(scope, key)]
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, repository: InMemoryIdempotencyRepository):
+        super().__init__(
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+            lock_timeout=settings.IDEMPOTENCY_LOCK_SECONDS,
+            wait_timeout=1.0,
+            poll_interval=0.01,
+            purge_interval=settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+            cache=TTLCache(name="idempotency", max_size=1000, ttl=settings.IDEMPOTENCY_TTL_SECONDS),
+            cache_max_body_bytes=settings.IDEMPOTENCY_CACHE_MAX_BODY_BYTES,
+        )
+        self.repository = repository
+
+    @asynccontextmanager
+    async def _repository(self):
+        yield self.repository
+
+
+class FakeTenantService:
+    """
+    Stands in for TenantService; counts calls and can be made slow or failing.
+    """
+
+    def __init__(self, tenant: Tenant):
+        self.tenant = tenant
+        self.calls = 0
+        self.delay = SERVICE_SECONDS
+        self.fail = False
+
+    async def get_or_create_user(self, *, token_data, tenant):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        return User(
+            id=uuid.uuid4(),
+            supabase_user_id=uuid.UUID(token_data.sub),
+            email=token_data.email,
+            tenant_id=tenant.id,
+            role=UserRole.customer,
+        )
+
+
+def make_token(subject: uuid.UUID) -> str:
+    claims = {
+        "sub": str(subject),
+        "email": "retry@naviera.com",
+        "aud": "authenticated",
+        "iss": settings.JWT_ISSUER,
+        "exp": int(time.time()) + 3600,
+    }
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+async def run_checks() -> list[tuple[bool, str]]:
+    tenant = Tenant(id=uuid.uuid4(), slug="acme", name="Acme Logistics")
+    service = FakeTenantService(tenant)
+    app.dependency_overrides[get_tenant_from_header] = lambda: tenant
+    app.dependency_overrides[get_tenant_service] = lambda: service
+
+    repository = InMemoryIdempotencyRepository()
+    processes = [
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(
+                app=IdempotencyMiddleware(
+                    app,
+                    store=InMemoryIdempotencyStore(repository),
+                    max_body_bytes=settings.IDEMPOTENCY_MAX_BODY_BYTES,
+                    max_response_bytes=settings.IDEMPOTENCY_MAX_RESPONSE_BYTES,
+                ),
+                raise_app_exceptions=False,
+            ),
+            base_url="http://test",
+        )
+        for _ in range(2)
+    ]
+    token = make_token(uuid.uuid4())
+
+    async def onboard(key, *, process=0, body=b"", token=token):
+        headers = {"Authorization": f"Bearer {token}", "X-Tenant-Slug": tenant.slug}
+        if key is not None:
+            headers["Idempotency-Key"] = key
+        return await processes[process].post(ONBOARD_URL, headers=headers, content=body)
+
+    checks = []
+
+    # Concurrent duplicates across both processes.
+    responses = await asyncio.gather(
+        *(onboard("first", process=i % 2) for i in range(DUPLICATES))
+    )
+    statuses = {r.status_code for r in responses}
+    bodies = {r.content for r in responses}
+    replayed = sum(r.headers.get("idempotent-replayed") == "true" for r in responses)
+    checks.append((service.calls == 1, f"{DUPLICATES} concurrent duplicates ran the service {service.calls} time(s)"))
+    checks.append(
+        (statuses == {201} and len(bodies) == 1 and replayed == DUPLICATES - 1,
+         f"Duplicates got statuses {sorted(statuses)}, {len(bodies)} distinct bodies, {replayed} replays")
+    )
+
+    # Sequential replays, from the in-memory cache.
+    calls, repository_calls = service.calls, repository.calls
+    start = time.perf_counter()
+    for i in range(REPLAYS):
+        response = await onboard("first", process=i % 2)
+    replay_seconds = (time.perf_counter() - start) / REPLAYS
+    checks.append(
+        (service.calls == calls and repository.calls == repository_calls and response.status_code == 201,
+         f"{REPLAYS} replays called the service {service.calls - calls} and the table "
+         f"{repository.calls - repository_calls} time(s)")
+    )
+    start = time.perf_counter()
+    for i in range(REPLAYS // 10):
+        await onboard(None)
+    execute_seconds = (time.perf_counter() - start) / (REPLAYS // 10)
+
+    # The same key with a different request.
+    response = await onboard("first", body=b'{"other": true}')
+    checks.append((response.status_code == 422, f"A reused key got {response.status_code}"))
+
+    # Another caller may use the same key.
+    calls = service.calls
+    response = await onboard("first", token=make_token(uuid.uuid4()))
+    checks.append((service.calls == calls + 1 and response.status_code == 201, "Keys are scoped per caller"))
+
+    # A failed request isn't stored, so its retry runs.
+    service.fail = True
+    response = await onboard("failing")
+    service.fail = False
+    retry = await onboard("failing", process=1)
+    checks.append(
+        (response.status_code == 500 and retry.status_code == 201 and "idempotent-replayed" not in retry.headers,
+         f"A 500 then its retry got {response.status_code}, {retry.status_code}")
+    )
+
+    # A duplicate that outwaits the wait timeout is told to retry.
+    service.delay = 1.5
+    slow, duplicate = await asyncio.gather(onboard("slow"), onboard("slow", process=1))
+    service.delay = SERVICE_SECONDS
+    checks.append(
+        (slow.status_code == 201 and duplicate.status_code == 409 and duplicate.headers.get("retry-after"),
+         f"A duplicate of a slow request got {duplicate.status_code}")
+    )
+
+    # Bodies over the limit run without idempotency instead of being rejected,
+    # with or without a Content-Length.
+    large = b"x" * (settings.IDEMPOTENCY_MAX_BODY_BYTES + 1)
+
+    async def chunked():
+        for start in range(0, len(large), 64 * 1024):
+            yield large[start : start + 64 * 1024]
+
+    calls = service.calls
+    sized = [await onboard("large", body=large) for _ in range(2)]
+    streamed = [await onboard("large-chunked", body=chunked()) for _ in range(2)]
+    checks.append(
+        (service.calls == calls + 4
+         and all(r.status_code == 201 and "idempotent-replayed" not in r.headers for r in sized + streamed),
+         f"Bodies over the limit got {[r.status_code for r in sized + streamed]} and ran {service.calls - calls} time(s)")
+    )
+    uploads = [f"{settings.API_V1_STR}/pickups/imports", f"{settings.API_V1_STR}/pickups/{uuid.uuid4()}/documents"]
+    checks.append(
+        (all(STREAMING_UPLOAD_PATH.match(path) for path in uploads)
+         and not STREAMING_UPLOAD_PATH.match(f"{settings.API_V1_STR}/pickups/bulk"),
+         "Streaming upload routes pass through")
+    )
+
+    for client in processes:
+        await client.aclose()
+    app.dependency_overrides.clear()
+
+    print(f"--- {DUPLICATES} concurrent duplicates, {REPLAYS:,} replays ---")
+    print(f"Replay:  {replay_seconds * 1e6:8.0f}µs per request")
+    print(f"Execute: {execute_seconds * 1e6:8.0f}µs per request (without a key, {SERVICE_SECONDS * 1000:.0f}ms service)")
+    return checks
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    checks = asyncio.run(run_checks())
+    for passed, message in checks:
+        print(f"{'✅' if passed else '❌'} {message}")
+    sys.exit(0 if all(passed for passed, _ in checks) else 1)
+
+
+if __name__ == "__main__":
+    main()
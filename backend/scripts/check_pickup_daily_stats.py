@@ -0,0 +1,94 @@
+import asyncio
+import math
+import sys
+import uuid
+from typing import Any
+
+from app.core.db import AsyncSessionLocal
+from app.repositories.pickup_stats import STATS_COLUMNS, PickupStatsRepository
+
+# Compares tenant_pickup_daily_stats with a full recompute from the pickups,
+# tenant by tenant, and reports every (day, status) row that differs.
+#
+#     python -m scripts.check_pickup_daily_stats          # report only
+#     python -m scripts.check_pickup_daily_stats --fix    # rebuild tenants that differ
+#
+# Exits with 1 if any tenant's stats differ (after --fix: if any still do).
+
+# --- Configuration ---
+# The sums are floats updated by adding and subtracting; allow for rounding.
+ABS_TOLERANCE = 1e-6
+REL_TOLERANCE = 1e-9
+# ---
+
+
+def _keyed(rows: list[dict[str, Any]]) -> dict[tuple, dict[str, Any]]:
+    return {(row["day"], row["status"]): row for row in rows}
+
+
+def _differs(stored: dict[str, Any] | None, expected: dict[str, Any] | None) -> bool:
+    for name in STATS_COLUMNS:
+        a = stored[name] if stored else 0
+        b = expected[name] if expected else 0
+        if not math.isclose(a, b, rel_tol=REL_TOLERANCE, abs_tol=ABS_TOLERANCE):
+            return True
+    return False
+
+
+async def check_tenant(tenant_id: uuid.UUID) -> list[str]:
+    """
+    Returns a description of every stats row of the tenant that doesn't
+    match the recompute. Both are read in one transaction, so pickups
+    written meanwhile can't show up as differences.
+    """
+    async with AsyncSessionLocal() as session:  # type: ignore
+        # REPEATABLE READ: both queries see the same snapshot.
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        repo = PickupStatsRepository(session)
+        stored = _keyed(await repo.get_stored_stats(tenant_id))
+        expected = _keyed(await repo.recompute_stats(tenant_id))
+
+    problems = []
+    for key in sorted(stored.keys() | expected.keys(), key=lambda k: (k[0], k[1].value)):
+        if _differs(stored.get(key), expected.get(key)):
+            day, status = key
+            found = {name: stored[key][name] for name in STATS_COLUMNS} if key in stored else None
+            wanted = {name: expected[key][name] for name in STATS_COLUMNS} if key in expected else None
+            problems.append(f"{day} {status.value}: stored {found}, expected {wanted}")
+    return problems
+
+
+async def rebuild_tenant(tenant_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        await PickupStatsRepository(session).rebuild_stats(tenant_id)
+
+
+async def run_check(fix: bool) -> bool:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        tenant_ids = await PickupStatsRepository(session).list_tenant_ids()
+
+    print(f"Checking daily stats of {len(tenant_ids)} tenants...")
+    consistent = True
+    for tenant_id in tenant_ids:
+        problems = await check_tenant(tenant_id)
+        if not problems:
+            continue
+        print(f"❌ Tenant {tenant_id}: {len(problems)} rows differ")
+        for problem in problems[:20]:
+            print(f"   {problem}")
+        if fix:
+            await rebuild_tenant(tenant_id)
+            problems = await check_tenant(tenant_id)
+            print(f"   {'✅ rebuilt' if not problems else '❌ still differs after rebuilding'}")
+        consistent &= not problems
+    return consistent
+
+
+def main():
+    consistent = asyncio.run(run_check(fix="--fix" in sys.argv[1:]))
+    print("✅ Daily stats match the pickups" if consistent else "❌ Daily stats differ")
+    sys.exit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import asyncio
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import httpx
+from app.core.db import AsyncSessionLocal, async_engine, replica_router
+from app.core.dependencies import get_current_active_user
+from app.main import app
+from app.models.pickups import DocumentType, PickupDocument
+from app.models.tenants import User, UserRole
+from app.repositories.pickups import PickupRepository
+from app.services.pickups import PickupService
+from sqlalchemy import event, text
+
+# --- Configuration ---
+PAGE_SIZE = 100
+PACKAGES_PER_PICKUP = 3
+DOCUMENTS_PER_PICKUP = 2
+# One SELECT for pickups joined with addresses and payment, plus one
+# SELECT ... IN (...) each for packages and documents.
+MAX_QUERIES_PER_PAGE = 3
+MAX_QUERIES_PER_DETAIL = 3
+# ---
+
+
+@contextmanager
+def count_statements():
+    """
+    Counts the SQL statements sent on the primary and every replica engine
+    while the block runs. Yields a list that receives each statement.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engines = [engine.sync_engine for engine in (async_engine, *replica_router.engines)]
+    for engine in sync_engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in sync_engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def make_pickup(i: int) -> dict:
+    address = {
+        "name": f"Consignee {i}",
+        "phone": f"98{i:08d}"[:10],
+        "address_line1": f"{i} Query Count Street",
+        "city": "Pune",
+        "state": "MH",
+        "pincode": "411001",
+    }
+    return {
+        "order_reference_id": f"QC-{i}",
+        "requested_pickup_date": (date.today() + timedelta(days=1)).isoformat(),
+        "pickup_address": address,
+        "delivery_address": {**address, "name": f"Receiver {i}"},
+        "packages": [
+            {"length": 30, "breadth": 20, "height": 10, "weight": 1.5}
+        ] * PACKAGES_PER_PICKUP,
+    }
+
+
+async def seed(tenant_id: uuid.UUID, user_id: uuid.UUID) -> list[uuid.UUID]:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        response = await PickupService(PickupRepository(session)).bulk_create_pickups(
+            items=[make_pickup(i) for i in range(PAGE_SIZE)],
+            tenant_id=tenant_id,
+            user_id=user_id,
+        )
+        pickup_ids = [r.pickup_id for r in response.results if r.pickup_id]
+        session.add_all(
+            PickupDocument(
+                pickup_id=pickup_id,
+                document_type=DocumentType.BOX_PHOTO,
+                file_url=f"file:///query-count/{pickup_id}/{n}.jpg",
+                file_name=f"{n}.jpg",
+            )
+            for pickup_id in pickup_ids
+            for n in range(DOCUMENTS_PER_PICKUP)
+        )
+        await session.commit()
+    return pickup_ids
+
+
+async def cleanup(tenant_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        params = {"tenant_id": tenant_id}
+        pickup_ids = "SELECT id FROM pickups WHERE tenant_id = :tenant_id"
+        for table in ("pickup_documents", "package_details", "payment_details"):
+            await session.exec(text(f"DELETE FROM {table} WHERE pickup_id IN ({pickup_ids})"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM pickups WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM addresses WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM tenant_pickup_daily_stats WHERE tenant_id = :tenant_id"), params=params)  # type: ignore
+        await session.commit()
+
+
+async def check(client: httpx.AsyncClient, url: str, max_queries: int) -> bool:
+    with count_statements() as statements:
+        response = await client.get(url)
+    ok = response.status_code == 200 and len(statements) <= max_queries
+    print(
+        f"{'✅' if ok else '❌'} GET {url}: HTTP {response.status_code}, "
+        f"{len(statements)} queries (max {max_queries})"
+    )
+    if not ok:
+        for statement in statements:
+            print(f"    {statement.splitlines()[0][:120]}")
+    return ok
+
+
+async def run_check() -> bool:
+    """
+    Seeds a page of pickups into a throwaway tenant and checks the number of
+    SQL statements issued by the list and detail endpoints. Authentication is
+    overridden so only the pickup queries are counted.
+    """
+    tenant_id = uuid.uuid4()
+    user = User(
+        id=uuid.uuid4(),
+        supabase_user_id=str(uuid.uuid4()),
+        email="query-count@naviera.com",
+        role=UserRole.customer,
+        tenant_id=tenant_id,
+    )
+    app.dependency_overrides[get_current_active_user] = lambda: user
+
+    try:
+        pickup_ids = await seed(tenant_id, user.id)
+        print(
+            f"Seeded {len(pickup_ids)} pickups with {PACKAGES_PER_PICKUP} packages "
+            f"and {DOCUMENTS_PER_PICKUP} documents each."
+        )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            results = [
+                await check(client, f"/api/v1/pickups/?limit={PAGE_SIZE}", MAX_QUERIES_PER_PAGE),
+                await check(client, f"/api/v1/pickups/{pickup_ids[0]}", MAX_QUERIES_PER_DETAIL),
+            ]
+        return all(results)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+        await cleanup(tenant_id)
+
+
+def main():
+    passed = asyncio.run(run_check())
+    print("✅ PASSED" if passed else "❌ FAILED")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator
+
+from app.core.db import AsyncSessionLocal
+from app.models.pickups import PickupStatus, ServiceType, ShipmentType
+from app.repositories.pickups import (
+    PICKUP_AGGREGATE_OPTIONS,
+    PickupRepository,
+    pickup_list_statement,
+)
+from app.services.pickups import PickupService
+from sqlalchemy import text
+
+# --- Configuration ---
+TENANTS = 10
+PICKUPS_PER_TENANT = 5000
+PAGE_SIZE = 100
+# ---
+
+# (description, list filters, indexes the plan may use, whether the index
+# must also provide the order, i.e. the plan has no Sort node)
+SCENARIOS: list[tuple[str, dict[str, Any], set[str], bool]] = [
+    ("newest first", {}, {"ix_pickups_tenant_created_at"}, True),
+    (
+        "by status",
+        {"status": PickupStatus.OPEN},
+        {"ix_pickups_tenant_status_created_at"},
+        True,
+    ),
+    (
+        "by status in a requested date range",
+        {
+            "status": PickupStatus.ASSIGNED,
+            "requested_from": date.today() - timedelta(days=30),
+            "requested_to": date.today(),
+        },
+        # A narrow range may be cheaper to fetch by date and sort.
+        {"ix_pickups_tenant_status_created_at", "ix_pickups_tenant_requested_date"},
+        False,
+    ),
+    (
+        "by service type",
+        {"service_type": ServiceType.EXPRESS},
+        {"ix_pickups_tenant_created_at"},
+        True,
+    ),
+    (
+        "returns only",
+        {"shipment_type": ShipmentType.REVERSE},
+        {"ix_pickups_tenant_reverse_created_at"},
+        True,
+    ),
+    (
+        "second page",
+        {"after": (datetime.utcnow() - timedelta(days=45), uuid.uuid4())},
+        {"ix_pickups_tenant_created_at"},
+        True,
+    ),
+]
+
+
+def make_pickup(i: int) -> dict:
+    address = {
+        "name": f"Consignee {i}",
+        "phone": f"98{i:08d}"[:10],
+        "address_line1": f"{i} Explain Street",
+        "city": "Pune",
+        "state": "MH",
+        "pincode": "411001",
+    }
+    return {
+        "order_reference_id": f"EXPLAIN-{i}",
+        "requested_pickup_date": date.today().isoformat(),
+        "pickup_address": address,
+        "delivery_address": address,
+        "packages": [{"length": 30, "breadth": 20, "height": 10, "weight": 1.5}],
+    }
+
+
+async def seed(tenant_ids: list[uuid.UUID]) -> None:
+    """
+    Bulk-creates pickups for every tenant, then spreads their status, type,
+    service and dates so the planner sees realistic statistics.
+    """
+    items = [make_pickup(i) for i in range(PICKUPS_PER_TENANT)]
+    async with AsyncSessionLocal() as session:  # type: ignore
+        service = PickupService(PickupRepository(session))
+        for tenant_id in tenant_ids:
+            await service.bulk_create_pickups(
+                items=items, tenant_id=tenant_id, user_id=uuid.uuid4()
+            )
+        await session.exec(  # type: ignore
+            text(
+                """
+                UPDATE pickups SET
+                    status = (enum_range(NULL::pickupstatus))[1 + floor(random() * 7)::int],
+                    service_type = CASE WHEN random() < 0.2
+                        THEN 'EXPRESS' ELSE 'SURFACE' END::servicetype,
+                    shipment_type = CASE WHEN random() < 0.05
+                        THEN 'REVERSE' ELSE 'FORWARD' END::shipmenttype,
+                    created_at = now() - random() * interval '180 days'
+                WHERE tenant_id = ANY(:tenant_ids)
+                """
+            ),
+            params={"tenant_ids": tenant_ids},
+        )
+        await session.exec(  # type: ignore
+            text(
+                "UPDATE pickups SET requested_pickup_date = created_at::date + 1 "
+                "WHERE tenant_id = ANY(:tenant_ids)"
+            ),
+            params={"tenant_ids": tenant_ids},
+        )
+        await session.commit()
+        await session.exec(text("ANALYZE pickups"))  # type: ignore
+        await session.commit()
+
+
+async def cleanup(tenant_ids: list[uuid.UUID]) -> None:
+    async with AsyncSessionLocal() as session:  # type: ignore
+        params = {"tenant_ids": tenant_ids}
+        pickup_ids = "SELECT id FROM pickups WHERE tenant_id = ANY(:tenant_ids)"
+        await session.exec(text(f"DELETE FROM package_details WHERE pickup_id IN ({pickup_ids})"), params=params)  # type: ignore
+        await session.exec(text(f"DELETE FROM payment_details WHERE pickup_id IN ({pickup_ids})"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM pickups WHERE tenant_id = ANY(:tenant_ids)"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM addresses WHERE tenant_id = ANY(:tenant_ids)"), params=params)  # type: ignore
+        await session.exec(text("DELETE FROM tenant_pickup_daily_stats WHERE tenant_id = ANY(:tenant_ids)"), params=params)  # type: ignore
+        await session.commit()
+
+
+def walk(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+async def explain(tenant_id: uuid.UUID, filters: dict[str, Any]) -> dict:
+    """
+    Returns the JSON plan of the exact listing query the API runs,
+    including the joins added by the eager-loading options.
+    """
+    statement = pickup_list_statement(
+        tenant_id=tenant_id, limit=PAGE_SIZE + 1, **filters
+    ).options(*PICKUP_AGGREGATE_OPTIONS)
+    async with AsyncSessionLocal() as session:  # type: ignore
+        sql = statement.compile(
+            dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        result = await session.exec(text(f"EXPLAIN (FORMAT JSON) {sql}"))  # type: ignore
+        plan = result.scalar_one()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+async def run_explain() -> bool:
+    """
+    Seeds throwaway tenants and checks that every listing query reads
+    pickups through one of the expected indexes.
+    """
+    tenant_ids = [uuid.uuid4() for _ in range(TENANTS)]
+    print(f"Seeding {TENANTS} tenants x {PICKUPS_PER_TENANT} pickups...")
+    try:
+        await seed(tenant_ids)
+        passed = True
+        for description, filters, expected, sorted_by_index in SCENARIOS:
+            nodes = list(walk(await explain(tenant_ids[0], filters)))
+            indexes = {n["Index Name"] for n in nodes if "Index Name" in n}
+            seq_scan = any(
+                n["Node Type"] == "Seq Scan" and n.get("Relation Name") == "pickups"
+                for n in nodes
+            )
+            sorted_ = any(n["Node Type"] in ("Sort", "Incremental Sort") for n in nodes)
+
+            ok = bool(indexes & expected) and not seq_scan
+            if sorted_by_index and sorted_:
+                ok = False
+            passed &= ok
+            print(
+                f"{'✅' if ok else '❌'} {description}: indexes={sorted(indexes)}, "
+                f"seq_scan={seq_scan}, sort={sorted_}"
+            )
+        return passed
+    finally:
+        await cleanup(tenant_ids)
+
+
+def main():
+    passed = asyncio.run(run_explain())
+    print("✅ PASSED" if passed else "❌ FAILED")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+import sys
+import uuid
+
+from app.core.db import AsyncSessionLocal
+from app.core.security import TokenPayload
+from app.models.tenants import Tenant, User
+from app.repositories.tenants import TenantRepository
+from app.services.tenants import TenantService
+from sqlmodel import delete, func, select
+
+# --- Configuration ---
+# Number of concurrent onboarding calls fired for the same user.
+CONCURRENT_ONBOARDS = 50
+# ---
+
+
+async def onboard(token_data: TokenPayload, tenant: Tenant) -> User:
+    """Runs one onboarding call with its own session, like one HTTP request."""
+    async with AsyncSessionLocal() as session:  # type: ignore
+        service = TenantService(TenantRepository(session))
+        return await service.get_or_create_user(token_data=token_data, tenant=tenant)
+
+
+async def run_load_test() -> bool:
+    """
+    Fires CONCURRENT_ONBOARDS onboards for one subject into a throwaway tenant
+    and checks that exactly one profile exists and no call failed.
+    """
+    slug = f"load-test-{uuid.uuid4().hex[:8]}"
+    token_data = TokenPayload(
+        sub=str(uuid.uuid4()), email=f"{slug}@naviera.com", aud="authenticated"
+    )
+
+    async with AsyncSessionLocal() as session:  # type: ignore
+        tenant = await TenantRepository(session).save_tenant(
+            Tenant(name="Onboarding Load Test", slug=slug)
+        )
+
+    try:
+        print(f"Firing {CONCURRENT_ONBOARDS} concurrent onboards for one user...")
+        results = await asyncio.gather(
+            *(onboard(token_data, tenant) for _ in range(CONCURRENT_ONBOARDS)),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        user_ids = {r.id for r in results if isinstance(r, User)}
+
+        async with AsyncSessionLocal() as session:  # type: ignore
+            statement = select(func.count()).where(User.tenant_id == tenant.id)
+            row_count = (await session.exec(statement)).one()
+
+        print(f"Errors: {len(errors)}")
+        for error in errors[:5]:
+            print(f"  {type(error).__name__}: {error}")
+        print(f"Rows in DB: {row_count}")
+        print(f"Distinct user ids returned: {len(user_ids)}")
+        return not errors and row_count == 1 and len(user_ids) == 1
+    finally:
+        async with AsyncSessionLocal() as session:  # type: ignore
+            await session.exec(delete(User).where(User.tenant_id == tenant.id))  # type: ignore
+            await session.exec(delete(Tenant).where(Tenant.id == tenant.id))  # type: ignore
+            await session.commit()
+
+
+def main():
+    passed = asyncio.run(run_load_test())
+    print("✅ PASSED" if passed else "❌ FAILED")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
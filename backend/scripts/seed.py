@@ -2,6 +2,7 @@ import asyncio
 
 from app.core.db import AsyncSessionLocal
 from app.models.tenants import Tenant, User, UserRole
+from app.repositories.tenants import TenantRepository
 from sqlmodel import select
 
 # --- Configuration for the Seed Data ---
@@ -35,9 +36,7 @@ async def seed_data():
             # If the tenant doesn't exist, create it.
             print(f"Creating tenant: {TENANT_NAME}")
             tenant = Tenant(name=TENANT_NAME, slug=TENANT_SLUG)
-            session.add(tenant)
-            await session.commit()
-            await session.refresh(tenant)
+            tenant = await TenantRepository(session).save_tenant(tenant)
 
         # Query for the user using the unique combination of supabase_id and tenant_id
         statement = select(User).where(